@@ -1,3 +1,4 @@
+import os
 import sys
 from PyQt5.QtWidgets import (
     QApplication,
@@ -6,18 +7,49 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QSpinBox,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QPushButton,
-    QTextEdit,
     QHeaderView,
     QMessageBox,
     QFileDialog,
+    QProgressBar,
+    QComboBox,
 )
-from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve
+from PyQt5.QtCore import QPropertyAnimation, QEasingCurve, QTimer
 from PyQt5.QtGui import QColor
-import matplotlib.pyplot as plt
-import networkx as nx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from system_analysis import (
+    SparseGraph,
+    load_incidence,
+    validate_incidence,
+)
+from system_analysis.cache import AnalysisCache, disk_directory
+from system_analysis.drawing import (
+    LABEL_LIMIT,
+    draw_digraph,
+    draw_large_graph,
+)
+from system_analysis.layout import (
+    ENGINE_TITLES,
+    LAYOUT_DIR,
+    LayoutCache,
+    resolve_engine,
+)
+from system_analysis.dynamic import IncidenceTracker
+from system_analysis.export import FILE_FILTERS, export_graph, with_extension
+from system_analysis.profiling import Profiler
+from system_analysis.qtimages import image_pixmap
+from system_analysis.qtmodels import AdjacencyModel, MatrixModel
+from system_analysis.reports import RightIncidenceReport
+from system_analysis.qtreports import ReportView
+from system_analysis.qtworkers import AnalysisWorker
+from system_analysis.warmup import warm_up
+
+GRAPH_IMAGE_SIZE = (800, 600)
+analysis_cache = AnalysisCache(directory=disk_directory())
+layout_cache = LayoutCache(LAYOUT_DIR)
 
 
 class AnimatedButton(QPushButton):
@@ -78,13 +110,13 @@ class MainWindow(QWidget):
                 font-size: 14px;
                 font-weight: 500;
             }
-            QSpinBox {
+            QSpinBox, QComboBox {
                 padding: 5px;
                 border: 1px solid #ced4da;
                 border-radius: 4px;
                 background: white;
             }
-            QTableWidget {
+            QTableView {
                 background-color: white;
                 border: 1px solid #dee2e6;
                 border-radius: 4px;
@@ -98,7 +130,7 @@ class MainWindow(QWidget):
                 border: none;
                 font-weight: 500;
             }
-            QTextEdit {
+            QLineEdit {
                 background: white;
                 border: 1px solid #ced4da;
                 border-radius: 4px;
@@ -111,11 +143,11 @@ class MainWindow(QWidget):
         self.setWindowTitle("Системный анализ • Лабораторная работа №1")
 
         self.vertices_spin = QSpinBox()
-        self.vertices_spin.setMinimum(1)
+        self.vertices_spin.setRange(1, 1000000)
         self.vertices_spin.setValue(2)
 
         self.edges_spin = QSpinBox()
-        self.edges_spin.setMinimum(1)
+        self.edges_spin.setRange(1, 1000000)
         self.edges_spin.setValue(1)
 
         self.update_b_button = AnimatedButton("🔄 Обновить таблицу")
@@ -130,20 +162,51 @@ class MainWindow(QWidget):
         self.convert_button = AnimatedButton("⚡ Преобразовать")
         self.convert_button.clicked.connect(self.convert)
 
-        self.b_table = QTableWidget()
+        self.export_button = AnimatedButton("💾 Экспорт")
+        self.export_button.clicked.connect(self.export_results)
+        self.export_button.setEnabled(False)
+
+        self.cancel_button = AnimatedButton("✖ Отмена")
+        self.cancel_button.clicked.connect(self.cancel_worker)
+        self.cancel_button.setVisible(False)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setVisible(False)
+
+        self.layout_combo = QComboBox()
+        for engine, title in ENGINE_TITLES.items():
+            self.layout_combo.addItem(title, engine)
+
+        self.b_model = MatrixModel(
+            alphabet={"0", "1", "-1"},
+            row_label="Вершина {}",
+            column_label="Ребро {}",
+            centered=True,
+        )
+        self.b_table = QTableView()
+        self.b_table.setModel(self.b_model)
         self.b_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.b_model.dataChanged.connect(self.apply_edit)
+        self.b_model.modelReset.connect(self.drop_tracker)
 
-        self.a_table = QTableWidget()
+        self.a_model = AdjacencyModel(centered=True)
+        self.a_table = QTableView()
+        self.a_table.setModel(self.a_model)
         self.a_table.setFixedHeight(250)
 
-        self.g_plus_text = QTextEdit()
-        self.g_plus_text.setReadOnly(True)
+        self.g_plus_view = ReportView(kinds=("vertex",))
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #dc3545;")
+        self.status_label.setVisible(False)
 
         controls_layout = QHBoxLayout()
         controls_layout.addWidget(QLabel("Число вершин:"))
         controls_layout.addWidget(self.vertices_spin)
         controls_layout.addWidget(QLabel("Число ребер:"))
         controls_layout.addWidget(self.edges_spin)
+        controls_layout.addWidget(QLabel("Раскладка:"))
+        controls_layout.addWidget(self.layout_combo)
         controls_layout.addStretch()
 
         buttons_layout = QHBoxLayout()
@@ -151,6 +214,8 @@ class MainWindow(QWidget):
         buttons_layout.addWidget(self.load_button)
         buttons_layout.addWidget(self.clear_button)
         buttons_layout.addWidget(self.convert_button)
+        buttons_layout.addWidget(self.export_button)
+        buttons_layout.addWidget(self.cancel_button)
         buttons_layout.addStretch()
 
         main_layout = QVBoxLayout()
@@ -160,39 +225,31 @@ class MainWindow(QWidget):
         main_layout.addWidget(QLabel("Матрица инциденций B:"))
         main_layout.addWidget(self.b_table)
         main_layout.addLayout(buttons_layout)
+        main_layout.addWidget(self.progress_bar)
+        main_layout.addWidget(self.status_label)
         main_layout.addWidget(QLabel("Матрица смежности A:"))
         main_layout.addWidget(self.a_table)
         main_layout.addWidget(QLabel("Множество правых инциденций G+:"))
-        main_layout.addWidget(self.g_plus_text)
+        main_layout.addWidget(self.g_plus_view)
 
         self.setLayout(main_layout)
+        self.worker = None
+        self.graph_window = None
+        self.tracker = None
+        self.profiler = Profiler("lab1")
         self.update_b_table()
 
     def clear_all(self):
         self.vertices_spin.setValue(2)
         self.edges_spin.setValue(1)
         self.update_b_table()
-        self.a_table.clear()
-        self.a_table.setRowCount(0)
-        self.a_table.setColumnCount(0)
-        self.g_plus_text.clear()
+        self.a_model.set_graph(None)
+        self.g_plus_view.clear()
 
     def update_b_table(self):
         m = self.vertices_spin.value()
         n = self.edges_spin.value()
-        self.b_table.setRowCount(m)
-        self.b_table.setColumnCount(n)
-        self.b_table.setHorizontalHeaderLabels([f"Ребро {i+1}" for i in range(n)])
-        self.b_table.setVerticalHeaderLabels([f"Вершина {i+1}" for i in range(m)])
-        for i in range(m):
-            for j in range(n):
-                if self.b_table.item(i, j) is None:
-                    item = QTableWidgetItem("0")
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.b_table.setItem(i, j, item)
-                else:
-                    self.b_table.item(i, j).setText("0")
-        self.b_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.b_model.set_matrix(np.zeros((m, n), dtype=np.int8))
 
     def load_from_file(self):
         file_name, _ = QFileDialog.getOpenFileName(
@@ -202,40 +259,11 @@ class MainWindow(QWidget):
             return
 
         try:
-            with open(file_name, "r") as file:
-                lines = file.readlines()
-                if not lines:
-                    raise ValueError("Файл пустой")
-
-                header = lines[0].strip().split()
-                if len(header) != 2:
-                    raise ValueError(
-                        "Первая строка должна содержать два числа: вершины и ребра"
-                    )
-                m, n = map(int, header)
-                if m < 1 or n < 1:
-                    raise ValueError("Число вершин и ребер должно быть положительным")
-
-                self.vertices_spin.setValue(m)
-                self.edges_spin.setValue(n)
-                self.update_b_table()
-
-                if len(lines) - 1 != m:
-                    raise ValueError(
-                        f"Ожидалось {m} строк матрицы, найдено {len(lines)-1}"
-                    )
-                for i in range(m):
-                    row = lines[i + 1].strip().split()
-                    if len(row) != n:
-                        raise ValueError(f"Строка {i+1} должна содержать {n} значений")
-                    for j, val in enumerate(row):
-                        if val not in {"0", "1", "-1"}:
-                            raise ValueError(
-                                f"Недопустимое значение '{val}' в строке {i+1}, столбце {j+1}"
-                            )
-                        item = QTableWidgetItem(val)
-                        item.setTextAlignment(Qt.AlignCenter)
-                        self.b_table.setItem(i, j, item)
+            B = load_incidence(file_name)
+            m, n = B.shape
+            self.vertices_spin.setValue(m)
+            self.edges_spin.setValue(n)
+            self.b_model.set_matrix(B)
 
         except Exception as e:
             QMessageBox.critical(
@@ -243,134 +271,183 @@ class MainWindow(QWidget):
             )
 
     def convert(self):
-        try:
-            m = self.vertices_spin.value()
-            n = self.edges_spin.value()
-
-            B = []
-            for i in range(m):
-                row = []
-                for j in range(n):
-                    item = self.b_table.item(i, j)
-                    if item is None:
-                        val = 0
-                    else:
-                        text = item.text().strip()
-                        if text == "1":
-                            val = 1
-                        elif text == "-1":
-                            val = -1
-                        elif text == "0":
-                            val = 0
-                        else:
-                            raise ValueError(
-                                f"Неверное значение '{text}' в вершине {i+1}, ребро {j+1}"
-                            )
-                    row.append(val)
-                B.append(row)
-
-            A, G_plus = self.convert_incidence(B)
-
-            self.a_table.setRowCount(m)
-            self.a_table.setColumnCount(m)
-            self.a_table.setHorizontalHeaderLabels([str(i + 1) for i in range(m)])
-            self.a_table.setVerticalHeaderLabels([str(i + 1) for i in range(m)])
-            for i in range(m):
-                for j in range(m):
-                    item = QTableWidgetItem(str(A[i][j]))
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.a_table.setItem(i, j, item)
-
-            text = ""
-            for vertex in sorted(G_plus.keys()):
-                end_vertices = (
-                    ", ".join(map(str, sorted(set(G_plus[vertex]))))
-                    if G_plus[vertex]
-                    else "0"
-                )
-                text += f"Вершина {vertex+1}: {end_vertices}\n"
-            self.g_plus_text.setText(text)
-
-            self.draw_graph(A)
+        self.profiler.reset()
+        with self.profiler.span("Чтение матрицы B"):
+            B = self.b_model.matrix.copy()
+        ratio = self.devicePixelRatioF()
+        self.start_worker(
+            build_result,
+            B,
+            [round(side * ratio) for side in GRAPH_IMAGE_SIZE],
+            self.layout_combo.currentData(),
+            on_finished=self.show_result,
+        )
 
-        except Exception as e:
-            QMessageBox.critical(
-                self, "Ошибка", f"Произошла ошибка:\n{str(e)}", QMessageBox.Ok
-            )
+    def show_result(self, result):
+        image, self.tracker = result
+        with self.profiler.span("Вывод результатов"):
+            self.a_model.set_graph(self.tracker.graph)
+            self.g_plus_view.set_report(RightIncidenceReport(self.tracker.graph))
+            self.show_status(None)
+        with self.profiler.span("Показ графа"):
+            self.draw_graph(image)
 
-    def convert_incidence(self, B):
-        m = len(B)
-        n = len(B[0]) if m > 0 else 0
-        A = [[0] * m for _ in range(m)]
-        G_plus = {i: set() for i in range(m)}
-        existing_edges = set()
-
-        for edge_idx in range(n):
-            start = None
-            end = None
-            for vertex in range(m):
-                val = B[vertex][edge_idx]
-                if val == 1:
-                    if start is not None:
-                        raise ValueError(
-                            f"В ребре {edge_idx+1} несколько начальных вершин"
-                        )
-                    start = vertex
-                elif val == -1:
-                    if end is not None:
-                        raise ValueError(
-                            f"В ребре {edge_idx+1} несколько конечных вершин"
-                        )
-                    end = vertex
-                elif val != 0:
-                    raise ValueError(
-                        f"Недопустимое значение {val} в ребре {edge_idx+1}, вершина {vertex+1}"
-                    )
-            if start is None:
-                raise ValueError(f"В ребре {edge_idx+1} нет начальной вершины (1)")
-            if end is None:
-                raise ValueError(f"В ребре {edge_idx+1} нет конечной вершины (-1)")
-            if (start, end) in existing_edges:
-                raise ValueError(
-                    f"Ребро между вершинами {start+1} и {end+1} уже существует"
-                )
-            existing_edges.add((start, end))
-            A[start][end] += 1
-
-            if start is not None:
-                G_plus[start].add(end + 1)
-
-        G_plus = {k: sorted(list(v)) for k, v in G_plus.items()}
-        return A, G_plus
-
-    def draw_graph(self, A):
-        G = nx.DiGraph()
-        m = len(A)
-        for i in range(m):
-            G.add_node(i + 1)
-        for i in range(m):
-            for j in range(m):
-                if A[i][j] > 0:
-                    G.add_edge(i + 1, j + 1)
-        plt.figure(figsize=(8, 6))
-        pos = nx.spring_layout(G)
-        nx.draw(
-            G,
-            pos,
-            with_labels=True,
-            node_color="lightblue",
-            node_size=500,
-            font_size=12,
-            font_weight="bold",
-            arrows=True,
-            edge_color="gray",
+    def export_results(self):
+        """Сохраняет G+ и матрицу смежности в JSON Lines, CSV или .npz.
+
+        Экспортируется текущий граф с учетом правок матрицы B после
+        преобразования.
+        """
+        if self.tracker is None:
+            return
+        error = self.tracker.error()
+        if error:
+            QMessageBox.critical(self, "Ошибка", error, QMessageBox.Ok)
+            return
+        file_name, file_filter = QFileDialog.getSaveFileName(
+            self, "Экспорт результатов", "", FILE_FILTERS
+        )
+        if not file_name:
+            return
+        self.profiler.reset()
+        self.start_worker(
+            export_graph,
+            self.tracker.graph.to_graph(),
+            with_extension(file_name, file_filter),
+            ["right_incidence", "adjacency"],
+            on_finished=self.show_export,
+        )
+
+    def show_export(self, path):
+        QMessageBox.information(
+            self, "Экспорт", f"Результаты сохранены:\n{path}", QMessageBox.Ok
+        )
+
+    def apply_edit(self, top_left, bottom_right):
+        """Переносит правку матрицы B в результаты, не пересчитывая их заново.
+
+        Отчет G+ и матрица A читают граф правок напрямую, поэтому
+        перерисовываются только строки G+ для начал затронутых дуг и видимые
+        ячейки матрицы A; рисунок обновляется по кнопке «Преобразовать».
+        """
+        if self.tracker is None:
+            return
+        changed = set()
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            for column in range(top_left.column(), bottom_right.column() + 1):
+                value = self.b_model.matrix[row, column]
+                for arc in self.tracker.set_value(row, column, value):
+                    if arc is not None:
+                        changed.add(arc[0])
+        self.g_plus_view.refresh(sorted(changed))
+        self.a_model.refresh()
+        self.show_status(self.tracker.error())
+
+    def drop_tracker(self):
+        self.tracker = None
+        self.export_button.setEnabled(False)
+        self.show_status(None)
+
+    def show_status(self, message):
+        self.status_label.setText(message or "")
+        self.status_label.setVisible(bool(message))
+
+    def start_worker(self, function, *args, on_finished):
+        self.worker = AnalysisWorker(function, *args, profiler=self.profiler)
+        self.worker.signals.progress.connect(self.show_progress)
+        self.worker.signals.finished.connect(on_finished)
+        self.worker.signals.failed.connect(self.show_error)
+        self.worker.signals.done.connect(self.finish_worker)
+        self.set_busy(True)
+        self.worker.start()
+
+    def show_progress(self, percent, stage):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{stage}: %p%")
+
+    def show_error(self, message):
+        QMessageBox.critical(
+            self, "Ошибка", f"Произошла ошибка:\n{message}", QMessageBox.Ok
         )
-        plt.title("Визуализация графа")
-        plt.show()
+
+    def cancel_worker(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def finish_worker(self):
+        self.worker = None
+        self.set_busy(False)
+        self.profiler.report()
+
+    def set_busy(self, busy):
+        for button in (
+            self.update_b_button,
+            self.load_button,
+            self.clear_button,
+            self.convert_button,
+            self.layout_combo,
+            self.b_table,
+        ):
+            button.setEnabled(not busy)
+        self.export_button.setEnabled(not busy and self.tracker is not None)
+        self.cancel_button.setVisible(busy)
+        self.progress_bar.setVisible(busy)
+        self.progress_bar.setValue(0)
+
+    def closeEvent(self, event):
+        self.cancel_worker()
+        super().closeEvent(event)
+
+    def draw_graph(self, image):
+        self.graph_window = QLabel()
+        self.graph_window.setWindowTitle("Визуализация графа")
+        self.graph_window.setStyleSheet("background-color: white;")
+        self.graph_window.setPixmap(image_pixmap(image, self.devicePixelRatioF()))
+        self.graph_window.show()
+
+
+def build_result(B, image_size, engine, progress):
+    progress(0, "Проверка матрицы инциденций")
+    report = validate_incidence(B)
+    report.check()
+    progress(10, "Преобразование матрицы инциденций")
+    graph = SparseGraph.from_arcs(len(B), *report.arcs)
+
+    progress(50, "Расчет расположения вершин")
+    engine = resolve_engine(graph, engine)
+    image = analysis_cache.render(
+        graph,
+        ("graph", engine),
+        lambda: draw_graph_figure(graph, engine),
+        *image_size,
+    )
+    progress(90, "Подготовка правок")
+    tracker = IncidenceTracker(B, components=False)
+    progress(100, "Готово")
+    return image, tracker
+
+
+def draw_graph_figure(graph, engine="spring"):
+    import networkx as nx
+
+    if engine != "spring":
+        positions = layout_cache.get(graph, engine)
+        if graph.vertex_count > LABEL_LIMIT:
+            return draw_large_graph(
+                graph, positions, "Визуализация графа", "lightblue", "gray"
+            )
+    G = nx.DiGraph()
+    G.add_nodes_from(range(1, graph.vertex_count + 1))
+    sources, targets = graph.arcs()
+    G.add_edges_from(zip((sources + 1).tolist(), (targets + 1).tolist()))
+    if engine == "spring":
+        return draw_digraph(G, nx.spring_layout(G))
+    return draw_digraph(G, {v: positions[v - 1] for v in G})
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    QTimer.singleShot(0, warm_up)
     sys.exit(app.exec_())
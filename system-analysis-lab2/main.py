@@ -1,3 +1,4 @@
+import os
 import sys
 from PyQt6.QtWidgets import (
     QApplication,
@@ -7,17 +8,36 @@ from PyQt6.QtWidgets import (
     QLabel,
     QSpinBox,
     QPushButton,
-    QTableWidget,
-    QTableWidgetItem,
-    QTextEdit,
+    QTableView,
     QMessageBox,
     QFileDialog,
     QSplitter,
+    QProgressBar,
 )
 from PyQt6.QtGui import QFont
 from PyQt6.QtCore import Qt
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from system_analysis import (
+    IncidenceTracker,
+    Reachability,
+    SparseGraph,
+    level_order,
+    load_incidence,
+    validate_incidence,
+)
+from system_analysis.cache import AnalysisCache, disk_directory
+from system_analysis.export import FILE_FILTERS, export_graph, with_extension
+from system_analysis.profiling import Profiler
+from system_analysis.qtmodels import AdjacencyModel, MatrixModel
+from system_analysis.reports import LevelReport
+from system_analysis.qtreports import ReportView
+from system_analysis.qtworkers import AnalysisWorker
+from system_analysis.validation import column_message
+
+analysis_cache = AnalysisCache(directory=disk_directory())
+
 
 class GraphConverter(QWidget):
     def __init__(self):
@@ -39,14 +59,14 @@ class GraphConverter(QWidget):
                 color: #a3bffa;
                 font-weight: bold;
             }
-            QSpinBox, QTextEdit {
+            QSpinBox, QLineEdit, QComboBox {
                 background-color: #2a2a3d;
                 color: #ffffff;
                 border: 1px solid #3e3e5c;
                 border-radius: 5px;
                 padding: 5px;
             }
-            QTableWidget {
+            QTableView {
                 background-color: #2a2a3d;
                 color: #ffffff;
                 border: 1px solid #3e3e5c;
@@ -90,12 +110,12 @@ class GraphConverter(QWidget):
 
         self.vertex_label = QLabel("Вершины:")
         self.vertex_input = QSpinBox()
-        self.vertex_input.setMinimum(1)
+        self.vertex_input.setRange(1, 1000000)
         self.vertex_input.setFixedWidth(100)
 
         self.edge_label = QLabel("Дуги:")
         self.edge_input = QSpinBox()
-        self.edge_input.setMinimum(1)
+        self.edge_input.setRange(1, 1000000)
         self.edge_input.setFixedWidth(100)
 
         input_layout.addWidget(self.vertex_label)
@@ -113,15 +133,26 @@ class GraphConverter(QWidget):
         self.load_button = QPushButton("Загрузить из файла")
         self.load_button.clicked.connect(self.load_from_file)
 
+        self.export_button = QPushButton("Экспорт результатов")
+        self.export_button.clicked.connect(self.export_results)
+        self.export_button.setEnabled(False)
+
         button_layout.addWidget(self.generate_button)
         button_layout.addWidget(self.load_button)
+        button_layout.addWidget(self.export_button)
         button_layout.addStretch()
 
         layout.addLayout(button_layout)
 
         self.table_label = QLabel("Матрица инцидентности:")
         layout.addWidget(self.table_label)
-        self.table = QTableWidget()
+        self.incidence_model = MatrixModel(
+            alphabet={"0", "1", "-1"}, column_label="e{}"
+        )
+        self.incidence_model.dataChanged.connect(self.apply_edit)
+        self.incidence_model.modelReset.connect(self.drop_tracker)
+        self.table = QTableView()
+        self.table.setModel(self.incidence_model)
         self.table.setMinimumHeight(350)
         layout.addWidget(self.table)
 
@@ -129,23 +160,41 @@ class GraphConverter(QWidget):
         self.convert_button.clicked.connect(self.calculate_adjacency_and_left_incidence)
         layout.addWidget(self.convert_button)
 
+        progress_layout = QHBoxLayout()
+        progress_layout.setSpacing(10)
+        self.progress_bar = QProgressBar()
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.clicked.connect(self.cancel_worker)
+        progress_layout.addWidget(self.progress_bar, stretch=1)
+        progress_layout.addWidget(self.cancel_button)
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
+        layout.addLayout(progress_layout)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #d9534f;")
+        self.status_label.setWordWrap(True)
+        self.status_label.setVisible(False)
+        layout.addWidget(self.status_label)
+
         splitter = QSplitter(Qt.Orientation.Horizontal)
 
         left_widget = QWidget()
         left_layout = QVBoxLayout()
         self.left_incidence_label = QLabel("Иерархические уровни:")
-        self.result_output = QTextEdit()
-        self.result_output.setReadOnly(True)
-        self.result_output.setMinimumHeight(150)
+        self.levels_view = ReportView(kinds=("vertex", "level"))
+        self.levels_view.setMinimumHeight(150)
         left_layout.addWidget(self.left_incidence_label)
-        left_layout.addWidget(self.result_output)
+        left_layout.addWidget(self.levels_view)
         left_widget.setLayout(left_layout)
         splitter.addWidget(left_widget)
 
         right_widget = QWidget()
         right_layout = QVBoxLayout()
         self.adjacency_label = QLabel("Новая матрица смежности:")
-        self.result_table = QTableWidget()
+        self.adjacency_model = AdjacencyModel(label="{0}({1})")
+        self.result_table = QTableView()
+        self.result_table.setModel(self.adjacency_model)
         self.result_table.setMinimumHeight(150)
         right_layout.addWidget(self.adjacency_label)
         right_layout.addWidget(self.result_table)
@@ -157,6 +206,27 @@ class GraphConverter(QWidget):
 
         layout.addWidget(splitter, stretch=1)
 
+        reach_layout = QHBoxLayout()
+        reach_layout.setSpacing(10)
+        self.reach_spins = []
+        for caption in ("Из вершины", "достижима ли вершина"):
+            spin = QSpinBox()
+            spin.setRange(1, 1)
+            spin.setFixedWidth(100)
+            spin.valueChanged.connect(self.show_reachability)
+            reach_layout.addWidget(QLabel(caption))
+            reach_layout.addWidget(spin)
+            self.reach_spins.append(spin)
+        self.reach_label = QLabel()
+        reach_layout.addWidget(self.reach_label)
+        reach_layout.addStretch()
+        layout.addLayout(reach_layout)
+
+        self.worker = None
+        self.tracker = None
+        self.level_count = None
+        self.reachability = None
+        self.profiler = Profiler("lab2")
         self.setLayout(layout)
         self.setWindowTitle("Системный анализ • Лабораторная работа №2")
         self.resize(800, 600)
@@ -165,14 +235,7 @@ class GraphConverter(QWidget):
         vertices = self.vertex_input.value()
         edges = self.edge_input.value()
 
-        self.table.setRowCount(vertices)
-        self.table.setColumnCount(edges)
-        header_labels = [f"e{i+1}" for i in range(edges)]
-        self.table.setHorizontalHeaderLabels(header_labels)
-
-        for i in range(vertices):
-            for j in range(edges):
-                self.table.setItem(i, j, QTableWidgetItem("0"))
+        self.incidence_model.set_matrix(np.zeros((vertices, edges), dtype=np.int8))
 
     def load_from_file(self):
         file_name, _ = QFileDialog.getOpenFileName(
@@ -180,115 +243,215 @@ class GraphConverter(QWidget):
         )
         if file_name:
             try:
-                with open(file_name, "r") as file:
-                    lines = file.readlines()
-                    vertices, edges = map(int, lines[0].strip().split())
-                    self.vertex_input.setValue(vertices)
-                    self.edge_input.setValue(edges)
-                    self.create_incidence_matrix()
-
-                    for i, line in enumerate(lines[1 : vertices + 1]):
-                        values = list(map(int, line.strip().split()))
-                        for j, value in enumerate(values):
-                            self.table.setItem(i, j, QTableWidgetItem(str(value)))
+                incidence_matrix = load_incidence(file_name)
+                vertices, edges = incidence_matrix.shape
+                self.vertex_input.setValue(vertices)
+                self.edge_input.setValue(edges)
+                self.incidence_model.set_matrix(incidence_matrix)
             except Exception as e:
                 QMessageBox.critical(
                     self, "Ошибка", f"Не удалось загрузить файл: {str(e)}"
                 )
 
     def calculate_adjacency_and_left_incidence(self):
-        vertices = self.vertex_input.value()
-        edges = self.edge_input.value()
-
-        incidence_matrix = np.zeros((vertices, edges), dtype=int)
-
-        for i in range(vertices):
-            for j in range(edges):
-                item = self.table.item(i, j)
-                if item is not None:
-                    try:
-                        value = int(item.text())
-                        if value not in (0, 1, -1):
-                            raise ValueError("Значение должно быть 0, 1 или -1")
-                        incidence_matrix[i, j] = value
-                    except ValueError as e:
-                        QMessageBox.critical(
-                            self,
-                            "Ошибка ввода",
-                            f"Ошибка в ячейке ({i+1}, {j+1}): {str(e)}",
-                        )
-                        return
-                else:
-                    QMessageBox.critical(
-                        self, "Ошибка ввода", f"Пустая ячейка ({i+1}, {j+1})."
-                    )
-                    return
-
-        for j in range(edges):
-            col = incidence_matrix[:, j]
-            count_pos = np.count_nonzero(col == 1)
-            count_neg = np.count_nonzero(col == -1)
-            if not (count_pos == 1 and count_neg == 1):
-                QMessageBox.critical(
-                    self,
-                    "Ошибка матрицы",
-                    f"В столбце {j+1} должна быть одна 1 и одна -1.\nНайдено: 1 -> {count_pos}, -1 -> {count_neg}.",
-                )
-                return
-
-        adjacency_matrix = np.zeros((vertices, vertices), dtype=int)
-        left_incidence = {i + 1: [] for i in range(vertices)}
-
-        for j in range(edges):
-            start = None
-            end = None
-            for i in range(vertices):
-                if incidence_matrix[i, j] == 1:
-                    start = i + 1
-                elif incidence_matrix[i, j] == -1:
-                    end = i + 1
-            if start is not None and end is not None:
-                adjacency_matrix[start - 1, end - 1] = 1
-                left_incidence[end].append(start)
-
-        self.result_table.setRowCount(vertices)
-        self.result_table.setColumnCount(vertices)
-
-        levels = []
-        while len(left_incidence) != 0:
-            level = [key for key, value in left_incidence.items() if not value]
-            for vertex in level:
-                del left_incidence[vertex]
-                for key in left_incidence.keys():
-                    if vertex in left_incidence[key]:
-                        left_incidence[key].remove(vertex)
-            levels.append(level)
-
-        result_text = ""
-        for level, vertices_in_level in enumerate(levels):
-            result_text += (
-                f"Уровень {level}: ({', '.join(map(str, vertices_in_level))})\n"
+        incidence_matrix = self.incidence_model.matrix
+        if incidence_matrix.size == 0:
+            QMessageBox.critical(
+                self, "Ошибка ввода", "Сначала создайте или загрузите матрицу."
             )
+            return
 
-        self.result_output.setText(result_text)
-        swap_vertex = [vertex - 1 for level in levels for vertex in level]
-
-        for i in range(vertices):
-            for j in range(vertices):
-                self.result_table.setItem(
-                    i,
-                    j,
-                    QTableWidgetItem(
-                        str(adjacency_matrix[swap_vertex[i], swap_vertex[j]])
-                    ),
-                )
-        self.result_table.setVerticalHeaderLabels(
-            [f"{i + 1}({swap_vertex[i] + 1})" for i in range(vertices)]
+        self.profiler.reset()
+        with self.profiler.span("Чтение матрицы"):
+            incidence_matrix = incidence_matrix.copy()
+        self.start_worker(
+            calculate_levels, incidence_matrix, on_finished=self.show_levels
+        )
+
+    def export_results(self):
+        """Сохраняет уровни, swap_vertex и новую матрицу смежности в файл.
+
+        Экспортируется текущий граф с учетом правок; строки и столбцы
+        матрицы смежности идут в порядке swap_vertex, как в таблице.
+        """
+        if self.tracker is None or self.level_count is None:
+            QMessageBox.critical(
+                self,
+                "Ошибка",
+                "Сначала рассчитайте уровни корректной матрицы без контуров.",
+            )
+            return
+        file_name, file_filter = QFileDialog.getSaveFileName(
+            self, "Экспорт результатов", "", FILE_FILTERS
         )
-        self.result_table.setHorizontalHeaderLabels(
-            [f"{i + 1}({swap_vertex[i] + 1})" for i in range(vertices)]
+        if not file_name:
+            return
+        _, swap_vertex = self.tracker.graph.level_order()
+        self.profiler.reset()
+        self.start_worker(
+            export_graph,
+            self.tracker.graph.to_graph(),
+            with_extension(file_name, file_filter),
+            ["adjacency", "levels", "swap_vertex"],
+            None,
+            swap_vertex,
+            on_finished=self.show_export,
         )
 
+    def show_export(self, path):
+        QMessageBox.information(self, "Экспорт", f"Результаты сохранены:\n{path}")
+
+    def start_worker(self, function, *args, on_finished):
+        self.worker = AnalysisWorker(function, *args, profiler=self.profiler)
+        self.worker.signals.progress.connect(self.show_progress)
+        self.worker.signals.finished.connect(on_finished)
+        self.worker.signals.failed.connect(self.show_error)
+        self.worker.signals.done.connect(self.finish_worker)
+        self.set_busy(True)
+        self.worker.start()
+
+    def show_levels(self, result):
+        graph, levels, swap_vertex, self.tracker = result
+        with self.profiler.span("Вывод уровней"):
+            self.levels_view.set_report(LevelReport(levels))
+        with self.profiler.span("Вывод матрицы смежности"):
+            self.adjacency_model.set_graph(self.tracker.graph, swap_vertex)
+        self.tracker.graph.pop_changed_levels()
+        self.level_count = len(levels)
+        self.reachability = None
+        for spin in self.reach_spins:
+            spin.blockSignals(True)
+            spin.setRange(1, graph.vertex_count)
+            spin.blockSignals(False)
+        self.show_status(None)
+        self.show_reachability()
+
+    def apply_edit(self, top_left, bottom_right):
+        """Переносит правку матрицы в уровни и матрицу смежности без полного пересчета.
+
+        Перерисовываются только строки уровней, состав которых изменился
+        (все — если изменилось число уровней). Пока матрица
+        некорректна или в графе есть контур, прежний результат остается на
+        экране, а ошибка показывается под таблицей.
+        """
+        if self.tracker is None:
+            return
+        for row in range(top_left.row(), bottom_right.row() + 1):
+            for column in range(top_left.column(), bottom_right.column() + 1):
+                value = self.incidence_model.matrix[row, column]
+                self.tracker.set_value(row, column, value)
+        self.reachability = None
+        graph = self.tracker.graph
+        if self.tracker.invalid:
+            column = min(self.tracker.invalid)
+            self.show_status(column_error(self.tracker.matrix[:, column], column))
+            self.level_count = None
+            self.show_reachability()
+            return
+        try:
+            graph.check_acyclic()
+        except ValueError as e:
+            self.show_status(str(e))
+            self.level_count = None
+            self.show_reachability()
+            return
+
+        changed = graph.pop_changed_levels()
+        levels, swap_vertex = graph.level_order()
+        # После ошибки на экране мог остаться более старый результат.
+        rows = changed if self.level_count is not None else None
+        self.levels_view.replace(LevelReport(levels), rows)
+        self.level_count = len(levels)
+        self.adjacency_model.refresh(swap_vertex)
+        self.show_status(None)
+        self.show_reachability()
+
+    def show_reachability(self):
+        """Отвечает, есть ли путь между двумя вершинами.
+
+        Замыкание графа строится при первом запросе после расчета или
+        правки, дальше каждый запрос — проверка одного бита.
+        """
+        if self.tracker is None or self.level_count is None:
+            self.reach_label.setText("")
+            return
+        if self.reachability is None:
+            self.reachability = Reachability(self.tracker.graph.to_graph())
+        source, target = (spin.value() - 1 for spin in self.reach_spins)
+        reachable = self.reachability.reaches(source, target)
+        self.reach_label.setText("да" if reachable else "нет")
+
+    def drop_tracker(self):
+        self.tracker = None
+        self.export_button.setEnabled(False)
+        self.reachability = None
+        self.show_status(None)
+        self.show_reachability()
+
+    def show_status(self, message):
+        self.status_label.setText(message or "")
+        self.status_label.setVisible(bool(message))
+
+    def show_progress(self, percent, stage):
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{stage}: %p%")
+
+    def show_error(self, message):
+        QMessageBox.critical(self, "Ошибка матрицы", message)
+
+    def cancel_worker(self):
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def finish_worker(self):
+        self.worker = None
+        self.set_busy(False)
+        self.profiler.report()
+
+    def set_busy(self, busy):
+        for button in (
+            self.generate_button,
+            self.load_button,
+            self.convert_button,
+            self.table,
+        ):
+            button.setEnabled(not busy)
+        self.export_button.setEnabled(not busy and self.tracker is not None)
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setVisible(busy)
+        self.progress_bar.setValue(0)
+
+    def closeEvent(self, event):
+        self.cancel_worker()
+        super().closeEvent(event)
+
+
+def column_error(col, j):
+    count_pos = np.count_nonzero(col == 1)
+    count_neg = np.count_nonzero(col == -1)
+    if not (count_pos == 1 and count_neg == 1):
+        return column_message(j, count_pos, count_neg)
+    return None
+
+
+def calculate_levels(incidence_matrix, progress):
+    progress(0, "Проверка матрицы")
+    report = validate_incidence(incidence_matrix, unique=False)
+    report.check()
+
+    progress(0, "Построение графа")
+    graph = SparseGraph.from_arcs(len(incidence_matrix), *report.arcs)
+    levels, swap_vertex = analysis_cache.get(
+        graph, "levels", lambda: level_order(graph, progress=progress)
+    )
+    progress(100, "Подготовка правок")
+    return (
+        graph,
+        levels,
+        swap_vertex,
+        IncidenceTracker(incidence_matrix, unique=False),
+    )
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -1,6 +1,6 @@
+import os
 import sys
-import networkx as nx
-import matplotlib.pyplot as plt
+from functools import partial
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -14,11 +14,46 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QGridLayout,
     QFrame,
+    QProgressBar,
+    QComboBox,
+    QCheckBox,
+    QSpinBox,
 )
-from PyQt5.QtCore import Qt, QRect
-from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap, QIcon
+from PyQt5.QtCore import Qt, QRect, QTimer
+from PyQt5.QtGui import QFont, QPalette, QColor, QIcon
 from PyQt5.QtWidgets import QGraphicsDropShadowEffect
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from system_analysis import (
+    AdjacencyTracker,
+    Reachability,
+    component_decomposition,
+    cycle_diagnostics,
+    decompose,
+    format_cycle_diagnostics,
+    number_by_first_vertex,
+    parse_adjacency,
+)
+from system_analysis.cache import AnalysisCache, disk_directory
+from system_analysis.drawing import draw_original_graph, draw_subsystem_graph
+from system_analysis.export import FILE_FILTERS, export_graph, with_extension
+from system_analysis.layout import (
+    ENGINE_TITLES,
+    LAYOUT_DIR,
+    LayoutCache,
+    resolve_engine,
+    subsystem_graph,
+)
+from system_analysis.profiling import Profiler
+from system_analysis.qtimages import image_pixmap
+from system_analysis.qtreports import ReportView
+from system_analysis.qtworkers import AnalysisWorker
+from system_analysis.reports import DecompositionReport
+from system_analysis.warmup import warm_up
+
+GRAPH_IMAGE_SIZE = (400, 300)
+EDIT_DELAY_MS = 150
+
 
 class GraphDecompositionApp(QMainWindow):
     """Главное окно приложения для топологической декомпозиции графа с современным UI."""
@@ -78,6 +113,7 @@ class GraphDecompositionApp(QMainWindow):
         shadow.setColor(QColor(0, 0, 0, 160))
         shadow.setOffset(0, 2)
         self.matrix_input.setGraphicsEffect(shadow)
+        self.matrix_input.document().contentsChange.connect(self.text_edited)
         control_layout.addWidget(self.matrix_input, 1, 0, 1, 2)
 
         self.load_button = QPushButton("📂 Загрузить из файла")
@@ -132,21 +168,129 @@ class GraphDecompositionApp(QMainWindow):
         self.analyze_button.clicked.connect(self.analyze_graph)
         control_layout.addWidget(self.analyze_button, 2, 1, 1, 1)
 
+        self.layout_label = QLabel("Раскладка графов:")
+        self.layout_label.setFont(QFont("Segoe UI", 11))
+        self.layout_label.setStyleSheet("color: #d3d3d3;")
+        control_layout.addWidget(self.layout_label, 3, 0, 1, 1)
+
+        self.layout_combo = QComboBox()
+        self.layout_combo.setFont(QFont("Segoe UI", 11))
+        self.layout_combo.setStyleSheet(
+            """
+            QComboBox {
+                background-color: #333333;
+                color: #ffffff;
+                border: 1px solid #555555;
+                border-radius: 5px;
+                padding: 5px;
+            }
+        """
+        )
+        for engine, title in ENGINE_TITLES.items():
+            self.layout_combo.addItem(title, engine)
+        control_layout.addWidget(self.layout_combo, 3, 1, 1, 1)
+
+        self.reduce_check = QCheckBox("Транзитивное сокращение графа подсистем")
+        self.reduce_check.setFont(QFont("Segoe UI", 11))
+        self.reduce_check.setStyleSheet("color: #d3d3d3;")
+        control_layout.addWidget(self.reduce_check, 4, 0, 1, 1)
+
+        self.export_button = QPushButton("💾 Экспорт результатов")
+        self.export_button.setFont(QFont("Segoe UI", 11))
+        self.export_button.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #6c757d;
+                color: white;
+                border-radius: 5px;
+                padding: 8px;
+            }
+            QPushButton:hover {
+                background-color: #5a6268;
+            }
+            QPushButton:disabled {
+                background-color: #444444;
+                color: #888888;
+            }
+        """
+        )
+        self.export_button.setEnabled(False)
+        self.export_button.clicked.connect(self.export_results)
+        control_layout.addWidget(self.export_button, 4, 1, 1, 1)
+
+        self.parallel_check = QCheckBox(
+            "Искать подсистемы на всех ядрах (для очень больших графов)"
+        )
+        self.parallel_check.setFont(QFont("Segoe UI", 11))
+        self.parallel_check.setStyleSheet("color: #d3d3d3;")
+        control_layout.addWidget(self.parallel_check, 5, 0, 1, 2)
+
+        reach_layout = QHBoxLayout()
+        self.reach_spins = []
+        for caption in ("Из подсистемы", "достижима ли подсистема"):
+            label = QLabel(caption)
+            label.setFont(QFont("Segoe UI", 11))
+            label.setStyleSheet("color: #d3d3d3;")
+            reach_layout.addWidget(label)
+            spin = QSpinBox()
+            spin.setFont(QFont("Segoe UI", 11))
+            spin.setStyleSheet(
+                "background-color: #333333; color: #ffffff; border: 1px solid #555555;"
+            )
+            spin.setRange(1, 1)
+            spin.valueChanged.connect(self.show_reachability)
+            reach_layout.addWidget(spin)
+            self.reach_spins.append(spin)
+        self.reach_label = QLabel()
+        self.reach_label.setFont(QFont("Segoe UI", 11, QFont.Bold))
+        self.reach_label.setStyleSheet("color: #ffffff;")
+        reach_layout.addWidget(self.reach_label, 1)
+        control_layout.addLayout(reach_layout, 6, 0, 1, 2)
+
         self.instruction_label = QLabel(
             "Граф должен быть ациклическим (дуги направлены в одну сторону)."
         )
         self.instruction_label.setFont(QFont("Segoe UI", 10, QFont.StyleItalic))
         self.instruction_label.setStyleSheet("color: #aaaaaa; margin-top: 5px;")
-        control_layout.addWidget(self.instruction_label, 3, 0, 1, 2)
+        control_layout.addWidget(self.instruction_label, 7, 0, 1, 2)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setStyleSheet("color: #ffffff;")
+        self.progress_bar.setVisible(False)
+        control_layout.addWidget(self.progress_bar, 8, 0, 1, 1)
+
+        self.cancel_button = QPushButton("✖ Отмена")
+        self.cancel_button.setFont(QFont("Segoe UI", 11))
+        self.cancel_button.setStyleSheet(
+            """
+            QPushButton {
+                background-color: #dc3545;
+                color: white;
+                border-radius: 5px;
+                padding: 8px;
+            }
+            QPushButton:hover {
+                background-color: #c82333;
+            }
+        """
+        )
+        self.cancel_button.clicked.connect(self.cancel_worker)
+        self.cancel_button.setVisible(False)
+        control_layout.addWidget(self.cancel_button, 8, 1, 1, 1)
 
         main_layout.addWidget(control_frame)
 
-        self.result_text = QTextEdit()
-        self.result_text.setFont(QFont("Consolas", 11))
-        self.result_text.setReadOnly(True)
-        self.result_text.setStyleSheet(
+        self.status_label = QLabel()
+        self.status_label.setFont(QFont("Segoe UI", 10))
+        self.status_label.setStyleSheet("color: #ff6b6b;")
+        self.status_label.setVisible(False)
+        main_layout.addWidget(self.status_label)
+
+        self.result_view = ReportView(kinds=("vertex", "subsystem"))
+        self.result_view.set_font(QFont("Consolas", 11))
+        self.result_view.view.setStyleSheet(
             """
-            QTextEdit {
+            QTableView {
                 background-color: #333333;
                 color: #ffffff;
                 border: 1px solid #555555;
@@ -159,11 +303,43 @@ class GraphDecompositionApp(QMainWindow):
         shadow.setBlurRadius(15)
         shadow.setColor(QColor(0, 0, 0, 160))
         shadow.setOffset(0, 2)
-        self.result_text.setGraphicsEffect(shadow)
-        main_layout.addWidget(self.result_text)
-
-        self.adjacency = None
-        self.matrix = None
+        self.result_view.view.setGraphicsEffect(shadow)
+        self.result_view.setFont(QFont("Segoe UI", 11))
+        self.result_view.setStyleSheet(
+            """
+            QComboBox, QLineEdit {
+                background-color: #333333;
+                color: #ffffff;
+                border: 1px solid #555555;
+                border-radius: 5px;
+                padding: 5px;
+            }
+            QPushButton {
+                background-color: #4a90e2;
+                color: white;
+                border-radius: 5px;
+                padding: 5px 15px;
+            }
+        """
+        )
+        main_layout.addWidget(self.result_view)
+
+        self.graph = None
+        self.decomposition = None
+        self.reachability = None
+        self.workers = None
+        self.worker = None
+        self.graph_window = None
+        self.analysis_cache = AnalysisCache(directory=disk_directory())
+        self.layout_cache = LayoutCache(LAYOUT_DIR)
+        self.tracker = None
+        self.profiler = Profiler("lab3")
+        self.row_blocks = None
+        self.block_count = 0
+        self.dirty_rows = set()
+        self.edit_timer = QTimer(self)
+        self.edit_timer.setSingleShot(True)
+        self.edit_timer.timeout.connect(self.apply_edits)
 
     def set_dark_theme(self):
         """Устанавливает темную тему для приложения."""
@@ -192,284 +368,325 @@ class GraphDecompositionApp(QMainWindow):
                     matrix_str = file.read().strip()
                     self.matrix_input.setText(matrix_str)
             except Exception as e:
-                self.result_text.setText(f"Ошибка при чтении файла: {str(e)}")
+                self.result_view.set_text(f"Ошибка при чтении файла: {str(e)}")
 
-    def parse_matrix(self, matrix_str):
-        """Парсит текстовый ввод в матрицу смежности."""
-        try:
-            rows = [
-                list(map(int, row.split()))
-                for row in matrix_str.strip().split("\n")
-                if row.strip()
-            ]
-            if not rows or not all(len(row) == len(rows[0]) for row in rows):
-                raise ValueError(
-                    "Некорректная матрица! Все строки должны иметь одинаковое количество элементов."
-                )
-            self.matrix = rows
-            n = len(rows)
-            adjacency = {i + 1: [] for i in range(n)}
-            for i in range(n):
-                for j in range(len(rows[i])):
-                    if rows[i][j] == 1 and i != j:
-                        adjacency[i + 1].append(j + 1)
-            return adjacency
-        except Exception as e:
-            self.result_text.setText(f"Ошибка парсинга: {str(e)}")
-            return None
-
-    def build_graph(self, edges):
-        """Создает ориентированный граф на основе списка ребер."""
-        G = nx.DiGraph()
-        G.add_edges_from(edges)
-        return G
-
-    def get_subsystem_edges(self, subsystem):
-        """Находит дуги внутри заданной подсистемы."""
-        edges = []
-        n = len(self.matrix)
-        for i in range(n):
-            for j in range(n):
-                if (
-                    self.matrix[i][j] == 1
-                    and i != j
-                    and (i + 1) in subsystem
-                    and (j + 1) in subsystem
-                ):
-                    edges.append((i + 1, j + 1))
-        return edges
-
-    def get_subsystem_right_incidence(self, subsystem_graph, num_subsystems):
-        """Определяет множества правых инциденций для подсистем."""
-        right_incidence = {i + 1: set() for i in range(num_subsystems)}
-        for i in range(num_subsystems):
-            for j in range(num_subsystems):
-                if subsystem_graph.has_edge(j + 1, i + 1):
-                    right_incidence[i + 1].add(j + 1)
-        return right_incidence
-
-    def check_acyclic(self, G):
-        """Проверяет, является ли граф ациклическим (DAG)."""
-        try:
-            nx.topological_sort(G)
-            return True
-        except nx.NetworkXUnfeasible:
-            return False
-
-    def find_cycles(self, G):
-        """Находит все простые циклы в графе."""
-        try:
-            cycles = list(nx.simple_cycles(G))
-            return cycles
-        except nx.NetworkXNoCycle:
-            return []
+    def find_cycles(self, graph, progress):
+        """Находит компоненты с циклами: по циклу на компоненту и дуги для их разрыва."""
+        return format_cycle_diagnostics(cycle_diagnostics(graph, progress=progress))
 
     def analyze_graph(self):
-        """Выполняет анализ графа и визуализацию результатов."""
-        matrix_str = self.matrix_input.toPlainText().strip()
+        """Запускает анализ графа в фоновом потоке."""
+        self.profiler.reset()
+        with self.profiler.span("Чтение текста матрицы"):
+            matrix_str = self.matrix_input.toPlainText().strip()
         if not matrix_str:
-            self.result_text.setText("Введите матрицу смежности!")
+            self.result_view.set_text("Введите матрицу смежности!")
             return
 
-        self.adjacency = self.parse_matrix(matrix_str)
-        if not self.adjacency or not self.matrix:
+        self.drop_tracker()
+        self.decomposition = None
+        self.workers = (
+            (os.cpu_count() or 1) if self.parallel_check.isChecked() else None
+        )
+        self.export_button.setEnabled(False)
+        self.show_reachability()
+        lines = self.matrix_input.toPlainText().split("\n")
+        blocks = [number for number, line in enumerate(lines) if line.strip()]
+        self.row_blocks = {block: row for row, block in enumerate(blocks)}
+        self.block_count = len(lines)
+        ratio = self.devicePixelRatioF()
+        image_size = [round(side * ratio) for side in GRAPH_IMAGE_SIZE]
+        self.worker = AnalysisWorker(
+            self.run_analysis,
+            matrix_str,
+            image_size,
+            self.layout_combo.currentData(),
+            self.reduce_check.isChecked(),
+            self.workers,
+            profiler=self.profiler,
+        )
+        self.worker.signals.progress.connect(self.show_progress)
+        self.worker.signals.finished.connect(self.show_analysis)
+        self.worker.signals.failed.connect(self.result_view.set_text)
+        self.worker.signals.done.connect(self.finish_worker)
+        self.set_busy(True)
+        self.worker.start()
+
+    def export_results(self):
+        """Сохраняет подсистемы и их правые инциденции в JSON Lines, CSV или .npz."""
+        if self.decomposition is None:
             return
-
-        all_edges = []
-        n = len(self.matrix)
-        for i in range(n):
-            for j in range(n):
-                if self.matrix[i][j] == 1 and i != j:
-                    all_edges.append((i + 1, j + 1))
-
-        G_original = self.build_graph(all_edges)
-
-        if not self.check_acyclic(G_original):
-            cycles = self.find_cycles(G_original)
-            cycle_str = "\n".join(
-                [
-                    f"Цикл: {' -> '.join(map(str, cycle + [cycle[0]]))}"
-                    for cycle in cycles
-                ]
-            )
-            QMessageBox.warning(
-                self,
-                "Ошибка",
-                f"Граф содержит циклы, что недопустимо для ациклического графа!\n{cycle_str}\n"
-                "Пожалуйста, исправьте матрицу, удалив одно из ребер в каждом цикле.",
-            )
+        file_name, file_filter = QFileDialog.getSaveFileName(
+            self, "Экспорт результатов", "", FILE_FILTERS
+        )
+        if not file_name:
             return
-
-        subsystems = list(nx.strongly_connected_components(G_original))
-
-        all_nodes = set(range(1, n + 1))
-        used_nodes = set().union(*subsystems)
-        isolated_nodes = all_nodes - used_nodes
-        for node in isolated_nodes:
-            subsystems.append({node})
-        subsystems_with_edges = [
-            (subsystem, self.get_subsystem_edges(subsystem)) for subsystem in subsystems
-        ]
-
-        color_map = [
-            "skyblue",
-            "lightcoral",
-            "lightgreen",
-            "gold",
-            "violet",
-            "cyan",
-            "magenta",
-            "yellow",
-            "orange",
-        ]
-        legend_labels = []
-        for idx, subsystem in enumerate(subsystems):
-            legend_labels.append(f"Подсистема {idx + 1}")
-
-        plt.figure(figsize=(8, 6))
-        pos = nx.spring_layout(G_original, seed=42, scale=1.0, center=(0, 0))
-        nx.draw_networkx_nodes(
-            G_original,
-            pos,
-            node_color="white",
-            node_size=800,
-            edgecolors="black",
-            linewidths=1.5,
+        self.profiler.reset()
+        self.worker = AnalysisWorker(
+            partial(export_graph, workers=self.workers),
+            self.decomposition.graph,
+            with_extension(file_name, file_filter),
+            ["subsystems", "subsystem_right_incidence"],
+            profiler=self.profiler,
         )
-        nx.draw_networkx_edges(
-            G_original,
-            pos,
-            edge_color="navy",
-            arrows=True,
-            arrowsize=25,
-            width=1.5,
-            alpha=0.7,
+        self.worker.signals.progress.connect(self.show_progress)
+        self.worker.signals.finished.connect(
+            lambda path: QMessageBox.information(
+                self, "Экспорт", f"Результаты сохранены:\n{path}"
+            )
         )
-        nx.draw_networkx_labels(
-            G_original, pos, font_size=12, font_weight="bold", font_color="black"
+        self.worker.signals.failed.connect(
+            lambda message: QMessageBox.critical(self, "Ошибка", message)
         )
-        plt.title("Исходный граф", fontsize=14, pad=20)
-        plt.axis("off")
-        plt.savefig("original_graph.png", dpi=300, bbox_inches="tight")
-        plt.close()
-
-        G_subsystems = nx.DiGraph()
-        for i in range(len(subsystems)):
-            G_subsystems.add_node(i + 1, label=f"Подсистема {i+1}")
-
-        subsystem_colors = [
-            color_map[i % len(color_map)] for i in range(len(subsystems))
-        ]
-        subsystem_edges = []
-        for i in range(len(subsystems)):
-            for j in range(len(subsystems)):
-                if i != j:
-                    for u in subsystems[i]:
-                        for v in subsystems[j]:
-                            if (u, v) in G_original.edges:
-                                G_subsystems.add_edge(i + 1, j + 1)
-                                subsystem_edges.append((i + 1, j + 1))
-                                break
-                        else:
-                            continue
-                        break
-
-        plt.figure(figsize=(8, 6))
-        pos_sub = nx.spring_layout(G_subsystems, seed=42, scale=1.0, center=(0, 0))
-        nx.draw_networkx_nodes(
-            G_subsystems,
-            pos_sub,
-            node_color=subsystem_colors,
-            node_size=1200,
-            edgecolors="black",
-            linewidths=1.5,
+        self.worker.signals.done.connect(self.finish_worker)
+        self.set_busy(True)
+        self.worker.start()
+
+    def layout_positions(self, graph, engine):
+        """Координаты вершин для рисунка; None — пружинная раскладка NetworkX."""
+        if engine == "spring":
+            return None
+        return self.layout_cache.get(graph, engine)
+
+    def run_analysis(self, matrix_str, image_size, engine, reduce, workers, progress):
+        """Выполняет анализ графа и визуализацию результатов без обращения к виджетам.
+
+        workers — число процессов для поиска подсистем (None — обход
+        Тарьяна); подсистемы нумеруются по-разному, поэтому режим входит в
+        ключи кэша.
+        """
+        progress(0, "Разбор матрицы")
+        try:
+            graph = parse_adjacency(matrix_str)
+        except Exception as e:
+            raise ValueError(f"Ошибка парсинга: {str(e)}")
+
+        cache = self.analysis_cache
+        parallel = workers is not None
+        decomposition = cache.get(
+            graph,
+            ("decomposition", parallel),
+            lambda: decompose(
+                graph,
+                progress=lambda percent, stage: progress(percent * 0.6, stage),
+                workers=workers,
+            ),
         )
-        nx.draw_networkx_edges(
-            G_subsystems,
-            pos_sub,
-            edgelist=subsystem_edges,
-            edge_color="darkgreen",
-            arrows=True,
-            arrowsize=25,
-            width=2,
-            alpha=0.8,
+        # Граф ациклический, если каждая подсистема — одна вершина.
+        if len(decomposition.subsystems) < graph.vertex_count:
+            cycle_str = cache.get(
+                graph, "cycles", lambda: self.find_cycles(graph, progress)
+            )
+            return graph, None, cycle_str, None, None, None
+
+        progress(60, "Отрисовка исходного графа")
+        original_engine = resolve_engine(graph, engine)
+        original_image = cache.render(
+            graph,
+            ("original", original_engine),
+            lambda: draw_original_graph(
+                graph, self.layout_positions(graph, original_engine)
+            ),
+            *image_size,
         )
-        nx.draw_networkx_labels(
-            G_subsystems,
-            pos_sub,
-            labels={n: G_subsystems.nodes[n]["label"] for n in G_subsystems.nodes},
-            font_size=12,
-            font_weight="bold",
-            font_color="black",
+
+        progress(80, "Отрисовка графа подсистем")
+        subsystems = subsystem_graph(decomposition)
+        reachability = cache.get(
+            graph, ("reachability", parallel), lambda: Reachability(subsystems)
         )
-        plt.title("Граф подсистем", fontsize=14, pad=20)
-        plt.legend(
-            handles=[
-                plt.Line2D(
-                    [0],
-                    [0],
-                    marker="o",
-                    color="w",
-                    markerfacecolor=color,
-                    markersize=10,
-                    label=label,
-                )
-                for color, label in zip(subsystem_colors, legend_labels)
-            ],
-            loc="best",
-            frameon=True,
-            edgecolor="black",
+        arcs = None
+        if reduce:
+            sources, targets = reachability.reduction.arcs()
+            arcs = list(zip((sources + 1).tolist(), (targets + 1).tolist()))
+        subsystem_engine = resolve_engine(subsystems, engine)
+        subsystem_image = cache.render(
+            graph,
+            ("subsystems", subsystem_engine, reduce, parallel),
+            lambda: draw_subsystem_graph(
+                decomposition, self.layout_positions(subsystems, subsystem_engine), arcs
+            ),
+            *image_size,
         )
-        plt.axis("off")
-        plt.savefig("subsystem_graph.png", dpi=300, bbox_inches="tight")
-        plt.close()
-
-        result_text = "Подсистемы (связные компоненты):\n\n"
-        for i, (subsystem, edges) in enumerate(subsystems_with_edges, 1):
-            result_text += f"Подсистема {i}:\n"
-            result_text += f"Вершины: {', '.join(map(str, sorted(list(subsystem))))}\n"
-            result_text += f"Дуги: {', '.join([f'{u}--{v}' for u, v in edges]) if edges else 'Нет дуг'}\n\n"
-
-        right_incidence = self.get_subsystem_right_incidence(
-            G_subsystems, len(subsystems)
+
+        progress(95, "Подготовка правок")
+        tracker = AdjacencyTracker(graph)
+        progress(100, "Готово")
+        return (
+            graph,
+            decomposition,
+            None,
+            (original_image, subsystem_image),
+            tracker,
+            reachability,
         )
-        result_text += "Множества правых инциденций для подсистем:\n"
-        for s, inc_set in right_incidence.items():
-            result_text += f"Подсистема {s}: {sorted(list(inc_set)) if inc_set else 'Нет входящих связей'}\n"
 
-        self.result_text.setText(result_text)
-        self.show_graphs()
+    def show_analysis(self, result):
+        """Выводит результаты анализа, полученные из фонового потока."""
+        self.graph, decomposition, cycle_str, images, tracker, reachability = result
+        if cycle_str is not None:
+            QMessageBox.warning(
+                self,
+                "Ошибка",
+                f"Граф содержит циклы, что недопустимо для ациклического графа!\n{cycle_str}"
+                "Пожалуйста, исправьте матрицу, удалив одно из ребер в каждом цикле.",
+            )
+            return
+
+        with self.profiler.span("Вывод отчета"):
+            self.result_view.set_report(DecompositionReport(decomposition))
+        self.tracker = tracker
+        self.set_decomposition(decomposition, reachability)
+        with self.profiler.span("Показ графиков"):
+            self.show_graphs(*images)
+
+    def text_edited(self, position, removed, added):
+        """Запоминает строки матрицы, затронутые правкой текста.
 
-    def show_graphs(self):
-        """Отображает графики в отдельном окне."""
+        Если правка меняет число строк, таблицу нужно разобрать заново, и
+        инкрементальный режим выключается до следующего анализа.
+        """
+        if self.tracker is None:
+            return
+        document = self.matrix_input.document()
+        first = document.findBlock(position).blockNumber()
+        last = document.findBlock(position + added).blockNumber()
+        if document.blockCount() != self.block_count:
+            self.drop_tracker()
+            return
+        for block in range(first, last + 1):
+            if block not in self.row_blocks:
+                self.drop_tracker()
+                return
+            self.dirty_rows.add(block)
+        self.edit_timer.start(EDIT_DELAY_MS)
+
+    def apply_edits(self):
+        """Перечитывает только измененные строки и обновляет декомпозицию.
+
+        Компоненты после правки уже поддерживает DynamicGraph трекера, так
+        что декомпозиция строится по ним (подсистемы — по возрастанию
+        наименьшей вершины), без нового поиска компонент.
+        """
+        if self.tracker is None:
+            return
+        document = self.matrix_input.document()
+        changed = False
+        for block in sorted(self.dirty_rows):
+            line = document.findBlockByNumber(block).text()
+            if not line.strip():
+                self.drop_tracker()
+                return
+            changed |= self.tracker.update_row(self.row_blocks[block], line)
+        self.dirty_rows.clear()
+        dynamic = self.tracker.graph
+        if changed:
+            self.graph = dynamic.to_graph()
+        if changed and dynamic.acyclic:
+            count, component = number_by_first_vertex(dynamic.strong_components()[1])
+            decomposition = component_decomposition(self.graph, count, component)
+            self.result_view.set_report(DecompositionReport(decomposition))
+            self.set_decomposition(decomposition, None)
+        error = self.tracker.error()
+        if error is None and not dynamic.acyclic:
+            error = "Граф содержит циклы — нажмите «Анализировать», чтобы их увидеть"
+        self.show_status(error)
+
+    def set_decomposition(self, decomposition, reachability):
+        """Запоминает декомпозицию для запросов достижимости подсистем.
+
+        reachability может быть None: тогда замыкание графа подсистем
+        строится при первом запросе.
+        """
+        self.decomposition = decomposition
+        self.reachability = reachability
+        self.export_button.setEnabled(self.worker is None)
+        count = len(decomposition.subsystems)
+        for spin in self.reach_spins:
+            spin.blockSignals(True)
+            spin.setRange(1, max(count, 1))
+            spin.blockSignals(False)
+        self.show_reachability()
+
+    def show_reachability(self):
+        """Отвечает, достижима ли одна подсистема из другой (проверка одного бита)."""
+        if self.decomposition is None or not self.decomposition.subsystems:
+            self.reach_label.setText("")
+            return
+        if self.reachability is None:
+            self.reachability = Reachability(subsystem_graph(self.decomposition))
+        source, target = (spin.value() - 1 for spin in self.reach_spins)
+        reachable = self.reachability.component_reaches(source, target)
+        self.reach_label.setText("да" if reachable else "нет")
+
+    def drop_tracker(self):
+        self.tracker = None
+        self.dirty_rows.clear()
+        self.edit_timer.stop()
+        self.show_status(None)
+
+    def show_status(self, message):
+        self.status_label.setText(message or "")
+        self.status_label.setVisible(bool(message))
+
+    def show_progress(self, percent, stage):
+        """Отображает ход анализа."""
+        self.progress_bar.setValue(percent)
+        self.progress_bar.setFormat(f"{stage}: %p%")
+
+    def cancel_worker(self):
+        """Запрашивает отмену текущего анализа."""
+        if self.worker is not None:
+            self.worker.cancel()
+
+    def finish_worker(self):
+        """Возвращает интерфейс в исходное состояние после анализа."""
+        self.worker = None
+        self.set_busy(False)
+        self.profiler.report()
+
+    def set_busy(self, busy):
+        """Блокирует кнопки на время анализа и показывает индикатор."""
+        self.load_button.setEnabled(not busy)
+        self.analyze_button.setEnabled(not busy)
+        self.matrix_input.setReadOnly(busy)
+        self.layout_combo.setEnabled(not busy)
+        self.reduce_check.setEnabled(not busy)
+        self.parallel_check.setEnabled(not busy)
+        self.export_button.setEnabled(not busy and self.decomposition is not None)
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setVisible(busy)
+        self.progress_bar.setValue(0)
+
+    def closeEvent(self, event):
+        self.cancel_worker()
+        super().closeEvent(event)
+
+    def show_graphs(self, original_image, subsystem_image):
+        """Отображает графики, отрисованные в памяти, в отдельном окне."""
         graph_window = QWidget()
         graph_window.setWindowTitle("Графики")
         graph_window.setStyleSheet("background-color: #222222;")
         graph_layout = QHBoxLayout(graph_window)
         graph_layout.setContentsMargins(10, 10, 10, 10)
 
-        original_label = QLabel(graph_window)
-        original_pixmap = QPixmap("original_graph.png")
-        original_label.setPixmap(original_pixmap.scaled(400, 300, Qt.KeepAspectRatio))
-        original_label.setStyleSheet(
-            "background-color: #333333; border-radius: 5px; padding: 5px;"
-        )
-        graph_layout.addWidget(original_label)
-
-        subsystem_label = QLabel(graph_window)
-        subsystem_pixmap = QPixmap("subsystem_graph.png")
-        subsystem_label.setPixmap(subsystem_pixmap.scaled(400, 300, Qt.KeepAspectRatio))
-        subsystem_label.setStyleSheet(
-            "background-color: #333333; border-radius: 5px; padding: 5px;"
-        )
-        graph_layout.addWidget(subsystem_label)
+        ratio = self.devicePixelRatioF()
+        for image in (original_image, subsystem_image):
+            label = QLabel(graph_window)
+            label.setPixmap(image_pixmap(image, ratio))
+            label.setStyleSheet(
+                "background-color: #333333; border-radius: 5px; padding: 5px;"
+            )
+            graph_layout.addWidget(label)
 
         graph_window.setGeometry(200, 200, 800, 300)
         graph_window.show()
+        self.graph_window = graph_window
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = GraphDecompositionApp()
     window.show()
+    QTimer.singleShot(0, warm_up)
     sys.exit(app.exec_())
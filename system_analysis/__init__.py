@@ -0,0 +1,87 @@
+from .analysis import (
+    Decomposition,
+    component_decomposition,
+    convert_incidence,
+    decompose,
+    format_decomposition,
+    format_level,
+    format_levels,
+    format_right_incidence,
+    format_right_incidence_line,
+    level_order,
+    right_incidence_sets,
+)
+from .binary import is_binary_graph, load_graph, save_graph
+from .closure import Reachability, closure_bits
+from .cycles import CycleDiagnostics, cycle_diagnostics, format_cycle_diagnostics
+from .dynamic import AdjacencyTracker, DynamicGraph, IncidenceTracker
+from .graph import SparseGraph
+from .incidence import incidence_arcs
+from .levels import topological_levels
+from .scc import (
+    component_members,
+    condensation,
+    internal_arcs,
+    number_by_first_vertex,
+    strong_components,
+)
+from .validation import ValidationReport, validate_incidence
+from .loaders import (
+    iter_incidence_rows,
+    load_adjacency,
+    load_incidence,
+    load_incidence_graph,
+    parse_adjacency,
+    parse_incidence,
+    read_adjacency,
+    read_incidence,
+    read_incidence_graph,
+    write_adjacency,
+    write_incidence,
+)
+
+__all__ = [
+    "AdjacencyTracker",
+    "CycleDiagnostics",
+    "Decomposition",
+    "DynamicGraph",
+    "IncidenceTracker",
+    "Reachability",
+    "SparseGraph",
+    "ValidationReport",
+    "closure_bits",
+    "component_decomposition",
+    "component_members",
+    "condensation",
+    "convert_incidence",
+    "cycle_diagnostics",
+    "decompose",
+    "format_cycle_diagnostics",
+    "format_decomposition",
+    "format_level",
+    "format_levels",
+    "format_right_incidence",
+    "format_right_incidence_line",
+    "incidence_arcs",
+    "internal_arcs",
+    "is_binary_graph",
+    "iter_incidence_rows",
+    "level_order",
+    "load_adjacency",
+    "load_graph",
+    "load_incidence",
+    "load_incidence_graph",
+    "number_by_first_vertex",
+    "parse_adjacency",
+    "parse_incidence",
+    "read_adjacency",
+    "read_incidence",
+    "read_incidence_graph",
+    "right_incidence_sets",
+    "save_graph",
+    "strong_components",
+    "topological_levels",
+    "validate_incidence",
+    "write_adjacency",
+    "write_incidence",
+]
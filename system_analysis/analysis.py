@@ -0,0 +1,162 @@
+import numpy as np
+
+from .graph import SparseGraph
+from .levels import topological_levels
+from .scc import component_members, condensation, internal_arcs, strong_components
+
+
+def convert_incidence(matrix):
+    """Преобразует матрицу инциденций в граф и множества правых инциденций G+."""
+    graph = SparseGraph.from_incidence(matrix)
+    return graph, right_incidence_sets(graph)
+
+
+def right_incidence_sets(graph):
+    """Строит множества правых инциденций G+ (номера вершин с единицы)."""
+    return {i: (graph.successors(i) + 1).tolist() for i in range(graph.vertex_count)}
+
+
+def format_right_incidence(G_plus):
+    """Формирует текстовый отчет по множествам G+."""
+    text = ""
+    for vertex in sorted(G_plus.keys()):
+        text += format_right_incidence_line(vertex, G_plus[vertex])
+    return text
+
+
+def format_right_incidence_line(vertex, end_vertices):
+    """Строка отчета G+ для одной вершины (номер вершины с нуля)."""
+    end_vertices = (
+        ", ".join(map(str, sorted(set(end_vertices)))) if end_vertices else "0"
+    )
+    return f"Вершина {vertex+1}: {end_vertices}\n"
+
+
+def level_order(graph, progress=None):
+    """Находит иерархические уровни и перестановку вершин по уровням."""
+    levels = [
+        [vertex + 1 for vertex in level]
+        for level in topological_levels(graph, progress=progress)
+    ]
+    swap_vertex = [vertex - 1 for level in levels for vertex in level]
+    return levels, swap_vertex
+
+
+def format_levels(levels):
+    """Формирует текстовый отчет по иерархическим уровням."""
+    result_text = ""
+    for level, vertices_in_level in enumerate(levels):
+        result_text += format_level(level, vertices_in_level)
+    return result_text
+
+
+def format_level(level, vertices_in_level):
+    """Строка отчета для одного иерархического уровня."""
+    return f"Уровень {level}: ({', '.join(map(str, vertices_in_level))})\n"
+
+
+class Decomposition:
+    """Результат топологической декомпозиции графа на подсистемы."""
+
+    def __init__(self, graph, subsystems, subsystem_edges, subsystem_arcs):
+        self.graph = graph
+        self.subsystems = subsystems
+        self.subsystem_edges = subsystem_edges
+        self.subsystem_arcs = subsystem_arcs
+        self.right_incidence = get_subsystem_right_incidence(
+            subsystem_arcs, len(subsystems)
+        )
+
+
+def subsystem_components(graph, workers=None, progress=None):
+    """Сильно связные компоненты в нумерации подсистем decompose.
+
+    Обход Тарьяна начинается с вершин в порядке их первого появления в
+    списке дуг. При заданном workers компоненты ищутся в пуле процессов
+    (parallel_components) и нумеруются по возрастанию наименьшей вершины.
+    Возвращает число компонент и номер компоненты каждой вершины.
+    """
+    if workers is not None:
+        # Пул процессов и разделяемая память нужны только здесь; модуль
+        # не загружается при запуске окон.
+        from .parallel import parallel_components
+
+        return parallel_components(graph, workers, progress)
+    sources, targets = graph.arcs()
+    endpoints = np.column_stack((sources, targets)).ravel()
+    _, first_seen = np.unique(endpoints, return_index=True)
+    return strong_components(graph, roots=endpoints[np.sort(first_seen)].tolist())
+
+
+def decompose(graph, progress=None, workers=None):
+    """Выделяет подсистемы (сильно связные компоненты) и связи между ними.
+
+    Подсистемы идут в порядке обхода Тарьяна от вершин в порядке их первого
+    появления в списке дуг; изолированные вершины — в конце по возрастанию.
+    При заданном workers компоненты ищутся в workers процессах, и
+    подсистемы идут по возрастанию наименьшей вершины.
+
+    Дуги внутри подсистем и связи между ними находятся за один проход по
+    дугам через номер компоненты каждой вершины. progress(percent, stage),
+    если задан, вызывается между этапами.
+    """
+    progress = progress or (lambda percent, stage: None)
+    progress(0, "Поиск сильно связных компонент")
+    count, component = subsystem_components(
+        graph, workers, lambda percent, stage: progress(percent * 30 // 100, stage)
+    )
+    return component_decomposition(graph, count, component, progress)
+
+
+def component_decomposition(graph, count, component, progress=None):
+    """Декомпозиция по уже найденным компонентам сильной связности.
+
+    count и component — как у strong_components: подсистема c + 1 состоит
+    из вершин компоненты c. Так декомпозиция строится и по компонентам,
+    которые поддерживает DynamicGraph, без их повторного поиска.
+    """
+    progress = progress or (lambda percent, stage: None)
+    members, bounds = component_members(component, count)
+    members = (members + 1).tolist()
+    bounds = bounds.tolist()
+    subsystems = [set(members[bounds[c] : bounds[c + 1]]) for c in range(count)]
+
+    progress(30, "Дуги внутри подсистем")
+    sources, targets, bounds = internal_arcs(graph, component, count)
+    edges = list(zip((sources + 1).tolist(), (targets + 1).tolist()))
+    bounds = bounds.tolist()
+    subsystem_edges = [edges[bounds[c] : bounds[c + 1]] for c in range(count)]
+
+    progress(60, "Связи между подсистемами")
+    condensed = condensation(graph, component, count)
+    condensed_sources, condensed_targets = condensed.arcs()
+    subsystem_arcs = list(
+        zip((condensed_sources + 1).tolist(), (condensed_targets + 1).tolist())
+    )
+
+    progress(100, "Декомпозиция завершена")
+    return Decomposition(graph, subsystems, subsystem_edges, subsystem_arcs)
+
+
+def get_subsystem_right_incidence(subsystem_arcs, num_subsystems):
+    """Определяет множества правых инциденций для подсистем."""
+    right_incidence = {i + 1: set() for i in range(num_subsystems)}
+    for source, target in subsystem_arcs:
+        right_incidence[target].add(source)
+    return right_incidence
+
+
+def format_decomposition(decomposition):
+    """Формирует текстовый отчет по подсистемам и их правым инциденциям."""
+    result_text = "Подсистемы (связные компоненты):\n\n"
+    for i, (subsystem, edges) in enumerate(
+        zip(decomposition.subsystems, decomposition.subsystem_edges), 1
+    ):
+        result_text += f"Подсистема {i}:\n"
+        result_text += f"Вершины: {', '.join(map(str, sorted(list(subsystem))))}\n"
+        result_text += f"Дуги: {', '.join([f'{u}--{v}' for u, v in edges]) if edges else 'Нет дуг'}\n\n"
+
+    result_text += "Множества правых инциденций для подсистем:\n"
+    for s, inc_set in decomposition.right_incidence.items():
+        result_text += f"Подсистема {s}: {sorted(list(inc_set)) if inc_set else 'Нет входящих связей'}\n"
+    return result_text
@@ -0,0 +1,210 @@
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from .analysis import decompose, level_order, right_incidence_sets
+from .binary import is_binary_graph, load_graph
+from .loaders import load_adjacency, load_incidence_graph
+
+SUMMARY_NAME = "summary.json"
+FATAL_STAGES = {"load", "analysis", "worker"}
+
+
+def detect_format(path):
+    """Определяет формат файла: двоичный граф, матрица инциденций или смежности.
+
+    Матрица инциденций начинается с заголовка «вершины дуги», и следующая
+    строка содержит столько значений, сколько дуг указано в заголовке.
+    """
+    if is_binary_graph(path):
+        return "binary"
+    with open(path, "r", encoding="utf-8") as file:
+        lines = (line.split() for line in file if line.strip())
+        header = next(lines, [])
+        row = next(lines, [])
+    if len(header) == 2 and all(value.isdigit() for value in header):
+        m, n = map(int, header)
+        if m >= 1 and n >= 1 and len(row) == n:
+            return "incidence"
+    return "adjacency"
+
+
+def collect_inputs(patterns):
+    """Раскрывает каталоги и шаблоны в отсортированный список файлов."""
+    paths = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "**", "*.txt")
+        paths.update(
+            path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)
+        )
+    return sorted(os.path.abspath(path) for path in paths)
+
+
+def result_name(path, root):
+    """Имя файла результата: путь относительно root с заменой разделителей."""
+    relative = os.path.relpath(path, root)
+    return relative.replace(os.sep, "__") + ".json"
+
+
+def analyze_file(path):
+    """Анализирует один файл и возвращает результат в виде словаря.
+
+    Ошибки отдельных этапов (например, контур при построении уровней)
+    попадают в список errors, не прерывая остальные этапы.
+    """
+    result = {"input": path, "errors": []}
+    try:
+        result["format"] = detect_format(path)
+        if result["format"] == "binary":
+            graph = load_graph(path)
+        elif result["format"] == "incidence":
+            graph = load_incidence_graph(path, unique=False)
+        else:
+            graph = load_adjacency(path)
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        result["errors"].append({"stage": "load", "message": str(e)})
+        return result
+
+    result["vertices"] = graph.vertex_count
+    result["arcs"] = graph.arc_count
+    result["right_incidence"] = {
+        str(vertex + 1): targets
+        for vertex, targets in right_incidence_sets(graph).items()
+    }
+    try:
+        result["levels"] = level_order(graph)[0]
+    except ValueError as e:
+        result["levels"] = None
+        result["errors"].append({"stage": "levels", "message": str(e)})
+
+    decomposition = decompose(graph)
+    result["subsystems"] = [
+        {
+            "vertices": sorted(subsystem),
+            "arcs": [list(arc) for arc in edges],
+            "right_incidence": sorted(decomposition.right_incidence[i]),
+        }
+        for i, (subsystem, edges) in enumerate(
+            zip(decomposition.subsystems, decomposition.subsystem_edges), 1
+        )
+    ]
+    result["subsystem_arcs"] = [list(arc) for arc in decomposition.subsystem_arcs]
+    return result
+
+
+def run_file(path, output_path):
+    """Обрабатывает файл в рабочем процессе и пишет результат на диск.
+
+    Возвращает только краткую запись для сводки.
+    """
+    start = time.perf_counter()
+    try:
+        result = analyze_file(path)
+    except Exception as e:
+        result = {
+            "input": path,
+            "errors": [{"stage": "analysis", "message": f"{type(e).__name__}: {e}"}],
+        }
+    result["seconds"] = time.perf_counter() - start
+    with open(output_path, "w", encoding="utf-8") as file:
+        json.dump(result, file, ensure_ascii=False)
+    return {
+        "input": path,
+        "output": output_path,
+        "status": status(result["errors"]),
+        "format": result.get("format"),
+        "vertices": result.get("vertices"),
+        "seconds": result["seconds"],
+        "errors": result["errors"],
+    }
+
+
+def status(errors):
+    """Итог по файлу: ok, partial (часть этапов с ошибками) или failed."""
+    if any(error["stage"] in FATAL_STAGES for error in errors):
+        return "failed"
+    return "partial" if errors else "ok"
+
+
+def _run_pool(paths, output_dir, root, workers, finished):
+    """Обрабатывает файлы в пуле процессов.
+
+    Возвращает файлы, не завершенные из-за падения пула; для одиночного
+    файла такое падение записывается как его ошибка.
+    """
+    broken = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(
+                run_file, path, os.path.join(output_dir, result_name(path, root))
+            ): path
+            for path in paths
+        }
+        for future in as_completed(futures):
+            try:
+                finished(future.result())
+            except BrokenProcessPool as e:
+                if len(paths) > 1:
+                    broken.append(futures[future])
+                else:
+                    finished(_failed(futures[future], e))
+            except Exception as e:
+                finished(_failed(futures[future], e))
+    return sorted(broken)
+
+
+def _failed(path, error):
+    return {
+        "input": path,
+        "output": None,
+        "status": "failed",
+        "errors": [{"stage": "worker", "message": f"{type(error).__name__}: {error}"}],
+    }
+
+
+def run_batch(patterns, output_dir, workers=None, log=None):
+    """Раскладывает файлы по пулу процессов и пишет сводку summary.json.
+
+    Сбой одного файла отмечается в сводке и не останавливает обработку
+    остальных. Если рабочий процесс падает целиком, незавершенные файлы
+    перезапускаются по одному, чтобы ошибка досталась только виновнику.
+    """
+    paths = collect_inputs(patterns)
+    if not paths:
+        raise ValueError("Не найдено ни одного входного файла")
+    os.makedirs(output_dir, exist_ok=True)
+    root = os.path.commonpath([os.path.dirname(path) for path in paths])
+    workers = workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    files = []
+
+    def finished(record):
+        files.append(record)
+        if log is not None:
+            print(
+                f"[{len(files)}/{len(paths)}] {record['status']}: {record['input']}",
+                file=log,
+            )
+
+    broken = _run_pool(paths, output_dir, root, min(workers, len(paths)), finished)
+    for path in broken:
+        _run_pool([path], output_dir, root, 1, finished)
+
+    files.sort(key=lambda record: record["input"])
+    summary = {
+        "files": len(files),
+        "ok": sum(1 for record in files if record["status"] == "ok"),
+        "partial": sum(1 for record in files if record["status"] == "partial"),
+        "failed": sum(1 for record in files if record["status"] == "failed"),
+        "workers": workers,
+        "seconds": time.perf_counter() - start,
+        "results": files,
+    }
+    with open(os.path.join(output_dir, SUMMARY_NAME), "w", encoding="utf-8") as file:
+        json.dump(summary, file, ensure_ascii=False, indent=2)
+    return summary
@@ -0,0 +1,372 @@
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .analysis import (
+    convert_incidence,
+    decompose,
+    format_decomposition,
+    format_levels,
+    format_right_incidence,
+    level_order,
+)
+from .generators import layered_dag, planted_scc_graph, random_dag
+from .loaders import parse_adjacency, parse_incidence, write_adjacency, write_incidence
+
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+CELL_LIMIT = 20_000_000
+RENDER_LIMIT = 500
+RENDER_SIZE = (400, 300)
+STARTUP_BUDGET = 1.0
+LAB_WINDOWS = {
+    "lab1": ("system-analysis-lab1/main.py", "MainWindow"),
+    "lab2": ("system-analysis-lab2/main.py", "GraphConverter"),
+    "lab3": ("system-analysis-lab3/main.py", "GraphDecompositionApp"),
+}
+STARTUP_SCRIPT = """
+import runpy, sys, time
+start = time.perf_counter()
+namespace = runpy.run_path(sys.argv[1], run_name="startup")
+imported = time.perf_counter()
+app = namespace["QApplication"](sys.argv[:1])
+window = namespace[sys.argv[2]]()
+window.show()
+app.processEvents()
+print(imported - start, time.perf_counter() - start)
+"""
+
+
+class Benchmark:
+    """Замеряет этапы анализа: лучшее время из repeat запусков и пиковую память."""
+
+    def __init__(self, repeat=1, memory=True, log=None):
+        self.repeat = repeat
+        self.memory = memory
+        self.log = log
+        self.results = []
+
+    def measure(self, workload, graph, stage, function, *args):
+        """Выполняет этап и записывает результат; при ошибке возвращает None."""
+        record = {
+            "workload": workload,
+            "vertices": graph.vertex_count,
+            "arcs": graph.arc_count,
+            "stage": stage,
+        }
+        self.results.append(record)
+        try:
+            seconds = []
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                result = function(*args)
+                seconds.append(time.perf_counter() - start)
+            record["seconds"] = min(seconds)
+            if self.memory:
+                tracemalloc.start()
+                try:
+                    function(*args)
+                    record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+        except Exception as e:
+            record["error"] = f"{type(e).__name__}: {e}"
+            result = None
+        self._report(record)
+        return result
+
+    def skip(self, workload, graph, stage, reason):
+        record = {
+            "workload": workload,
+            "vertices": graph.vertex_count,
+            "arcs": graph.arc_count,
+            "stage": stage,
+            "skipped": reason,
+        }
+        self.results.append(record)
+        self._report(record)
+
+    def _report(self, record):
+        if self.log is None:
+            return
+        if "seconds" in record:
+            outcome = f"{record['seconds']:.4f} с"
+            if "peak_bytes" in record:
+                outcome += f", {record['peak_bytes'] / 2**20:.1f} МБ"
+        else:
+            outcome = record.get("error") or f"пропущено: {record['skipped']}"
+        print(
+            f"{record['workload']:>10} {record['vertices']:>8} {record['stage']:>10}: {outcome}",
+            file=self.log,
+        )
+
+
+def bench_incidence(bench, n, degree, seed):
+    """ЛР №1: разбор матрицы инциденций, построение A и G+, отчет."""
+    graph = random_dag(n, degree * n, seed)
+    if n * graph.arc_count > CELL_LIMIT:
+        for stage in ("parse", "convert", "report"):
+            bench.skip("incidence", graph, stage, "матрица больше CELL_LIMIT")
+        return
+    text = io.StringIO()
+    write_incidence(graph, text)
+    matrix = bench.measure(
+        "incidence", graph, "parse", parse_incidence, text.getvalue()
+    )
+    if matrix is None:
+        return
+    converted = bench.measure("incidence", graph, "convert", convert_incidence, matrix)
+    if converted is not None:
+        bench.measure(
+            "incidence", graph, "report", format_right_incidence, converted[1]
+        )
+
+
+def bench_levels(bench, n, degree, seed):
+    """ЛР №2: иерархические уровни ярусного графа и отчет."""
+    graph = layered_dag(n, max(1, int(np.sqrt(n))), degree * n, seed)
+    result = bench.measure("levels", graph, "levels", level_order, graph)
+    if result is not None:
+        bench.measure("levels", graph, "report", format_levels, result[0])
+
+
+def bench_decompose(bench, n, degree, seed):
+    """ЛР №3: разбор матрицы смежности, декомпозиция, отчет и отрисовка."""
+    graph, _ = planted_scc_graph(n, max(1, n // 10), degree * n, seed)
+    if n * n > CELL_LIMIT:
+        bench.skip("decompose", graph, "parse", "матрица больше CELL_LIMIT")
+    else:
+        text = io.StringIO()
+        write_adjacency(graph, text)
+        graph = (
+            bench.measure("decompose", graph, "parse", parse_adjacency, text.getvalue())
+            or graph
+        )
+    decomposition = bench.measure("decompose", graph, "decompose", decompose, graph)
+    if decomposition is None:
+        return
+    bench.measure("decompose", graph, "report", format_decomposition, decomposition)
+    if n > RENDER_LIMIT:
+        bench.skip("decompose", graph, "render", "граф больше RENDER_LIMIT")
+    else:
+        bench.measure("decompose", graph, "render", render, graph, decomposition)
+
+
+def render(graph, decomposition):
+    """Рисует оба графа ЛР №3 в память (Agg) в размере окна лабораторной."""
+    from .drawing import draw_original_graph, draw_subsystem_graph, render_figure
+
+    for figure in (draw_original_graph(graph), draw_subsystem_graph(decomposition)):
+        render_figure(figure, *RENDER_SIZE)
+
+
+WORKLOADS = {
+    "incidence": bench_incidence,
+    "levels": bench_levels,
+    "decompose": bench_decompose,
+}
+
+
+def revision():
+    """Возвращает текущий коммит git, если пакет лежит в репозитории."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, workloads, degree=2, seed=0, repeat=1, memory=True, log=None):
+    """Прогоняет выбранные нагрузки на всех размерах и возвращает отчет."""
+    bench = Benchmark(repeat=repeat, memory=memory, log=log)
+    for n in sizes:
+        for name in workloads:
+            WORKLOADS[name](bench, n, degree, seed)
+    return {
+        "revision": revision(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": seed,
+        "degree": degree,
+        "repeat": repeat,
+        "results": bench.results,
+    }
+
+
+def parse_importtime(text):
+    """Модули верхнего уровня из вывода -X importtime: имя и суммарное время, с."""
+    modules = []
+    for line in text.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):
+            modules.append((name.strip(), int(cumulative) / 1e6))
+    return modules
+
+
+def measure_startup(lab, python=sys.executable):
+    """Холодный запуск окна лабораторной в отдельном процессе с -X importtime.
+
+    Замеряются импорт main.py и время до показа окна (платформа Qt
+    offscreen, если не задана другая); тяжелые модули — по importtime.
+    """
+    path, window = LAB_WINDOWS[lab]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", STARTUP_SCRIPT, path, window],
+        cwd=root,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    process_seconds = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    import_seconds, window_seconds = map(float, completed.stdout.split()[-2:])
+    modules = sorted(parse_importtime(completed.stderr), key=lambda m: -m[1])
+    return {
+        "lab": lab,
+        "import_seconds": import_seconds,
+        "window_seconds": window_seconds,
+        "process_seconds": process_seconds,
+        "heaviest": modules[:8],
+    }
+
+
+def check_startup(labs, budget=STARTUP_BUDGET, log=None):
+    """Замеряет запуск окон и сравнивает время до показа окна с бюджетом.
+
+    Возвращает замеры и признак того, что все окна уложились в бюджет.
+    """
+    results = []
+    within = True
+    for lab in labs:
+        result = measure_startup(lab)
+        result["budget"] = budget
+        within &= result["window_seconds"] <= budget
+        results.append(result)
+        if log is not None:
+            heaviest = ", ".join(
+                f"{name} {seconds:.3f}" for name, seconds in result["heaviest"][:4]
+            )
+            verdict = "ok" if result["window_seconds"] <= budget else "превышен"
+            print(
+                f"{lab}: окно {result['window_seconds']:.3f} с "
+                f"(импорт {result['import_seconds']:.3f} с, процесс "
+                f"{result['process_seconds']:.3f} с), бюджет {budget} с — {verdict}; "
+                f"тяжелее всего: {heaviest}",
+                file=log,
+            )
+    return results, within
+
+
+def compare(old, new):
+    """Сравнивает два отчета по времени этапов; возвращает текст таблицы."""
+
+    def index(report):
+        return {
+            (r["workload"], r["vertices"], r["stage"]): r
+            for r in report["results"]
+            if "seconds" in r
+        }
+
+    old_index, new_index = index(old), index(new)
+    lines = [f"{old.get('revision')} -> {new.get('revision')}"]
+    for key in sorted(old_index.keys() & new_index.keys()):
+        before = old_index[key]["seconds"]
+        after = new_index[key]["seconds"]
+        ratio = after / before if before > 0 else float("inf")
+        lines.append(
+            f"{key[0]:>10} {key[1]:>8} {key[2]:>10}: {before:.4f} -> {after:.4f} с (x{ratio:.2f})"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m system_analysis.benchmark",
+        description="Замеры алгоритмов лабораторных работ на синтетических графах.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    command = commands.add_parser("run", help="выполнить замеры")
+    command.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="числа вершин"
+    )
+    command.add_argument(
+        "--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS)
+    )
+    command.add_argument("--degree", type=int, default=2, help="дуг на вершину")
+    command.add_argument("--seed", type=int, default=0)
+    command.add_argument("--repeat", type=int, default=1)
+    command.add_argument(
+        "--no-memory", action="store_true", help="не замерять пиковую память"
+    )
+    command.add_argument("-o", "--output", help="файл JSON (по умолчанию stdout)")
+
+    command = commands.add_parser("compare", help="сравнить два файла замеров")
+    command.add_argument("old")
+    command.add_argument("new")
+
+    command = commands.add_parser(
+        "startup", help="проверить время запуска окон лабораторных (-X importtime)"
+    )
+    command.add_argument(
+        "--labs", nargs="+", choices=list(LAB_WINDOWS), default=list(LAB_WINDOWS)
+    )
+    command.add_argument(
+        "--budget", type=float, default=STARTUP_BUDGET, help="секунд до показа окна"
+    )
+    command.add_argument("-o", "--output", help="файл JSON с замерами")
+
+    args = parser.parse_args(argv)
+    if args.command == "startup":
+        results, within = check_startup(args.labs, args.budget, log=sys.stderr)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, ensure_ascii=False, indent=2)
+        return 0 if within else 1
+    if args.command == "compare":
+        with open(args.old, encoding="utf-8") as old, open(
+            args.new, encoding="utf-8"
+        ) as new:
+            sys.stdout.write(compare(json.load(old), json.load(new)))
+        return 0
+
+    report = run(
+        args.sizes,
+        args.workloads,
+        degree=args.degree,
+        seed=args.seed,
+        repeat=args.repeat,
+        memory=not args.no_memory,
+        log=sys.stderr,
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
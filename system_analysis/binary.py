@@ -0,0 +1,58 @@
+import os
+
+import numpy as np
+
+from .graph import SparseGraph
+
+MAGIC = b"SAGRAPH1"
+HEADER = np.dtype(
+    [
+        ("magic", "S8"),
+        ("vertex_count", "<i8"),
+        ("arc_count", "<i8"),
+        ("reserved", "<i8"),
+    ]
+)
+
+
+def is_binary_graph(path):
+    """Проверяет, записан ли файл в двоичном формате графа."""
+    with open(path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def save_graph(graph, path):
+    """Сохраняет граф в двоичный файл: заголовок, смещения int64, концы дуг int32."""
+    header = np.zeros(1, dtype=HEADER)
+    header["magic"] = MAGIC
+    header["vertex_count"] = graph.vertex_count
+    header["arc_count"] = graph.arc_count
+    with open(path, "wb") as file:
+        header.tofile(file)
+        np.asarray(graph.offsets, dtype="<i8").tofile(file)
+        np.asarray(graph.targets, dtype="<i4").tofile(file)
+
+
+def load_graph(path):
+    """Открывает двоичный файл графа через numpy.memmap без копирования данных."""
+    header = np.fromfile(path, dtype=HEADER, count=1)
+    if len(header) == 0 or header["magic"][0] != MAGIC:
+        raise ValueError(f"Файл {path} не является двоичным файлом графа")
+    vertex_count = int(header["vertex_count"][0])
+    arc_count = int(header["arc_count"][0])
+
+    offsets_start = HEADER.itemsize
+    targets_start = offsets_start + 8 * (vertex_count + 1)
+    if os.path.getsize(path) != targets_start + 4 * arc_count:
+        raise ValueError(f"Файл графа {path} поврежден: неверный размер")
+
+    offsets = np.memmap(
+        path, dtype="<i8", mode="r", offset=offsets_start, shape=(vertex_count + 1,)
+    )
+    if arc_count == 0:
+        targets = np.zeros(0, dtype="<i4")
+    else:
+        targets = np.memmap(
+            path, dtype="<i4", mode="r", offset=targets_start, shape=(arc_count,)
+        )
+    return SparseGraph(vertex_count, offsets, targets)
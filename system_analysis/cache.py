@@ -0,0 +1,219 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .drawing import render_figure
+
+ANALYSIS_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "system_analysis", "analysis"
+)
+CACHE_DIR_ENV = "SYSTEM_ANALYSIS_CACHE_DIR"
+MEMORY_LIMIT = 256 * 2**20
+DISK_LIMIT = 1024 * 2**20
+# Меняется при несовместимой смене формата файлов кэша.
+CACHE_FORMAT = 1
+
+_code_salt = None
+
+
+def disk_directory(value=None):
+    """Каталог дискового кэша по CACHE_DIR_ENV или None (кэш только в памяти).
+
+    Пустое значение выключает дисковый кэш, «1» выбирает ANALYSIS_DIR,
+    любое другое значение — путь к каталогу.
+    """
+    value = os.environ.get(CACHE_DIR_ENV, "") if value is None else value
+    if not value:
+        return None
+    return ANALYSIS_DIR if value == "1" else os.path.expanduser(value)
+
+
+def code_salt():
+    """Хеш формата кэша и исходников пакета для имен файлов на диске.
+
+    Результаты, сохраненные другой версией кода (например, объекты
+    Decomposition прежнего вида), после любого изменения пакета просто не
+    находятся, а не возвращаются молча.
+    """
+    global _code_salt
+    if _code_salt is None:
+        digest = hashlib.blake2b(str(CACHE_FORMAT).encode(), digest_size=8)
+        package = os.path.dirname(os.path.abspath(__file__))
+        for name in sorted(os.listdir(package)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(package, name), "rb") as file:
+                    digest.update(file.read())
+        _code_salt = digest.hexdigest()
+    return _code_salt
+
+
+def value_size(value):
+    """Приблизительный объем значения в памяти, байт (массивы NumPy — по nbytes)."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(value_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            value_size(key) + value_size(item) for key, item in value.items()
+        )
+    if hasattr(value, "__dict__"):
+        return value_size(vars(value))
+    return sys.getsizeof(value)
+
+
+class AnalysisCache:
+    """Кэш результатов анализа по хешу содержимого графа.
+
+    Ключ — хеш графа (SparseGraph.content_hash) и вид результата: уровни,
+    декомпозиция, отчет G+, рисунок и т. п. В памяти хранится LRU объемом
+    не больше max_bytes; если задан каталог (см. disk_directory), результаты
+    также пишутся на диск (pickle) и переживают перезапуск программы, а
+    самые старые файлы удаляются сверх max_disk_bytes. Имена файлов
+    включают code_salt(), так что файлы другой версии кода не читаются, а
+    файл, который не удалось загрузить, удаляется. Значение, не
+    помещающееся в лимит, просто не кэшируется.
+
+    Кэшированные значения общие для всех вызывающих, изменять их нельзя.
+    """
+
+    def __init__(
+        self, max_bytes=MEMORY_LIMIT, directory=None, max_disk_bytes=DISK_LIMIT
+    ):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, graph, kind, compute):
+        """Возвращает результат вида kind для графа или вычисляет его compute()."""
+        key = (graph.content_hash(), kind)
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+
+        value = self._load(key)
+        if value is not None:
+            with self.lock:
+                self.disk_hits += 1
+        else:
+            with self.lock:
+                self.misses += 1
+            value = compute()
+            self._store(key, value)
+        self._remember(key, value)
+        return value
+
+    def render(self, graph, kind, draw, width, height):
+        """Рисунок графа из кэша или отрисованная в памяти фигура draw()."""
+        return self.get(
+            graph, (kind, width, height), lambda: render_figure(draw(), width, height)
+        )
+
+    def stats(self):
+        """Счетчики попаданий и промахов и текущий объем кэша в памяти."""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "bytes": self.size,
+            }
+
+    def clear(self):
+        """Очищает кэш в памяти (файлы на диске остаются)."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def _remember(self, key, value):
+        size = value_size(value)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+                self.evictions += 1
+
+    def _path(self, key):
+        graph_hash, kind = key
+        parts = kind if isinstance(kind, tuple) else (kind,)
+        return os.path.join(
+            self.directory,
+            "-".join((code_salt(), graph_hash, *map(str, parts))) + ".pickle",
+        )
+
+    def _load(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                value = pickle.load(file)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Поврежденный или несовместимый файл: кэш не должен ронять
+            # анализ, значение просто считается заново.
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return value
+
+    def _store(self, key, value):
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            if len(data) > self.max_disk_bytes:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temporary, "wb") as file:
+                file.write(data)
+            os.replace(temporary, path)
+            self._trim_disk()
+        except (OSError, pickle.PicklingError):
+            pass
+
+    def _trim_disk(self):
+        """Удаляет самые давно использованные файлы сверх max_disk_bytes."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pickle"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,326 @@
+import argparse
+import sys
+
+import numpy as np
+
+from .analysis import (
+    decompose,
+    format_decomposition,
+    format_levels,
+    format_right_incidence,
+    level_order,
+    right_incidence_sets,
+)
+from .binary import is_binary_graph, load_graph, save_graph
+from .closure import Reachability
+from .cycles import DEFAULT_CYCLE_LIMIT, cycle_diagnostics, format_cycle_diagnostics
+from .export import FORMATS, SECTIONS, export_graph
+from .layout import (
+    ENGINE_TITLES,
+    LAYOUT_DIR,
+    LayoutCache,
+    compute_layout,
+    resolve_engine,
+    save_layout,
+    subsystem_graph,
+)
+from .loaders import (
+    load_adjacency,
+    load_incidence_graph,
+    write_adjacency,
+    write_incidence,
+)
+
+
+def format_matrix(matrix):
+    return "".join(" ".join(map(str, row)) + "\n" for row in matrix.tolist())
+
+
+def read_graph(path, text_format, unique=True):
+    """Загружает граф из двоичного файла или из текстовой матрицы."""
+    if is_binary_graph(path):
+        return load_graph(path)
+    if text_format == "incidence":
+        return load_incidence_graph(path, unique=unique)
+    return load_adjacency(path)
+
+
+def run_convert(args):
+    graph = read_graph(args.input, "incidence")
+    G_plus = right_incidence_sets(graph)
+    return (
+        "Матрица смежности A:\n"
+        + format_matrix(graph.to_dense())
+        + "\nМножество правых инциденций G+:\n"
+        + format_right_incidence(G_plus)
+    )
+
+
+def run_levels(args):
+    graph = read_graph(args.input, "incidence", unique=False)
+    levels, swap_vertex = level_order(graph)
+    adjacency = graph.to_dense()[np.ix_(swap_vertex, swap_vertex)]
+    return (
+        "Иерархические уровни:\n"
+        + format_levels(levels)
+        + "\nНовая матрица смежности:\n"
+        + format_matrix(adjacency)
+    )
+
+
+def run_decompose(args):
+    graph = read_graph(args.input, "adjacency")
+    return format_decomposition(decompose(graph, workers=args.jobs))
+
+
+def run_cycles(args):
+    graph = read_graph(args.input, "adjacency")
+    return format_cycle_diagnostics(cycle_diagnostics(graph, limit=args.limit))
+
+
+def run_reach(args):
+    reachability = Reachability(
+        subsystem_graph(decompose(read_graph(args.input, "adjacency")))
+    )
+    if args.query:
+        source, target = args.query
+        for subsystem in (source, target):
+            if not 1 <= subsystem <= reachability.count:
+                raise ValueError(f"Нет подсистемы {subsystem}")
+        reachable = reachability.component_reaches(source - 1, target - 1)
+        verdict = "достижима" if reachable else "не достижима"
+        return f"Подсистема {target} {verdict} из подсистемы {source}\n"
+    if args.reduce:
+        sources, targets = reachability.reduction.arcs()
+        return "Транзитивное сокращение графа подсистем:\n" + "".join(
+            f"{u}--{v}\n"
+            for u, v in zip((sources + 1).tolist(), (targets + 1).tolist())
+        )
+    result_text = "Достижимые подсистемы:\n"
+    for component in range(reachability.count):
+        reachable = reachability.descendants(component) + 1
+        listed = ", ".join(map(str, reachable.tolist())) or "Нет"
+        result_text += f"Подсистема {component + 1}: {listed}\n"
+    return result_text
+
+
+def run_pack(args):
+    save_graph(read_graph(args.input, args.format, unique=False), args.output)
+
+
+def run_unpack(args):
+    graph = load_graph(args.input)
+    writer = write_incidence if args.format == "incidence" else write_adjacency
+    with open(args.output, "w", encoding="utf-8") as file:
+        writer(graph, file)
+
+
+def run_layout(args):
+    graph = read_graph(args.input, args.format, unique=False)
+    engine = resolve_engine(graph, args.engine)
+    positions = compute_layout(graph, engine)
+    if args.layout_output:
+        output = args.layout_output
+        save_layout(output, graph, engine, positions)
+    else:
+        output = LayoutCache(LAYOUT_DIR).store(graph, engine, positions)
+    return f"Раскладка {engine} сохранена: {output}\n"
+
+
+def run_export(args):
+    from .batch import detect_format
+
+    text_format = detect_format(args.input)
+    graph = read_graph(args.input, text_format, unique=False)
+    export_graph(graph, args.export_output, args.sections, args.to)
+    return f"Результаты сохранены: {args.export_output}\n"
+
+
+def run_batch_command(args):
+    # Пакетный режим и сервис (пулы процессов, asyncio) импортируются в
+    # своих командах, чтобы не замедлять запуск остальных.
+    from .batch import run_batch
+
+    summary = run_batch(args.inputs, args.output_dir, args.jobs, log=sys.stderr)
+    return (
+        f"Файлов: {summary['files']}, без ошибок: {summary['ok']}, "
+        f"частично: {summary['partial']}, с ошибками: {summary['failed']}\n"
+        f"Результаты: {args.output_dir}\n"
+    )
+
+
+def run_serve(args):
+    from .service import DEFAULT_PORT, run_service
+
+    port = DEFAULT_PORT if args.port is None else args.port
+    run_service(port, args.jobs, args.queue, log=sys.stderr)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m system_analysis",
+        description="Анализ графов лабораторных работ без графического интерфейса.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, handler, help_text in (
+        ("convert", run_convert, "матрица инциденций -> смежности и G+ (ЛР №1)"),
+        ("levels", run_levels, "иерархические уровни графа (ЛР №2)"),
+        ("decompose", run_decompose, "декомпозиция на подсистемы (ЛР №3)"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("input", help="файл в формате graph.txt/matrix.txt")
+        command.add_argument(
+            "-o", "--output", help="файл для результата (по умолчанию stdout)"
+        )
+        if name == "decompose":
+            command.add_argument(
+                "-j",
+                "--jobs",
+                type=int,
+                help="искать подсистемы в пуле процессов (0 — по числу ядер)",
+            )
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser(
+        "cycles", help="компоненты с циклами и дуги для их разрыва"
+    )
+    command.add_argument("input", help="файл с матрицей смежности")
+    command.add_argument("-o", "--output", help="файл для результата")
+    command.add_argument(
+        "-n",
+        "--limit",
+        type=int,
+        default=DEFAULT_CYCLE_LIMIT,
+        help="сколько циклов и дуг показывать",
+    )
+    command.set_defaults(handler=run_cycles)
+
+    command = commands.add_parser(
+        "reach", help="достижимость и транзитивное сокращение графа подсистем"
+    )
+    command.add_argument("input", help="файл с матрицей смежности")
+    command.add_argument("-o", "--output", help="файл для результата")
+    command.add_argument(
+        "-q",
+        "--query",
+        nargs=2,
+        type=int,
+        metavar=("X", "Y"),
+        help="достижима ли подсистема Y из подсистемы X",
+    )
+    command.add_argument(
+        "-r",
+        "--reduce",
+        action="store_true",
+        help="вывести дуги транзитивного сокращения графа подсистем",
+    )
+    command.set_defaults(handler=run_reach)
+
+    for name, handler, help_text in (
+        ("pack", run_pack, "текстовая матрица -> двоичный файл графа"),
+        ("unpack", run_unpack, "двоичный файл графа -> текстовая матрица"),
+    ):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("input")
+        command.add_argument("output")
+        command.add_argument(
+            "-f",
+            "--format",
+            choices=("adjacency", "incidence"),
+            default="adjacency",
+            help="текстовый формат: матрица смежности или инциденций",
+        )
+        command.set_defaults(handler=handler)
+
+    command = commands.add_parser(
+        "layout", help="рассчитать и сохранить координаты вершин для рисунка"
+    )
+    command.add_argument("input")
+    command.add_argument(
+        "-o",
+        "--output",
+        dest="layout_output",
+        help="файл .npz (по умолчанию — кэш раскладок окон)",
+    )
+    command.add_argument("-e", "--engine", choices=list(ENGINE_TITLES), default="auto")
+    command.add_argument(
+        "-f",
+        "--format",
+        choices=("adjacency", "incidence"),
+        default="adjacency",
+        help="текстовый формат: матрица смежности или инциденций",
+    )
+    command.set_defaults(handler=run_layout, output=None)
+
+    command = commands.add_parser(
+        "export", help="выгрузить результаты анализа в JSON Lines, CSV или .npz"
+    )
+    command.add_argument("input", help="матрица инциденций, смежности или .sag")
+    command.add_argument(
+        "export_output", metavar="output", help="файл .jsonl, .csv или .npz"
+    )
+    command.add_argument(
+        "-s",
+        "--sections",
+        nargs="+",
+        choices=SECTIONS,
+        help="разделы (по умолчанию все; уровни — если в графе нет контура)",
+    )
+    command.add_argument(
+        "-t", "--to", choices=FORMATS, help="формат (по умолчанию — по расширению)"
+    )
+    command.set_defaults(handler=run_export, output=None)
+
+    command = commands.add_parser(
+        "batch", help="пакетный анализ каталога или шаблона файлов"
+    )
+    command.add_argument(
+        "inputs", nargs="+", help="каталоги (ищутся *.txt) или шаблоны glob"
+    )
+    command.add_argument(
+        "-d", "--output-dir", default="results", help="каталог для результатов"
+    )
+    command.add_argument(
+        "-j", "--jobs", type=int, help="число процессов (по умолчанию — ядер)"
+    )
+    command.set_defaults(handler=run_batch_command, output=None)
+
+    command = commands.add_parser(
+        "serve", help="локальный HTTP/JSON-сервис анализа (только 127.0.0.1)"
+    )
+    command.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        help="порт (по умолчанию 8765, 0 — свободный)",
+    )
+    command.add_argument(
+        "-j", "--jobs", type=int, help="число процессов (по умолчанию — ядер)"
+    )
+    command.add_argument(
+        "-q",
+        "--queue",
+        type=int,
+        help="сколько задач ждут сверх числа процессов (по умолчанию 4 на процесс)",
+    )
+    command.set_defaults(handler=run_serve, output=None)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        result = args.handler(args)
+    except (OSError, ValueError) as e:
+        print(f"Ошибка: {e}", file=sys.stderr)
+        return 1
+
+    if result is None:
+        return 0
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(result)
+    else:
+        sys.stdout.write(result)
+    return 0
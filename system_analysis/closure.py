@@ -0,0 +1,83 @@
+import numpy as np
+
+from .graph import SparseGraph
+from .levels import topological_levels
+from .scc import condensation, strong_components
+
+
+def closure_bits(dag):
+    """Транзитивное замыкание ациклического графа в упакованных битах.
+
+    Строка вершины — массив uint64, где бит t установлен, если t достижима
+    из нее путем хотя бы из одной дуги. Вершины обходятся в обратном
+    топологическом порядке, и строка вершины — это OR строк ее преемников
+    и битов самих преемников. Память — около V² / 8 байт.
+
+    Тем же проходом находится транзитивное сокращение: дуга u -> t лишняя,
+    если t достижима из другого преемника u. Возвращает строки и маску
+    оставляемых дуг в порядке массива targets графа.
+    """
+    n = dag.vertex_count
+    rows = np.zeros((n, (n + 63) // 64), dtype=np.uint64)
+    keep = np.zeros(dag.arc_count, dtype=bool)
+    offsets = dag.offsets.tolist()
+    for level in reversed(topological_levels(dag)):
+        for vertex in level:
+            start, end = offsets[vertex], offsets[vertex + 1]
+            if start == end:
+                continue
+            successors = dag.targets[start:end].astype(np.int64)
+            words = successors >> 6
+            bits = np.left_shift(np.uint64(1), (successors & 63).astype(np.uint64))
+            indirect = np.bitwise_or.reduce(rows[successors], axis=0)
+            keep[start:end] = (indirect[words] & bits) == 0
+            np.bitwise_or.at(indirect, words, bits)
+            rows[vertex] = indirect
+    return rows, keep
+
+
+def bit_indices(row):
+    """Номера установленных битов строки uint64 по возрастанию."""
+    bits = np.unpackbits(row.astype("<u8").view(np.uint8), bitorder="little")
+    return np.flatnonzero(bits)
+
+
+class Reachability:
+    """Достижимость между вершинами графа после предварительного расчета.
+
+    Замыкание строится для графа конденсации (см. closure_bits), поэтому
+    граф может содержать контуры: вершины одной сильно связной компоненты
+    достижимы друг из друга. Запрос о паре вершин — O(1): номер
+    компоненты и проверка одного бита.
+    """
+
+    def __init__(self, graph, component=None, count=None):
+        if component is None:
+            count, component = strong_components(graph)
+        self.component = component
+        self.count = count
+        self.condensed = condensation(graph, component, count)
+        self.rows, keep = closure_bits(self.condensed)
+        sources, targets = self.condensed.arcs()
+        self.reduction = SparseGraph.from_arcs(count, sources[keep], targets[keep])
+
+    def component_reaches(self, source, target):
+        """Достижима ли компонента target из компоненты source (или это она же)."""
+        if source == target:
+            return True
+        return bool((int(self.rows[source, target >> 6]) >> (target & 63)) & 1)
+
+    def reaches(self, source, target):
+        """Есть ли путь из вершины source в вершину target (или это она же)."""
+        return self.component_reaches(
+            int(self.component[source]), int(self.component[target])
+        )
+
+    def descendants(self, component):
+        """Компоненты, достижимые из компоненты (без нее самой)."""
+        return bit_indices(self.rows[component])
+
+    def ancestors(self, component):
+        """Компоненты, из которых достижима компонента (без нее самой)."""
+        column = (self.rows[:, component >> 6] >> np.uint64(component & 63)) & 1
+        return np.flatnonzero(column)
@@ -0,0 +1,222 @@
+import heapq
+from collections import deque
+
+from .scc import component_members, strong_components
+
+DEFAULT_CYCLE_LIMIT = 20
+PRUNE_BUDGET = 10_000_000
+
+
+class CycleDiagnostics:
+    """Сводка по циклам графа.
+
+    components — компоненты сильной связности из нескольких вершин,
+    cycles — по одному циклу в первых limit из них, feedback_arcs — дуги,
+    удаление которых делает граф ациклическим. Вершины нумеруются с нуля.
+    """
+
+    def __init__(self, components, cycles, feedback_arcs, limit):
+        self.components = components
+        self.cycles = cycles
+        self.feedback_arcs = feedback_arcs
+        self.limit = limit
+
+    @property
+    def acyclic(self):
+        return not self.components
+
+
+def cycle_diagnostics(graph, limit=DEFAULT_CYCLE_LIMIT, progress=None):
+    """Находит компоненты с циклами, цикл-свидетель и дуги для разрыва циклов.
+
+    Время и память линейны по размеру графа; limit ограничивает число
+    циклов-свидетелей, а не работу по поиску дуг для удаления.
+    """
+    progress = progress or (lambda percent, stage: None)
+    progress(0, "Поиск компонент с циклами")
+    count, component = strong_components(graph)
+    members, bounds = component_members(component, count)
+    members = members.tolist()
+    bounds = bounds.tolist()
+    components = [
+        members[bounds[c] : bounds[c + 1]]
+        for c in range(count)
+        if bounds[c + 1] - bounds[c] > 1
+    ]
+    components.sort(key=lambda component: component[0])
+
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    component_of = {}
+    for index, component in enumerate(components):
+        for vertex in component:
+            component_of[vertex] = index
+
+    cycles = []
+    for index, cycle in enumerate(iter_witness_cycles(offsets, targets, components)):
+        if index >= limit:
+            break
+        cycles.append(cycle)
+
+    feedback = []
+    for index, component in enumerate(components):
+        progress(50 + 50 * index // len(components), "Подбор дуг для удаления")
+        feedback.extend(
+            component_feedback_arcs(offsets, targets, component, component_of, index)
+        )
+    progress(100, "Анализ циклов завершен")
+    return CycleDiagnostics(components, cycles, feedback, limit)
+
+
+def iter_witness_cycles(offsets, targets, components):
+    """Лениво выдает по одному кратчайшему циклу через наименьшую вершину компоненты."""
+    for component in components:
+        members = set(component)
+        start = component[0]
+        parent = {start: None}
+        queue = deque([start])
+        cycle = None
+        while queue and cycle is None:
+            vertex = queue.popleft()
+            for target in targets[offsets[vertex] : offsets[vertex + 1]]:
+                if target == start:
+                    cycle = [vertex]
+                    while parent[cycle[-1]] is not None:
+                        cycle.append(parent[cycle[-1]])
+                    cycle.reverse()
+                    break
+                if target in members and target not in parent:
+                    parent[target] = vertex
+                    queue.append(target)
+        yield cycle
+
+
+def component_feedback_arcs(offsets, targets, component, component_of, index):
+    """Подбирает дуги компоненты, удаление которых разрывает все ее циклы.
+
+    Порядок вершин строится жадным алгоритмом Идса—Лина—Смита, дуги против
+    порядка образуют разрезающее множество. Затем, если позволяет бюджет,
+    возвращаются дуги, не замыкающие цикл, и множество становится
+    минимальным по включению.
+    """
+    successors = {
+        vertex: [
+            target
+            for target in targets[offsets[vertex] : offsets[vertex + 1]]
+            if component_of.get(target) == index
+        ]
+        for vertex in component
+    }
+    predecessors = {vertex: [] for vertex in component}
+    for vertex, vertex_successors in successors.items():
+        for target in vertex_successors:
+            predecessors[target].append(vertex)
+
+    position = {
+        vertex: i for i, vertex in enumerate(_greedy_order(successors, predecessors))
+    }
+    feedback = [
+        (vertex, target)
+        for vertex, vertex_successors in successors.items()
+        for target in vertex_successors
+        if position[vertex] > position[target]
+    ]
+
+    arc_count = sum(len(vertex_successors) for vertex_successors in successors.values())
+    if len(feedback) * arc_count > PRUNE_BUDGET:
+        return feedback
+
+    removed = set(feedback)
+    for arc in feedback:
+        removed.discard(arc)
+        if _reaches(successors, removed, arc[1], arc[0]):
+            removed.add(arc)
+    return [arc for arc in feedback if arc in removed]
+
+
+def _greedy_order(successors, predecessors):
+    out_degree = {vertex: len(successors[vertex]) for vertex in successors}
+    in_degree = {vertex: len(predecessors[vertex]) for vertex in predecessors}
+    alive = set(successors)
+    sinks = [vertex for vertex in alive if out_degree[vertex] == 0]
+    sources = [vertex for vertex in alive if in_degree[vertex] == 0]
+    heap = [(in_degree[vertex] - out_degree[vertex], vertex) for vertex in alive]
+    heapq.heapify(heap)
+    head, tail = [], []
+
+    def remove(vertex):
+        alive.discard(vertex)
+        for source in predecessors[vertex]:
+            if source in alive:
+                out_degree[source] -= 1
+                if out_degree[source] == 0:
+                    sinks.append(source)
+                heapq.heappush(heap, (in_degree[source] - out_degree[source], source))
+        for target in successors[vertex]:
+            if target in alive:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    sources.append(target)
+                heapq.heappush(heap, (in_degree[target] - out_degree[target], target))
+
+    while alive:
+        if sinks:
+            vertex = sinks.pop()
+            if vertex in alive:
+                remove(vertex)
+                tail.append(vertex)
+        elif sources:
+            vertex = sources.pop()
+            if vertex in alive:
+                remove(vertex)
+                head.append(vertex)
+        else:
+            key, vertex = heapq.heappop(heap)
+            if vertex in alive and key == in_degree[vertex] - out_degree[vertex]:
+                remove(vertex)
+                head.append(vertex)
+    return head + tail[::-1]
+
+
+def _reaches(successors, removed, start, goal):
+    seen = {start}
+    stack = [start]
+    while stack:
+        vertex = stack.pop()
+        if vertex == goal:
+            return True
+        for target in successors[vertex]:
+            if target not in seen and (vertex, target) not in removed:
+                seen.add(target)
+                stack.append(target)
+    return False
+
+
+def format_cycle_diagnostics(diagnostics, vertex_limit=20):
+    """Формирует текстовый отчет по циклам (номера вершин с единицы)."""
+
+    def vertices(items):
+        text = ", ".join(str(vertex + 1) for vertex in items[:vertex_limit])
+        if len(items) > vertex_limit:
+            text += f", … (всего {len(items)})"
+        return text
+
+    if diagnostics.acyclic:
+        return "Циклов нет.\n"
+
+    text = f"Компонент с циклами: {len(diagnostics.components)}\n"
+    for i, (component, cycle) in enumerate(
+        zip(diagnostics.components, diagnostics.cycles), 1
+    ):
+        text += f"Компонента {i}, вершины: {vertices(component)}\n"
+        text += f"Цикл: {' -> '.join(str(v + 1) for v in cycle + [cycle[0]])}\n"
+    hidden = len(diagnostics.components) - len(diagnostics.cycles)
+    if hidden > 0:
+        text += f"… и еще компонент с циклами: {hidden}\n"
+
+    arcs = diagnostics.feedback_arcs
+    shown = ", ".join(f"{u + 1}--{v + 1}" for u, v in arcs[: diagnostics.limit])
+    if len(arcs) > diagnostics.limit:
+        shown += f", … (всего {len(arcs)})"
+    text += f"Чтобы устранить все циклы, достаточно удалить дуги: {shown}\n"
+    return text
@@ -0,0 +1,248 @@
+import math
+
+import numpy as np
+
+from .graph import SparseGraph
+
+SUBSYSTEM_COLORS = [
+    "skyblue",
+    "lightcoral",
+    "lightgreen",
+    "gold",
+    "violet",
+    "cyan",
+    "magenta",
+    "yellow",
+    "orange",
+]
+LABEL_LIMIT = 500
+
+
+def render_figure(figure, width, height, pad_inches=0.1):
+    """Рисует фигуру в памяти (Agg) так, чтобы она уместилась в width x height.
+
+    Поля обрезаются, как при savefig(bbox_inches="tight"). Возвращает массив
+    RGBA формы (высота, ширина, 4).
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    canvas = FigureCanvasAgg(figure)
+    bbox = figure.get_tightbbox(canvas.get_renderer()).padded(pad_inches)
+    dpi = min(width / bbox.width, height / bbox.height)
+    figure.set_dpi(dpi)
+    canvas.draw()
+    image = np.asarray(canvas.buffer_rgba())
+
+    rows, columns = image.shape[:2]
+    left = max(0, math.floor(bbox.x0 * dpi))
+    right = min(columns, math.ceil(bbox.x1 * dpi))
+    top = max(0, rows - math.ceil(bbox.y1 * dpi))
+    bottom = min(rows, rows - math.floor(bbox.y0 * dpi))
+    return np.ascontiguousarray(image[top:bottom, left:right][:height, :width])
+
+
+def draw_digraph(G, pos):
+    """Рисует граф ЛР №1 (nx.DiGraph с готовыми координатами) на новой фигуре."""
+    import networkx as nx
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=(8, 6))
+    ax = figure.add_subplot()
+    nx.draw(
+        G,
+        pos,
+        ax=ax,
+        with_labels=True,
+        node_color="lightblue",
+        node_size=500,
+        font_size=12,
+        font_weight="bold",
+        arrows=True,
+        edge_color="gray",
+    )
+    ax.set_title("Визуализация графа")
+    return figure
+
+
+def arc_graph(graph):
+    """Строит nx.DiGraph из дуг графа (номера вершин с единицы, без изолированных)."""
+    import networkx as nx
+
+    sources, targets = graph.arcs()
+    G = nx.DiGraph()
+    G.add_edges_from(zip((sources + 1).tolist(), (targets + 1).tolist()))
+    return G
+
+
+def draw_large_graph(graph, positions, title, node_color="black", edge_color="gray"):
+    """Рисует большой граф по готовым координатам: точки и отрезки без подписей.
+
+    Дуги собираются в одну LineCollection, поэтому отрисовка остается
+    быстрой и для сотен тысяч вершин.
+    """
+    from matplotlib.collections import LineCollection
+    from matplotlib.figure import Figure
+
+    sources, targets = graph.arcs()
+    figure = Figure(figsize=(8, 6))
+    ax = figure.add_subplot()
+    ax.add_collection(
+        LineCollection(
+            np.stack((positions[sources], positions[targets]), axis=1),
+            colors=edge_color,
+            linewidths=0.3,
+            alpha=0.3,
+        )
+    )
+    ax.scatter(
+        positions[:, 0], positions[:, 1], s=2, c=node_color, linewidths=0, zorder=2
+    )
+    ax.autoscale_view()
+    ax.set_title(title, fontsize=14, pad=20)
+    ax.axis("off")
+    return figure
+
+
+def draw_original_graph(graph, positions=None):
+    """Рисует исходный граф на новой фигуре matplotlib.
+
+    positions — координаты вершин (массив n x 2) от layout; по умолчанию
+    используется пружинная раскладка NetworkX.
+    """
+    import networkx as nx
+    from matplotlib.figure import Figure
+
+    if positions is not None and graph.vertex_count > LABEL_LIMIT:
+        return draw_large_graph(graph, positions, "Исходный граф", edge_color="navy")
+    G_original = arc_graph(graph)
+    figure = Figure(figsize=(8, 6))
+    ax = figure.add_subplot()
+    if positions is None:
+        pos = nx.spring_layout(G_original, seed=42, scale=1.0, center=(0, 0))
+    else:
+        pos = {v: positions[v - 1] for v in G_original}
+    nx.draw_networkx_nodes(
+        G_original,
+        pos,
+        node_color="white",
+        node_size=800,
+        edgecolors="black",
+        linewidths=1.5,
+        ax=ax,
+    )
+    nx.draw_networkx_edges(
+        G_original,
+        pos,
+        edge_color="navy",
+        arrows=True,
+        arrowsize=25,
+        width=1.5,
+        alpha=0.7,
+        ax=ax,
+    )
+    nx.draw_networkx_labels(
+        G_original,
+        pos,
+        font_size=12,
+        font_weight="bold",
+        font_color="black",
+        ax=ax,
+    )
+    ax.set_title("Исходный граф", fontsize=14, pad=20)
+    ax.axis("off")
+    return figure
+
+
+def draw_subsystem_graph(decomposition, positions=None, arcs=None):
+    """Рисует граф подсистем с легендой на новой фигуре matplotlib.
+
+    positions — координаты подсистем (массив k x 2), как в draw_original_graph.
+    arcs — дуги между подсистемами (нумерация с единицы), если рисовать
+    нужно не все, например транзитивное сокращение.
+    """
+    import networkx as nx
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
+
+    subsystems = decomposition.subsystems
+    if arcs is None:
+        arcs = decomposition.subsystem_arcs
+    if positions is not None and len(subsystems) > LABEL_LIMIT:
+        arc_array = np.array(arcs, dtype=np.int64).reshape(-1, 2) - 1
+        colors = np.array(SUBSYSTEM_COLORS)[
+            np.arange(len(subsystems)) % len(SUBSYSTEM_COLORS)
+        ]
+        return draw_large_graph(
+            SparseGraph.from_arcs(len(subsystems), arc_array[:, 0], arc_array[:, 1]),
+            positions,
+            "Граф подсистем",
+            node_color=colors,
+            edge_color="darkgreen",
+        )
+    legend_labels = [f"Подсистема {idx + 1}" for idx in range(len(subsystems))]
+
+    G_subsystems = nx.DiGraph()
+    for i in range(len(subsystems)):
+        G_subsystems.add_node(i + 1, label=f"Подсистема {i+1}")
+
+    subsystem_colors = [
+        SUBSYSTEM_COLORS[i % len(SUBSYSTEM_COLORS)] for i in range(len(subsystems))
+    ]
+    subsystem_edges = arcs
+    G_subsystems.add_edges_from(subsystem_edges)
+
+    figure = Figure(figsize=(8, 6))
+    ax = figure.add_subplot()
+    if positions is None:
+        pos_sub = nx.spring_layout(G_subsystems, seed=42, scale=1.0, center=(0, 0))
+    else:
+        pos_sub = {v: positions[v - 1] for v in G_subsystems}
+    nx.draw_networkx_nodes(
+        G_subsystems,
+        pos_sub,
+        node_color=subsystem_colors,
+        node_size=1200,
+        edgecolors="black",
+        linewidths=1.5,
+        ax=ax,
+    )
+    nx.draw_networkx_edges(
+        G_subsystems,
+        pos_sub,
+        edgelist=subsystem_edges,
+        edge_color="darkgreen",
+        arrows=True,
+        arrowsize=25,
+        width=2,
+        alpha=0.8,
+        ax=ax,
+    )
+    nx.draw_networkx_labels(
+        G_subsystems,
+        pos_sub,
+        labels={n: G_subsystems.nodes[n]["label"] for n in G_subsystems.nodes},
+        font_size=12,
+        font_weight="bold",
+        font_color="black",
+        ax=ax,
+    )
+    ax.set_title("Граф подсистем", fontsize=14, pad=20)
+    ax.legend(
+        handles=[
+            Line2D(
+                [0],
+                [0],
+                marker="o",
+                color="w",
+                markerfacecolor=color,
+                markersize=10,
+                label=label,
+            )
+            for color, label in zip(subsystem_colors, legend_labels)
+        ],
+        loc="best",
+        frameon=True,
+        edgecolor="black",
+    )
+    ax.axis("off")
+    return figure
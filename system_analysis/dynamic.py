@@ -0,0 +1,433 @@
+import heapq
+
+import numpy as np
+
+from .graph import SparseGraph
+from .incidence import _column_error
+from .levels import topological_levels
+from .loaders import adjacency_targets
+from .scc import component_members, condensation, strong_components
+
+
+class DynamicGraph:
+    """Граф, в который добавляют и из которого удаляют дуги без полного пересчета.
+
+    Помимо множеств правых и левых инциденций (с кратностями дуг)
+    поддерживаются разбиение на сильно связные компоненты с их
+    топологическим порядком (алгоритм Пирса—Келли со слиянием компонент
+    при появлении контура) и иерархический уровень каждой компоненты в
+    графе конденсации. Правка затрагивает только вершины между концами
+    дуги в текущем порядке и потомков, чей уровень изменился, а не весь
+    граф.
+
+    Компонента обозначается одной из своих вершин (представителем);
+    position и depth хранят место компоненты в топологическом порядке и
+    ее уровень. У ациклического графа каждая вершина — своя компонента,
+    и depth совпадает с уровнями послойной сортировки Кана.
+
+    Ненужные структуры можно отключить: без уровней (levels=False) правка,
+    меняющая уровни многих потомков, остается дешевой, а без компонент
+    (components=False) граф хранит только дуги.
+    """
+
+    def __init__(self, graph, components=True, levels=True):
+        n = graph.vertex_count
+        self.vertex_count = n
+        self.arc_count = graph.arc_count
+        self.succ = [{} for _ in range(n)]
+        self.pred = [{} for _ in range(n)]
+        sources, targets = graph.arcs()
+        for source, target in zip(sources.tolist(), targets.tolist()):
+            self.succ[source][target] = self.succ[source].get(target, 0) + 1
+            self.pred[target][source] = self.pred[target].get(source, 0) + 1
+        self.members = {}
+        self.position = None
+        self.depth = None
+        self.changed_levels = set()
+        if not components:
+            return
+
+        count, component = strong_components(graph)
+        members, bounds = component_members(component, count)
+        representative = members[bounds[:-1]]
+        self.component = representative[component].tolist()
+        self.position = np.zeros(n, dtype=np.int64)
+        self.position[representative] = count - 1 - np.arange(count)
+        for c in np.flatnonzero(np.diff(bounds) > 1).tolist():
+            self.members[int(representative[c])] = set(
+                members[bounds[c] : bounds[c + 1]].tolist()
+            )
+        if levels:
+            self.depth = np.zeros(n, dtype=np.int64)
+            for level, components in enumerate(
+                topological_levels(condensation(graph, component, count))
+            ):
+                self.depth[representative[components]] = level
+
+    @property
+    def acyclic(self):
+        return not self.members
+
+    def has_arc(self, source, target):
+        return target in self.succ[source]
+
+    def multiplicity(self, source, target):
+        """Число параллельных дуг source -> target."""
+        return self.succ[source].get(target, 0)
+
+    def successors(self, vertex):
+        """Возвращает концы дуг, выходящих из вершины, без повторов и по возрастанию."""
+        return sorted(self.succ[vertex])
+
+    def add_arc(self, source, target):
+        """Добавляет дугу и обновляет компоненты, порядок и уровни."""
+        if source == target:
+            raise ValueError(f"Петля в вершине {source+1} не допускается")
+        count = self.succ[source].get(target, 0)
+        self.succ[source][target] = count + 1
+        self.pred[target][source] = count + 1
+        self.arc_count += 1
+        if count == 0 and self.position is not None:
+            self._insert(source, target)
+
+    def remove_arc(self, source, target):
+        """Удаляет одну дугу source -> target и обновляет компоненты и уровни."""
+        count = self.succ[source].get(target, 0)
+        if count == 0:
+            raise ValueError(f"Дуги {source+1}--{target+1} нет в графе")
+        self.arc_count -= 1
+        if count > 1:
+            self.succ[source][target] = count - 1
+            self.pred[target][source] = count - 1
+            return
+        del self.succ[source][target]
+        del self.pred[target][source]
+        if self.position is not None:
+            self._delete(source, target)
+
+    def _members(self, component):
+        return self.members.get(component, (component,))
+
+    def _reach(self, start, arcs, low, high):
+        """Компоненты, достижимые из start по arcs в пределах мест [low, high]."""
+        seen = {start}
+        stack = [start]
+        while stack:
+            for vertex in self._members(stack.pop()):
+                for neighbor in arcs[vertex]:
+                    c = self.component[neighbor]
+                    if c not in seen and low <= self.position[c] <= high:
+                        seen.add(c)
+                        stack.append(c)
+        return seen
+
+    def _insert(self, source, target):
+        source_component = self.component[source]
+        target_component = self.component[target]
+        if source_component == target_component:
+            return
+        low = self.position[target_component]
+        high = self.position[source_component]
+        if high < low:
+            self._update_depths([target_component])
+            return
+
+        # Дуга нарушает порядок: переставляем только компоненты между ее
+        # концами. Достижимые из конца уходят вправо, ведущие в начало —
+        # влево; компоненты на обоих путях образуют контур и сливаются.
+        forward = self._reach(target_component, self.succ, low, high)
+        backward = self._reach(source_component, self.pred, low, high)
+        merged = forward & backward if source_component in forward else set()
+        slots = sorted(self.position[c] for c in forward | backward)
+        key = self.position.__getitem__
+        before = sorted(backward - merged, key=key)
+        after = sorted(forward - merged, key=key)
+        for c, slot in zip(before, slots):
+            self.position[c] = slot
+        for c, slot in zip(after, slots[len(slots) - len(after) :]):
+            self.position[c] = slot
+        if merged:
+            self.position[source_component] = slots[len(before)]
+            self._merge(merged, source_component)
+            self._update_depths([source_component], force=True)
+        else:
+            self._update_depths([target_component])
+
+    def _merge(self, components, representative):
+        vertices = set()
+        for c in components:
+            vertices.update(self._members(c))
+            self.members.pop(c, None)
+        for vertex in vertices:
+            self.component[vertex] = representative
+        self.members[representative] = vertices
+
+    def _delete(self, source, target):
+        component = self.component[source]
+        if component != self.component[target]:
+            self._update_depths([self.component[target]])
+            return
+
+        # Дуга была внутри компоненты: ищем компоненты только среди ее
+        # вершин и ставим их на ее место в топологическом порядке.
+        vertices = sorted(self.members[component])
+        index = {vertex: i for i, vertex in enumerate(vertices)}
+        sources, targets = [], []
+        for vertex in vertices:
+            for neighbor in self.succ[vertex]:
+                if neighbor in index:
+                    sources.append(index[vertex])
+                    targets.append(index[neighbor])
+        count, local = strong_components(
+            SparseGraph.from_arcs(len(vertices), sources, targets)
+        )
+        if count == 1:
+            return
+
+        slot = self.position[component]
+        self.position[self.position > slot] += count - 1
+        del self.members[component]
+        members, bounds = component_members(local, count)
+        members = members.tolist()
+        parts = []
+        for c in range(count):
+            part = [vertices[i] for i in members[bounds[c] : bounds[c + 1]]]
+            self.position[part[0]] = slot + count - 1 - c
+            for vertex in part:
+                self.component[vertex] = part[0]
+            if len(part) > 1:
+                self.members[part[0]] = set(part)
+            parts.append(part[0])
+        self._update_depths(parts, force=True)
+
+    def _update_depths(self, starts, force=False):
+        """Пересчитывает уровни компонент starts и дальше в топологическом порядке.
+
+        Уровень — длина самого длинного пути до компоненты из истоков графа
+        конденсации. Потомки пересчитываются, только если уровень
+        изменился (или force для компонент, которые только что слились или
+        распались: их вершины раньше могли стоять на других уровнях).
+        """
+        if self.depth is None:
+            return
+        heap = [(self.position[c], c) for c in starts]
+        heapq.heapify(heap)
+        queued = set(starts)
+        forced = set(starts) if force else set()
+        while heap:
+            _, component = heapq.heappop(heap)
+            queued.discard(component)
+            depth = 0
+            for vertex in self._members(component):
+                for neighbor in self.pred[vertex]:
+                    c = self.component[neighbor]
+                    if c != component and self.depth[c] >= depth:
+                        depth = self.depth[c] + 1
+            if depth == self.depth[component] and component not in forced:
+                continue
+            self.changed_levels.update((int(self.depth[component]), int(depth)))
+            self.depth[component] = depth
+            for vertex in self._members(component):
+                for neighbor in self.succ[vertex]:
+                    c = self.component[neighbor]
+                    if c != component and c not in queued:
+                        queued.add(c)
+                        heapq.heappush(heap, (self.position[c], c))
+
+    def pop_changed_levels(self):
+        """Возвращает номера уровней, состав которых менялся с прошлого вызова."""
+        changed = sorted(self.changed_levels)
+        self.changed_levels.clear()
+        return changed
+
+    def level_order(self):
+        """Уровни и перестановка вершин — то же, что analysis.level_order."""
+        self.check_acyclic()
+        if not self.vertex_count:
+            return [], []
+        swap_vertex = np.argsort(self.depth, kind="stable")
+        bounds = np.cumsum(np.bincount(self.depth))[:-1]
+        levels = [level.tolist() for level in np.split(swap_vertex + 1, bounds)]
+        return levels, swap_vertex.tolist()
+
+    def check_acyclic(self):
+        """Проверяет, что уровни определены; иначе ValueError с теми же
+        вершинами, что у topological_levels (на контурах и после них)."""
+        if self.depth is None:
+            raise ValueError("Уровни не поддерживаются (levels=False)")
+        if not self.members:
+            return
+        stack = [vertex for vertices in self.members.values() for vertex in vertices]
+        cyclic = set(stack)
+        while stack:
+            for neighbor in self.succ[stack.pop()]:
+                if neighbor not in cyclic:
+                    cyclic.add(neighbor)
+                    stack.append(neighbor)
+        raise ValueError(
+            "Граф содержит контур, уровни не определены.\n"
+            "Вершины, не попавшие ни на один уровень: "
+            f"{', '.join(str(vertex + 1) for vertex in sorted(cyclic))}"
+        )
+
+    def strong_components(self):
+        """Компоненты в том же виде, что scc.strong_components.
+
+        Номера компонент идут в обратном топологическом порядке.
+        """
+        representatives, component = np.unique(self.component, return_inverse=True)
+        rank = np.empty(len(representatives), dtype=np.int64)
+        rank[np.argsort(-self.position[representatives])] = np.arange(
+            len(representatives)
+        )
+        return len(representatives), rank[component]
+
+    def to_graph(self):
+        """Снимок текущего графа в виде SparseGraph."""
+        sources, targets = [], []
+        for source, arcs in enumerate(self.succ):
+            for target, count in arcs.items():
+                sources.extend([source] * count)
+                targets.extend([target] * count)
+        return SparseGraph.from_arcs(self.vertex_count, sources, targets)
+
+
+class IncidenceTracker:
+    """Переносит правки отдельных ячеек матрицы инциденций в DynamicGraph.
+
+    Трекер хранит свою копию матрицы; set_value меняет ячейку и
+    перечитывает только ее столбец. Некорректные столбцы не дают дуги и
+    запоминаются, чтобы показать ошибку, как при полном разборе.
+    components и levels передаются в DynamicGraph.
+    """
+
+    def __init__(self, matrix, unique=True, components=True, levels=True):
+        matrix = np.array(matrix)
+        self.matrix = matrix
+        self.unique = unique
+        is_start = matrix == 1
+        is_end = matrix == -1
+        valid = (
+            (is_start.sum(axis=0) == 1)
+            & (is_end.sum(axis=0) == 1)
+            & ~(~(is_start | is_end | (matrix == 0))).any(axis=0)
+        )
+        self.starts = np.where(valid, is_start.argmax(axis=0), -1)
+        self.ends = np.where(valid, is_end.argmax(axis=0), -1)
+        self.invalid = set(np.flatnonzero(~valid).tolist())
+        self.graph = DynamicGraph(
+            SparseGraph.from_arcs(len(matrix), self.starts[valid], self.ends[valid]),
+            components=components,
+            levels=levels,
+        )
+        self.duplicates = {
+            (source, target)
+            for source in range(self.graph.vertex_count)
+            for target, count in self.graph.succ[source].items()
+            if count > 1
+        }
+
+    def set_value(self, row, column, value):
+        """Записывает значение ячейки; возвращает то же, что update_column."""
+        self.matrix[row, column] = value
+        return self.update_column(column)
+
+    def update_column(self, column):
+        """Перечитывает столбец после правки; возвращает прежнюю и новую дугу.
+
+        Дуга — пара (начало, конец) или None для некорректного столбца.
+        """
+        values = self.matrix[:, column]
+        starts = np.flatnonzero(values == 1)
+        ends = np.flatnonzero(values == -1)
+        if len(starts) == 1 and len(ends) == 1 and np.count_nonzero(values) == 2:
+            new = (int(starts[0]), int(ends[0]))
+            self.invalid.discard(column)
+        else:
+            new = None
+            self.invalid.add(column)
+        old = None
+        if self.starts[column] >= 0:
+            old = (int(self.starts[column]), int(self.ends[column]))
+        if new == old:
+            return old, new
+
+        if old is not None:
+            self.graph.remove_arc(*old)
+            if self.graph.multiplicity(*old) < 2:
+                self.duplicates.discard(old)
+        if new is not None:
+            self.graph.add_arc(*new)
+            if self.graph.multiplicity(*new) > 1:
+                self.duplicates.add(new)
+        self.starts[column], self.ends[column] = new or (-1, -1)
+        return old, new
+
+    def error(self):
+        """Текст ошибки первого неверного столбца (как у полного разбора) или None.
+
+        Неверен некорректный столбец, а при unique — и повтор уже
+        встречавшейся дуги.
+        """
+        columns = [min(self.invalid)] if self.invalid else []
+        if self.unique:
+            for source, target in self.duplicates:
+                same = np.flatnonzero((self.starts == source) & (self.ends == target))
+                columns.append(int(same[1]))
+        if not columns:
+            return None
+        column = min(columns)
+        if column not in self.invalid:
+            return (
+                f"Ребро между вершинами {self.starts[column]+1} и "
+                f"{self.ends[column]+1} уже существует"
+            )
+        values = self.matrix[:, column]
+        invalid = np.flatnonzero((values != 0) & (values != 1) & (values != -1))
+        return _column_error(
+            column,
+            np.flatnonzero(values == 1)[:2],
+            np.flatnonzero(values == -1)[:2],
+            invalid[0] if len(invalid) else None,
+            values[invalid[0]] if len(invalid) else None,
+        )
+
+
+class AdjacencyTracker:
+    """Переносит правки отдельных строк текстовой матрицы смежности в DynamicGraph.
+
+    Строка с ошибкой не меняет граф и запоминается до исправления.
+    """
+
+    def __init__(self, graph):
+        self.graph = DynamicGraph(graph, levels=False)
+        self.errors = {}
+
+    def update_row(self, row, line):
+        """Перечитывает строку матрицы; возвращает True, если дуги изменились."""
+        try:
+            length, columns = adjacency_targets(line, row)
+        except ValueError as e:
+            self.errors[row] = f"Ошибка парсинга: {str(e)}"
+            return False
+        if length != self.graph.vertex_count:
+            self.errors[row] = (
+                "Некорректная матрица! Все строки должны иметь одинаковое количество элементов."
+            )
+            return False
+        self.errors.pop(row, None)
+
+        new = set(columns.tolist())
+        old = set(self.graph.succ[row])
+        for target in sorted(old - new):
+            self.graph.remove_arc(row, target)
+        for target in sorted(new - old):
+            self.graph.add_arc(row, target)
+        return old != new
+
+    def error(self):
+        """Ошибка первой некорректной строки (с ее номером) или None."""
+        if not self.errors:
+            return None
+        row = min(self.errors)
+        return f"Строка {row+1}: {self.errors[row]}"
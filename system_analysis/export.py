@@ -0,0 +1,346 @@
+import csv
+import json
+import os
+
+import numpy as np
+
+from .analysis import subsystem_components
+from .levels import topological_levels
+from .scc import component_members, condensation, internal_arcs
+
+SECTIONS = (
+    "right_incidence",
+    "adjacency",
+    "levels",
+    "swap_vertex",
+    "subsystems",
+    "subsystem_right_incidence",
+)
+FORMATS = ("jsonl", "csv", "npz")
+FILE_FILTERS = "JSON Lines (*.jsonl);;CSV (*.csv);;NumPy (*.npz)"
+CSV_HEADER = ("section", "id", "value", "target")
+CHUNK_RECORDS = 4096
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def export_format(path):
+    """Определяет формат экспорта по расширению файла."""
+    extension = os.path.splitext(path)[1].lstrip(".").lower()
+    if extension not in FORMATS:
+        raise ValueError(
+            f"Неизвестный формат экспорта «{extension}», "
+            f"ожидается одно из: {', '.join(FORMATS)}"
+        )
+    return extension
+
+
+def with_extension(path, file_filter):
+    """Добавляет к пути расширение фильтра, выбранного в диалоге сохранения."""
+    if os.path.splitext(path)[1].lstrip(".").lower() in FORMATS:
+        return path
+    for format in FORMATS:
+        if f"*.{format}" in file_filter:
+            return f"{path}.{format}"
+    return path
+
+
+def _groups(bounds):
+    """Пары границ (начало, конец) групп массива CSR."""
+    bounds = bounds.tolist()
+    return zip(bounds[:-1], bounds[1:])
+
+
+def right_incidence_arrays(graph):
+    """Множества G+ в виде CSR: смещения и концы дуг без повторов."""
+    sources, targets = graph.arcs()
+    keep = np.ones(len(targets), dtype=bool)
+    keep[1:] = (targets[1:] != targets[:-1]) | (sources[1:] != sources[:-1])
+    offsets = np.zeros(graph.vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources[keep], minlength=graph.vertex_count), out=offsets[1:])
+    return offsets, targets[keep]
+
+
+def adjacency_arrays(graph, order=None):
+    """Единицы матрицы смежности по строкам в порядке вершин order.
+
+    Возвращает смещения строк и номера столбцов (позиции в order); без
+    order строки и столбцы идут в порядке номеров вершин.
+    """
+    offsets, targets = right_incidence_arrays(graph)
+    if order is None:
+        return offsets, targets
+    position = np.empty(graph.vertex_count, dtype=np.int64)
+    position[np.asarray(order, dtype=np.int64)] = np.arange(graph.vertex_count)
+    rows = position[np.repeat(np.arange(graph.vertex_count), np.diff(offsets))]
+    columns = position[targets]
+    row_offsets = np.zeros(graph.vertex_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=graph.vertex_count), out=row_offsets[1:])
+    return row_offsets, columns[np.lexsort((columns, rows))]
+
+
+def level_arrays(graph, progress=None):
+    """Иерархические уровни в виде CSR: смещения уровней и вершины (swap_vertex)."""
+    levels = topological_levels(graph, progress=progress)
+    offsets = np.zeros(len(levels) + 1, dtype=np.int64)
+    np.cumsum([len(level) for level in levels], out=offsets[1:])
+    vertices = np.fromiter(
+        (vertex for level in levels for vertex in level),
+        dtype=np.int64,
+        count=graph.vertex_count,
+    )
+    return offsets, vertices
+
+
+def subsystem_arrays(graph, workers=None):
+    """Подсистемы в нумерации decompose в виде массивов CSR (номера с нуля)."""
+    count, component = subsystem_components(graph, workers)
+    members, bounds = component_members(component, count)
+    sources, targets, arc_bounds = internal_arcs(graph, component, count)
+    incoming = condensation(graph, component, count).reverse()
+    return {
+        "subsystem_offsets": bounds,
+        "subsystem_vertices": members,
+        "subsystem_arc_offsets": arc_bounds,
+        "subsystem_arc_sources": sources,
+        "subsystem_arc_targets": targets,
+        "subsystem_right_incidence_offsets": incoming.offsets,
+        "subsystem_right_incidence_sources": incoming.targets,
+    }
+
+
+def has_contour(graph):
+    """Есть ли в графе контур (иерархические уровни не определены)."""
+    try:
+        topological_levels(graph)
+    except ValueError:
+        return True
+    return False
+
+
+def resolve_sections(graph, sections=None):
+    """Проверяет список разделов; без него — все, кроме уровней для графа с контуром."""
+    if sections is None:
+        skipped = {"levels", "swap_vertex"} if has_contour(graph) else set()
+        return [section for section in SECTIONS if section not in skipped]
+    unknown = [section for section in sections if section not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Неизвестные разделы экспорта: {', '.join(unknown)}")
+    return [section for section in SECTIONS if section in sections]
+
+
+def iter_records(graph, sections, order=None, progress=None, workers=None):
+    """Перебирает записи экспорта по одной (номера вершин и подсистем с единицы).
+
+    Записи строятся из массивов CSR по ходу перебора, так что в памяти нет
+    ни всего результата в виде объектов Python, ни текста целиком.
+    progress вызывается в начале каждого раздела и через каждые
+    CHUNK_RECORDS записей.
+    """
+    progress = progress or (lambda percent, stage: None)
+    arrays = {}
+    for index, section in enumerate(sections):
+        percent = index * 100 // len(sections)
+        stage = f"Экспорт: {section}"
+        progress(percent, stage)
+        records = _section_records(graph, section, order, arrays, workers)
+        for count, record in enumerate(records, 1):
+            yield record
+            if count % CHUNK_RECORDS == 0:
+                progress(percent, stage)
+    progress(100, "Экспорт завершен")
+
+
+def _section_records(graph, section, order, arrays, workers):
+    if section == "right_incidence":
+        offsets, targets = right_incidence_arrays(graph)
+        targets = (targets + 1).tolist()
+        for vertex, (start, end) in enumerate(_groups(offsets), 1):
+            yield {"section": section, "vertex": vertex, "targets": targets[start:end]}
+    elif section == "adjacency":
+        offsets, columns = adjacency_arrays(graph, order)
+        columns = (columns + 1).tolist()
+        rows = (
+            range(graph.vertex_count)
+            if order is None
+            else np.asarray(order, dtype=np.int64).tolist()
+        )
+        for row, ((start, end), vertex) in enumerate(zip(_groups(offsets), rows), 1):
+            yield {
+                "section": section,
+                "row": row,
+                "vertex": vertex + 1,
+                "columns": columns[start:end],
+            }
+    elif section in ("levels", "swap_vertex"):
+        # Уровни и swap_vertex — две записи одного расчета.
+        if "levels" not in arrays:
+            arrays["levels"] = level_arrays(graph)
+        offsets, vertices = arrays["levels"]
+        vertices = (vertices + 1).tolist()
+        if section == "levels":
+            for level, (start, end) in enumerate(_groups(offsets)):
+                yield {
+                    "section": section,
+                    "level": level,
+                    "vertices": vertices[start:end],
+                }
+        else:
+            for position, vertex in enumerate(vertices, 1):
+                yield {"section": section, "position": position, "vertex": vertex}
+    else:
+        if "subsystems" not in arrays:
+            arrays["subsystems"] = subsystem_arrays(graph, workers)
+        yield from _subsystem_records(section, arrays["subsystems"])
+
+
+def _subsystem_records(section, arrays):
+    if section == "subsystems":
+        vertices = (arrays["subsystem_vertices"] + 1).tolist()
+        sources = (arrays["subsystem_arc_sources"] + 1).tolist()
+        targets = (arrays["subsystem_arc_targets"] + 1).tolist()
+        for subsystem, ((start, end), (arc_start, arc_end)) in enumerate(
+            zip(
+                _groups(arrays["subsystem_offsets"]),
+                _groups(arrays["subsystem_arc_offsets"]),
+            ),
+            1,
+        ):
+            yield {
+                "section": section,
+                "subsystem": subsystem,
+                "vertices": vertices[start:end],
+                "arcs": [
+                    [source, target]
+                    for source, target in zip(
+                        sources[arc_start:arc_end], targets[arc_start:arc_end]
+                    )
+                ],
+            }
+    else:
+        sources = (arrays["subsystem_right_incidence_sources"] + 1).tolist()
+        for subsystem, (start, end) in enumerate(
+            _groups(arrays["subsystem_right_incidence_offsets"]), 1
+        ):
+            yield {
+                "section": section,
+                "subsystem": subsystem,
+                "sources": sources[start:end],
+            }
+
+
+def csv_rows(record):
+    """Строки CSV для записи: одна строка на элемент множества или дугу.
+
+    Пустое множество дает одну строку с пустым значением, чтобы номер
+    вершины (уровня, подсистемы) все равно попал в файл.
+    """
+    section = record["section"]
+    if section == "swap_vertex":
+        return [(section, record["position"], record["vertex"], "")]
+    if section == "subsystems":
+        subsystem = record["subsystem"]
+        rows = [
+            ("subsystem_vertex", subsystem, vertex, "") for vertex in record["vertices"]
+        ]
+        rows += [
+            ("subsystem_arc", subsystem, source, target)
+            for source, target in record["arcs"]
+        ]
+        return rows
+    key, values = {
+        "right_incidence": ("vertex", "targets"),
+        "adjacency": ("row", "columns"),
+        "levels": ("level", "vertices"),
+        "subsystem_right_incidence": ("subsystem", "sources"),
+    }[section]
+    values = record[values] or [""]
+    return [(section, record[key], value, "") for value in values]
+
+
+def write_jsonl(records, file):
+    """Пишет записи в JSON Lines порциями по CHUNK_RECORDS строк."""
+    chunk = []
+    for record in records:
+        chunk.append(_encode(record))
+        if len(chunk) == CHUNK_RECORDS:
+            file.write("\n".join(chunk) + "\n")
+            chunk.clear()
+    if chunk:
+        file.write("\n".join(chunk) + "\n")
+
+
+def write_csv(records, file):
+    """Пишет записи в CSV (столбцы CSV_HEADER) порциями по CHUNK_RECORDS записей."""
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    chunk = []
+    for index, record in enumerate(records, 1):
+        chunk += csv_rows(record)
+        if index % CHUNK_RECORDS == 0:
+            writer.writerows(chunk)
+            chunk.clear()
+    writer.writerows(chunk)
+
+
+def export_arrays(graph, sections, order=None, progress=None, workers=None):
+    """Массивы разделов для .npz (номера вершин и подсистем с нуля)."""
+    progress = progress or (lambda percent, stage: None)
+    arrays = {"vertex_count": np.int64(graph.vertex_count)}
+    for index, section in enumerate(sections):
+        progress(index * 100 // len(sections), f"Экспорт: {section}")
+        if section == "right_incidence":
+            offsets, targets = right_incidence_arrays(graph)
+            arrays["right_incidence_offsets"] = offsets
+            arrays["right_incidence_targets"] = targets
+        elif section == "adjacency":
+            offsets, columns = adjacency_arrays(graph, order)
+            arrays["adjacency_offsets"] = offsets
+            arrays["adjacency_columns"] = columns
+            if order is not None:
+                arrays["adjacency_order"] = np.asarray(order, dtype=np.int64)
+        elif section in ("levels", "swap_vertex"):
+            if "swap_vertex" not in arrays:
+                offsets, vertices = level_arrays(graph)
+                arrays["level_offsets"] = offsets
+                arrays["swap_vertex"] = vertices
+        elif "subsystem_offsets" not in arrays:
+            arrays.update(subsystem_arrays(graph, workers))
+    progress(100, "Экспорт завершен")
+    return arrays
+
+
+def export_graph(
+    graph, path, sections=None, format=None, order=None, progress=None, workers=None
+):
+    """Экспортирует результаты анализа графа в JSON Lines, CSV или .npz.
+
+    sections — разделы из SECTIONS (по умолчанию все; для графа с контуром
+    без уровней). order — порядок строк и столбцов матрицы смежности,
+    например swap_vertex. workers — как в decompose: подсистемы ищутся в
+    пуле процессов и нумеруются по наименьшей вершине. Текстовые форматы
+    пишутся по записи, .npz — по массиву, поэтому весь результат никогда
+    не собирается в одну строку.
+    """
+    format = format or export_format(path)
+    if format not in FORMATS:
+        raise ValueError(f"Неизвестный формат экспорта: {format}")
+    sections = resolve_sections(graph, sections)
+    # Запись идет во временный файл рядом с path: при ошибке или отмене
+    # прежний файл не портится.
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        if format == "npz":
+            arrays = export_arrays(graph, sections, order, progress, workers)
+            with open(temporary, "wb") as file:
+                np.savez(file, **arrays)
+        else:
+            writer = write_jsonl if format == "jsonl" else write_csv
+            newline = "" if format == "csv" else None
+            with open(temporary, "w", encoding="utf-8", newline=newline) as file:
+                writer(iter_records(graph, sections, order, progress, workers), file)
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return path
@@ -0,0 +1,90 @@
+import numpy as np
+
+from .graph import SparseGraph
+
+
+def _unique_arcs(vertex_count, sources, targets, arc_count):
+    """Убирает петли и кратные дуги и оставляет не больше arc_count дуг."""
+    keep = sources != targets
+    keys, first = np.unique(
+        sources[keep] * vertex_count + targets[keep], return_index=True
+    )
+    keys = keys[np.argsort(first)][:arc_count]
+    return SparseGraph.from_arcs(
+        vertex_count, keys // vertex_count, keys % vertex_count
+    )
+
+
+def random_dag(vertex_count, arc_count, seed=None):
+    """Случайный ациклический граф: дуги идут вперед по случайной перестановке."""
+    rng = np.random.default_rng(seed)
+    rank = rng.permutation(vertex_count)
+    first = rng.integers(0, vertex_count, 2 * arc_count)
+    second = rng.integers(0, vertex_count, 2 * arc_count)
+    low = np.minimum(first, second)
+    high = np.maximum(first, second)
+    return _unique_arcs(vertex_count, rank[low], rank[high], arc_count)
+
+
+def layered_dag(vertex_count, layer_count, arc_count, seed=None):
+    """Ярусный ациклический граф: дуги только между соседними ярусами.
+
+    Вершины случайно распределены по layer_count непустым ярусам, поэтому
+    иерархических уровней получается не больше layer_count.
+    """
+    rng = np.random.default_rng(seed)
+    layer_count = max(1, min(layer_count, vertex_count))
+    cuts = np.sort(rng.choice(np.arange(1, vertex_count), layer_count - 1, False))
+    bounds = np.concatenate(([0], cuts, [vertex_count]))
+    vertex_of = rng.permutation(vertex_count)
+
+    positions = rng.integers(0, vertex_count, 2 * arc_count)
+    layer = np.searchsorted(bounds, positions, side="right") - 1
+    positions = positions[layer < layer_count - 1]
+    layer = layer[layer < layer_count - 1]
+    start, end = bounds[layer + 1], bounds[layer + 2]
+    targets = start + (rng.random(len(start)) * (end - start)).astype(np.int64)
+    return _unique_arcs(
+        vertex_count, vertex_of[positions], vertex_of[targets], arc_count
+    )
+
+
+def planted_scc_graph(vertex_count, component_count, arc_count, seed=None):
+    """Граф с заранее заданными компонентами сильной связности.
+
+    Вершины каждой компоненты замкнуты в цикл, остальные дуги идут внутри
+    компонент или от компоненты с меньшим номером к большему (дуг не меньше,
+    чем нужно для циклов). Возвращает граф и номер компоненты каждой вершины.
+    """
+    rng = np.random.default_rng(seed)
+    component_count = max(1, min(component_count, vertex_count))
+    component = rng.integers(0, component_count, vertex_count)
+    component[rng.permutation(vertex_count)[:component_count]] = np.arange(
+        component_count
+    )
+
+    order = np.lexsort((rng.random(vertex_count), component))
+    ring_next = np.roll(order, -1)
+    starts = np.flatnonzero(np.diff(component[order], prepend=-1))
+    ends = np.append(starts[1:], vertex_count) - 1
+    ring_next[ends] = order[starts]
+    cycle = component[order] == component[ring_next]
+    cycle &= order != ring_next
+
+    first = rng.integers(0, vertex_count, 2 * arc_count)
+    second = rng.integers(0, vertex_count, 2 * arc_count)
+    forward = component[first] <= component[second]
+    sources = np.concatenate((order[cycle], np.where(forward, first, second)))
+    targets = np.concatenate((ring_next[cycle], np.where(forward, second, first)))
+    arc_count = max(arc_count, int(cycle.sum()))
+    return _unique_arcs(vertex_count, sources, targets, arc_count), component
+
+
+def incidence_matrix(graph):
+    """Строит плотную матрицу инциденций int8 (вершины x дуги)."""
+    sources, targets = graph.arcs()
+    matrix = np.zeros((graph.vertex_count, graph.arc_count), dtype=np.int8)
+    columns = np.arange(graph.arc_count)
+    matrix[sources, columns] = 1
+    matrix[targets, columns] = -1
+    return matrix
@@ -0,0 +1,92 @@
+import hashlib
+
+import numpy as np
+
+from .incidence import incidence_arcs
+
+
+class SparseGraph:
+    """Ориентированный граф в формате CSR: смещения строк и концы дуг.
+
+    Концы дуг внутри каждой строки упорядочены по возрастанию.
+    """
+
+    def __init__(self, vertex_count, offsets, targets):
+        self.vertex_count = vertex_count
+        self.offsets = offsets
+        self.targets = targets
+
+    @classmethod
+    def from_arcs(cls, vertex_count, sources, targets):
+        """Строит граф по массивам начал и концов дуг (формат COO)."""
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        order = np.lexsort((targets, sources))
+        offsets = np.zeros(vertex_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=vertex_count), out=offsets[1:])
+        return cls(vertex_count, offsets, targets[order].astype(np.int32))
+
+    @classmethod
+    def from_incidence(cls, matrix, unique=True):
+        """Строит граф по матрице инциденций (вершины x дуги)."""
+        matrix = np.asarray(matrix)
+        sources, targets = incidence_arcs(matrix, unique=unique)
+        return cls.from_arcs(len(matrix), sources, targets)
+
+    @classmethod
+    def from_adjacency(cls, matrix):
+        """Строит граф по матрице смежности, учитывая единицы вне диагонали."""
+        matrix = np.asarray(matrix)
+        sources, targets = np.nonzero(matrix == 1)
+        loops = sources == targets
+        return cls.from_arcs(len(matrix), sources[~loops], targets[~loops])
+
+    @property
+    def arc_count(self):
+        return len(self.targets)
+
+    def content_hash(self):
+        """Хеш содержимого графа: число вершин и массивы CSR (blake2b)."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(np.int64(self.vertex_count).tobytes())
+        digest.update(np.ascontiguousarray(self.offsets, dtype="<i8"))
+        digest.update(np.ascontiguousarray(self.targets, dtype="<i4"))
+        return digest.hexdigest()
+
+    def successors(self, vertex):
+        """Возвращает концы дуг, выходящих из вершины."""
+        return self.targets[self.offsets[vertex] : self.offsets[vertex + 1]]
+
+    def has_arc(self, source, target):
+        """Проверяет наличие дуги двоичным поиском по строке CSR."""
+        successors = self.successors(source)
+        position = np.searchsorted(successors, target)
+        return bool(position < len(successors) and successors[position] == target)
+
+    def out_degree(self):
+        return np.diff(self.offsets)
+
+    def in_degree(self):
+        return np.bincount(self.targets, minlength=self.vertex_count)
+
+    def sources(self):
+        """Возвращает начала дуг в порядке массива targets."""
+        return np.repeat(
+            np.arange(self.vertex_count, dtype=np.int32), self.out_degree()
+        )
+
+    def arcs(self):
+        """Возвращает дуги в виде пары массивов (начала, концы)."""
+        return self.sources(), self.targets
+
+    def reverse(self):
+        """Возвращает граф с обращенными дугами."""
+        sources, targets = self.arcs()
+        return SparseGraph.from_arcs(self.vertex_count, targets, sources)
+
+    def to_dense(self, dtype=int):
+        """Строит плотную матрицу смежности (только для отображения)."""
+        matrix = np.zeros((self.vertex_count, self.vertex_count), dtype=dtype)
+        sources, targets = self.arcs()
+        matrix[sources, targets] = 1
+        return matrix
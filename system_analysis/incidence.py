@@ -0,0 +1,135 @@
+import numpy as np
+
+
+def incidence_arcs(matrix, unique=True):
+    """Находит начало (1) и конец (-1) каждой дуги матрицы инциденций."""
+    matrix = np.asarray(matrix)
+    m = len(matrix)
+    n = matrix.shape[1] if m > 0 else 0
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    is_start = matrix == 1
+    is_end = matrix == -1
+    invalid = ~(is_start | is_end | (matrix == 0))
+    bad_columns = (
+        invalid.any(axis=0) | (is_start.sum(axis=0) != 1) | (is_end.sum(axis=0) != 1)
+    )
+    starts = is_start.argmax(axis=0)
+    ends = is_end.argmax(axis=0)
+
+    def column_error(edge_idx):
+        column = matrix[:, edge_idx]
+        column_starts = np.flatnonzero(column == 1)
+        column_ends = np.flatnonzero(column == -1)
+        column_invalid = np.flatnonzero(invalid[:, edge_idx])
+        return _column_error(
+            edge_idx,
+            column_starts[:2],
+            column_ends[:2],
+            column_invalid[0] if len(column_invalid) else None,
+            column[column_invalid[0]] if len(column_invalid) else None,
+        )
+
+    return _checked_arcs(m, starts, ends, bad_columns, unique, column_error)
+
+
+class ColumnScanner:
+    """Собирает начала и концы дуг при построчном чтении матрицы инциденций."""
+
+    def __init__(self, edge_count):
+        self.vertex_count = 0
+        self.starts = np.full(edge_count, -1, dtype=np.int64)
+        self.ends = np.full(edge_count, -1, dtype=np.int64)
+        self.second_starts = np.full(edge_count, -1, dtype=np.int64)
+        self.second_ends = np.full(edge_count, -1, dtype=np.int64)
+        self.first_invalid = np.full(edge_count, -1, dtype=np.int64)
+        self.invalid_values = np.zeros(edge_count, dtype=np.int64)
+
+    def add_row(self, row):
+        """Учитывает очередную строку (вершину) матрицы."""
+        vertex = self.vertex_count
+        self._mark(np.flatnonzero(row == 1), self.starts, self.second_starts, vertex)
+        self._mark(np.flatnonzero(row == -1), self.ends, self.second_ends, vertex)
+        invalid = np.flatnonzero((row != 0) & (row != 1) & (row != -1))
+        invalid = invalid[self.first_invalid[invalid] < 0]
+        self.first_invalid[invalid] = vertex
+        self.invalid_values[invalid] = row[invalid]
+        self.vertex_count += 1
+
+    @staticmethod
+    def _mark(columns, first, second, vertex):
+        seen = first[columns] >= 0
+        first[columns[~seen]] = vertex
+        repeated = columns[seen]
+        second[repeated[second[repeated] < 0]] = vertex
+
+    def arcs(self, unique=True):
+        """Проверяет столбцы и возвращает массивы начал и концов дуг."""
+        bad_columns = (
+            (self.starts < 0)
+            | (self.ends < 0)
+            | (self.second_starts >= 0)
+            | (self.second_ends >= 0)
+            | (self.first_invalid >= 0)
+        )
+
+        def column_error(edge_idx):
+            def found(first, second):
+                return [v for v in (first[edge_idx], second[edge_idx]) if v >= 0]
+
+            invalid = self.first_invalid[edge_idx]
+            return _column_error(
+                edge_idx,
+                found(self.starts, self.second_starts),
+                found(self.ends, self.second_ends),
+                invalid if invalid >= 0 else None,
+                self.invalid_values[edge_idx],
+            )
+
+        return _checked_arcs(
+            self.vertex_count,
+            self.starts,
+            self.ends,
+            bad_columns,
+            unique,
+            column_error,
+        )
+
+
+def _checked_arcs(m, starts, ends, bad_columns, unique, column_error):
+    duplicate_columns = np.zeros(len(starts), dtype=bool)
+    if unique and len(starts) > 0:
+        _, first_index = np.unique(starts * m + ends, return_index=True)
+        duplicate_columns[:] = True
+        duplicate_columns[first_index] = False
+
+    errors = bad_columns | duplicate_columns
+    if errors.any():
+        edge_idx = int(errors.argmax())
+        if bad_columns[edge_idx]:
+            raise ValueError(column_error(edge_idx))
+        raise ValueError(
+            f"Ребро между вершинами {starts[edge_idx]+1} и {ends[edge_idx]+1} уже существует"
+        )
+    return starts, ends
+
+
+def _column_error(edge_idx, starts, ends, invalid_vertex, invalid_value):
+    errors = []
+    if len(starts) > 1:
+        errors.append((starts[1], f"В ребре {edge_idx+1} несколько начальных вершин"))
+    if len(ends) > 1:
+        errors.append((ends[1], f"В ребре {edge_idx+1} несколько конечных вершин"))
+    if invalid_vertex is not None:
+        errors.append(
+            (
+                invalid_vertex,
+                f"Недопустимое значение {invalid_value} в ребре {edge_idx+1}, вершина {invalid_vertex+1}",
+            )
+        )
+    if errors:
+        return min(errors)[1]
+    if len(starts) == 0:
+        return f"В ребре {edge_idx+1} нет начальной вершины (1)"
+    return f"В ребре {edge_idx+1} нет конечной вершины (-1)"
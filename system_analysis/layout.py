@@ -0,0 +1,305 @@
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .graph import SparseGraph
+from .levels import topological_levels
+from .scc import condensation, strong_components
+
+SPRING_LIMIT = 500
+FORCE_LIMIT = 200_000
+REPULSION = 8.0
+LAYOUT_DIR = os.path.join(
+    os.path.expanduser("~"), ".cache", "system_analysis", "layouts"
+)
+
+
+def spring_layout(graph, seed=42):
+    """Пружинная раскладка NetworkX (как в лабораторных) по вершинам с дугами.
+
+    Вершины без дуг выстраиваются в ряд под рисунком.
+    """
+    import networkx as nx
+
+    from .drawing import arc_graph
+
+    positions = np.zeros((graph.vertex_count, 2))
+    G = arc_graph(graph)
+    if len(G):
+        pos = nx.spring_layout(G, seed=seed, scale=1.0, center=(0, 0))
+        nodes = np.fromiter(pos.keys(), dtype=np.int64, count=len(pos))
+        positions[nodes - 1] = np.array(list(pos.values()))
+    isolated = np.flatnonzero((graph.out_degree() == 0) & (graph.in_degree() == 0))
+    if len(isolated) < graph.vertex_count:
+        positions[isolated, 0] = np.linspace(-1, 1, len(isolated) + 2)[1:-1]
+        positions[isolated, 1] = -1.2
+    else:
+        positions[:] = grid_layout(graph)
+    return positions
+
+
+def vertex_levels(graph):
+    """Номер яруса каждой вершины: уровень ее компоненты в графе конденсации."""
+    count, component = strong_components(graph)
+    component_level = np.zeros(count, dtype=np.int64)
+    for level, components in enumerate(
+        topological_levels(condensation(graph, component, count))
+    ):
+        component_level[components] = level
+    return component_level[component]
+
+
+def layered_layout(graph, sweeps=4):
+    """Ярусная раскладка (в духе Сугиямы) по иерархическим уровням.
+
+    Вершины одного уровня стоят в ряд; порядок в ряду уточняется методом
+    барицентров попеременно сверху вниз и снизу вверх. Для графа с
+    контурами уровни берутся из графа конденсации.
+    """
+    n = graph.vertex_count
+    level = vertex_levels(graph)
+    layer_size = np.bincount(level)
+    layer_start = np.concatenate(([0], np.cumsum(layer_size)[:-1]))
+
+    def ranks(key):
+        order = np.lexsort((key, level))
+        rank = np.empty(n)
+        rank[order] = np.arange(n) - layer_start[level[order]]
+        return rank
+
+    rank = ranks(np.arange(n))
+    sources, targets = graph.arcs()
+    forward = level[sources] < level[targets]
+    upper, lower = sources[forward], targets[forward]
+    for _ in range(sweeps):
+        for near, far in ((lower, upper), (upper, lower)):
+            total = np.bincount(near, weights=rank[far], minlength=n)
+            count = np.bincount(near, minlength=n)
+            barycenter = np.where(count > 0, total / np.maximum(count, 1), rank)
+            rank = ranks(barycenter)
+
+    positions = np.empty((n, 2))
+    width = max(int(layer_size.max()) - 1, 1)
+    height = max(len(layer_size) - 1, 1)
+    positions[:, 0] = (2 * rank - (layer_size[level] - 1)) / width
+    positions[:, 1] = 1 - 2 * level / height
+    return positions
+
+
+def force_layout(graph, iterations=60, seed=0, repulsion=REPULSION):
+    """Силовая раскладка для больших графов за O(V + E) на итерацию.
+
+    Начальное положение — приближенная спектральная раскладка (степенной
+    метод по ленивому случайному блужданию). Затем дуги притягивают концы
+    друг к другу, а отталкивание считается не по парам вершин, а по
+    градиенту плотности вершин на сетке (метод «частица—сетка»), что
+    заменяет квадратичный перебор пар.
+    """
+    n = graph.vertex_count
+    if n < 2:
+        return np.zeros((n, 2))
+    sources, targets = graph.arcs()
+    positions = _spectral_start(n, sources, targets, np.random.default_rng(seed))
+    grid = int(np.clip(np.sqrt(n), 4, 256))
+    distance = 2 / np.sqrt(n)
+    step = 0.05
+
+    for _ in range(iterations):
+        delta = positions[targets] - positions[sources]
+        length = np.sqrt((delta**2).sum(axis=1, keepdims=True)) + 1e-12
+        pull = delta * length / distance
+        force = np.empty((n, 2))
+        for axis in range(2):
+            force[:, axis] = np.bincount(
+                sources, weights=pull[:, axis], minlength=n
+            ) - np.bincount(targets, weights=pull[:, axis], minlength=n)
+
+        low, high = np.percentile(positions, [0.5, 99.5], axis=0)
+        span = np.maximum(high - low, 1e-9)
+        cells = np.clip((positions - low) / span * grid, 0, grid - 1).astype(np.int64)
+        density = np.bincount(cells[:, 0] * grid + cells[:, 1], minlength=grid * grid)
+        density = _blur(density.reshape(grid, grid).astype(float))
+        gradient_x, gradient_y = np.gradient(density, *(span / grid))
+        push = repulsion * distance**2 * n / grid**2
+        force[:, 0] -= push * gradient_x[cells[:, 0], cells[:, 1]]
+        force[:, 1] -= push * gradient_y[cells[:, 0], cells[:, 1]]
+
+        magnitude = np.sqrt((force**2).sum(axis=1, keepdims=True)) + 1e-12
+        positions += force / magnitude * np.minimum(magnitude, step)
+        step *= 0.95
+    return _normalize(positions)
+
+
+def _spectral_start(n, sources, targets, rng, iterations=100):
+    degree = np.bincount(sources, minlength=n) + np.bincount(targets, minlength=n)
+    scale = 1 / np.maximum(degree, 1)
+    positions = rng.standard_normal((n, 2))
+    positions[degree == 0] = 0
+    for _ in range(iterations):
+        walk = np.empty((n, 2))
+        for axis in range(2):
+            walk[:, axis] = np.bincount(
+                sources, weights=positions[targets, axis], minlength=n
+            ) + np.bincount(targets, weights=positions[sources, axis], minlength=n)
+        positions = np.where(
+            degree[:, None] > 0, (positions + walk * scale[:, None]) / 2, positions
+        )
+        positions -= (degree @ positions) / max(degree.sum(), 1)
+        positions, _ = np.linalg.qr(positions)
+    return _normalize(positions)
+
+
+def _normalize(positions):
+    """Центрирует координаты и сжимает их в квадрат [-1, 1], не давая
+    единичным далеким вершинам сжать остальной рисунок."""
+    positions = positions - np.median(positions, axis=0)
+    extent = np.percentile(np.abs(positions), 99, axis=0)
+    return np.clip(positions / np.maximum(extent, 1e-12), -1, 1)
+
+
+def _blur(density):
+    padded = np.pad(density, 1, mode="edge")
+    density = (padded[:-2] + padded[1:-1] + padded[2:]) / 3
+    return (density[:, :-2] + density[:, 1:-1] + density[:, 2:]) / 3
+
+
+def grid_layout(graph):
+    """Раскладка по сетке в порядке номеров вершин: мгновенная для любых размеров."""
+    n = graph.vertex_count
+    side = max(int(np.ceil(np.sqrt(n))), 1)
+    index = np.arange(n)
+    positions = np.empty((n, 2))
+    positions[:, 0] = index % side
+    positions[:, 1] = -(index // side)
+    positions -= positions.mean(axis=0) if n else 0
+    return positions / max(np.abs(positions).max() if n else 0, 1)
+
+
+ENGINES = {
+    "spring": spring_layout,
+    "layered": layered_layout,
+    "force": force_layout,
+    "grid": grid_layout,
+}
+ENGINE_TITLES = {
+    "auto": "Авто",
+    "spring": "Пружинная",
+    "layered": "Ярусная",
+    "force": "Силовая",
+    "grid": "Сетка",
+}
+
+
+def choose_engine(graph):
+    """Подбирает раскладку по размеру графа: пружинная для малых, ярусная для
+    ациклических, силовая для остальных и сетка для очень больших."""
+    if graph.vertex_count <= SPRING_LIMIT:
+        return "spring"
+    count, _ = strong_components(graph)
+    if count == graph.vertex_count:
+        return "layered"
+    return "force" if graph.vertex_count <= FORCE_LIMIT else "grid"
+
+
+def resolve_engine(graph, engine="auto"):
+    """Проверяет имя раскладки и заменяет auto на подходящую графу."""
+    if engine == "auto":
+        return choose_engine(graph)
+    if engine not in ENGINES:
+        raise ValueError(f"Неизвестная раскладка: {engine}")
+    return engine
+
+
+def compute_layout(graph, engine="auto"):
+    """Вычисляет координаты вершин (массив n x 2) выбранной раскладкой."""
+    return ENGINES[resolve_engine(graph, engine)](graph)
+
+
+def save_layout(path, graph, engine, positions):
+    """Сохраняет координаты вершин вместе с хешем графа в файл .npz."""
+    np.savez(
+        path,
+        positions=positions,
+        engine=np.array(engine),
+        graph_hash=np.array(graph.content_hash()),
+    )
+
+
+def load_layout(path, graph, engine=None):
+    """Загружает сохраненные координаты; None, если они от другого графа или раскладки."""
+    with np.load(path) as data:
+        if str(data["graph_hash"]) != graph.content_hash():
+            return None
+        if engine is not None and str(data["engine"]) != engine:
+            return None
+        return data["positions"]
+
+
+class LayoutCache:
+    """Кэш раскладок по хешу графа: в памяти и, если задан каталог, на диске.
+
+    Повторная отрисовка того же графа берет готовые координаты и не
+    пересчитывает раскладку даже после перезапуска программы.
+    """
+
+    def __init__(self, directory=None, max_entries=32):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.positions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def path(self, graph, engine="auto"):
+        """Файл раскладки графа в каталоге кэша (None, если каталог не задан)."""
+        if self.directory is None:
+            return None
+        engine = resolve_engine(graph, engine)
+        return os.path.join(self.directory, f"{graph.content_hash()}-{engine}.npz")
+
+    def get(self, graph, engine="auto"):
+        """Возвращает координаты вершин графа для раскладки engine."""
+        engine = resolve_engine(graph, engine)
+        key = (graph.content_hash(), engine)
+        with self.lock:
+            if key in self.positions:
+                self.positions.move_to_end(key)
+                return self.positions[key]
+
+        path = self.path(graph, engine)
+        positions = None
+        if path is not None and os.path.exists(path):
+            try:
+                positions = load_layout(path, graph, engine)
+            except (OSError, ValueError, KeyError):
+                positions = None
+        if positions is None:
+            positions = compute_layout(graph, engine)
+            try:
+                self.store(graph, engine, positions)
+            except OSError:
+                pass
+
+        with self.lock:
+            self.positions[key] = positions
+            while len(self.positions) > self.max_entries:
+                self.positions.popitem(last=False)
+        return positions
+
+    def store(self, graph, engine, positions):
+        """Сохраняет координаты в каталог кэша; возвращает путь к файлу или None.
+
+        Так раскладку можно рассчитать заранее (команда layout), и окна
+        возьмут ее при первой же отрисовке этого графа.
+        """
+        path = self.path(graph, engine)
+        if path is not None:
+            os.makedirs(self.directory, exist_ok=True)
+            save_layout(path, graph, resolve_engine(graph, engine), positions)
+        return path
+
+
+def subsystem_graph(decomposition):
+    """Граф подсистем (конденсация) в виде SparseGraph с нумерацией с нуля."""
+    arcs = np.array(decomposition.subsystem_arcs, dtype=np.int64).reshape(-1, 2) - 1
+    return SparseGraph.from_arcs(len(decomposition.subsystems), arcs[:, 0], arcs[:, 1])
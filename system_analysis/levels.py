@@ -0,0 +1,38 @@
+def topological_levels(graph, progress=None):
+    """Разбивает вершины на иерархические уровни послойной сортировкой Кана.
+
+    progress(percent, stage), если задан, вызывается при изменении процента
+    размещенных вершин.
+    """
+    offsets = graph.offsets.tolist()
+    targets = graph.targets.tolist()
+    in_degree = graph.in_degree().tolist()
+
+    levels = []
+    placed = 0
+    reported = -1
+    frontier = [vertex for vertex, degree in enumerate(in_degree) if degree == 0]
+    while frontier:
+        levels.append(frontier)
+        placed += len(frontier)
+        if progress is not None:
+            percent = placed * 100 // max(graph.vertex_count, 1)
+            if percent != reported:
+                progress(percent, "Построение уровней")
+                reported = percent
+        next_frontier = []
+        for vertex in frontier:
+            for target in targets[offsets[vertex] : offsets[vertex + 1]]:
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    next_frontier.append(target)
+        next_frontier.sort()
+        frontier = next_frontier
+
+    if placed < graph.vertex_count:
+        cyclic = [vertex + 1 for vertex, degree in enumerate(in_degree) if degree > 0]
+        raise ValueError(
+            "Граф содержит контур, уровни не определены.\n"
+            f"Вершины, не попавшие ни на один уровень: {', '.join(map(str, cyclic))}"
+        )
+    return levels
@@ -0,0 +1,165 @@
+import io
+from array import array
+
+import numpy as np
+
+from .graph import SparseGraph
+from .incidence import ColumnScanner
+
+INCIDENCE_ALPHABET = {"0", "1", "-1"}
+
+
+def _data_lines(lines):
+    for line in lines:
+        if line.strip():
+            yield line
+
+
+def _read_incidence_header(lines):
+    header = next(lines, None)
+    if header is None:
+        raise ValueError("Файл пустой")
+    header = header.split()
+    if len(header) != 2:
+        raise ValueError("Первая строка должна содержать два числа: вершины и ребра")
+    m, n = map(int, header)
+    if m < 1 or n < 1:
+        raise ValueError("Число вершин и ребер должно быть положительным")
+    return m, n
+
+
+def iter_incidence_rows(lines):
+    """Построчно читает матрицу инциденций, проверяя алфавит 0/1/-1.
+
+    Первым значением выдает заголовок (m, n), затем m строк типа int8.
+    """
+    lines = _data_lines(lines)
+    m, n = _read_incidence_header(lines)
+    yield m, n
+
+    count = 0
+    for line in lines:
+        count += 1
+        if count > m:
+            continue
+        row = line.split()
+        if len(row) != n:
+            raise ValueError(f"Строка {count} должна содержать {n} значений")
+        if not INCIDENCE_ALPHABET.issuperset(row):
+            j, val = next(
+                (j, val) for j, val in enumerate(row) if val not in INCIDENCE_ALPHABET
+            )
+            raise ValueError(
+                f"Недопустимое значение '{val}' в строке {count}, столбце {j+1}"
+            )
+        yield np.fromstring(line, dtype=np.int8, sep=" ")
+    if count != m:
+        raise ValueError(f"Ожидалось {m} строк матрицы, найдено {count}")
+
+
+def read_incidence(lines):
+    """Читает матрицу инциденций в заранее выделенный массив int8."""
+    rows = iter_incidence_rows(lines)
+    m, n = next(rows)
+    matrix = np.empty((m, n), dtype=np.int8)
+    for i, row in enumerate(rows):
+        matrix[i] = row
+    return matrix
+
+
+def read_incidence_graph(lines, unique=True):
+    """Читает матрицу инциденций сразу в граф, не храня саму матрицу."""
+    rows = iter_incidence_rows(lines)
+    _, n = next(rows)
+    scanner = ColumnScanner(n)
+    for row in rows:
+        scanner.add_row(row)
+    sources, targets = scanner.arcs(unique=unique)
+    return SparseGraph.from_arcs(scanner.vertex_count, sources, targets)
+
+
+def parse_incidence(text):
+    """Разбирает матрицу инциденций с заголовком «вершины дуги»."""
+    return read_incidence(io.StringIO(text))
+
+
+def load_incidence(path):
+    """Загружает матрицу инциденций из файла."""
+    with open(path, "r", encoding="utf-8") as file:
+        return read_incidence(file)
+
+
+def load_incidence_graph(path, unique=True):
+    """Загружает граф из файла с матрицей инциденций."""
+    with open(path, "r", encoding="utf-8") as file:
+        return read_incidence_graph(file, unique=unique)
+
+
+def adjacency_targets(line, vertex):
+    """Разбирает строку матрицы смежности вершины vertex.
+
+    Возвращает длину строки и номера столбцов с единицами без диагонали.
+    """
+    row = np.array(line.split(), dtype=np.int64)
+    columns = np.flatnonzero(row == 1)
+    return len(row), columns[columns != vertex]
+
+
+def read_adjacency(lines):
+    """Построчно читает матрицу смежности в список дуг."""
+    out_degree = array("q")
+    targets = array("q")
+    n = None
+    for line in _data_lines(lines):
+        length, columns = adjacency_targets(line, len(out_degree))
+        if n is None:
+            n = length
+        elif length != n:
+            raise ValueError(
+                "Некорректная матрица! Все строки должны иметь одинаковое количество элементов."
+            )
+        out_degree.append(len(columns))
+        targets.frombytes(columns.astype(np.int64).tobytes())
+
+    if n is None:
+        raise ValueError(
+            "Некорректная матрица! Все строки должны иметь одинаковое количество элементов."
+        )
+    if n != len(out_degree):
+        raise ValueError("Некорректная матрица! Матрица должна быть квадратной.")
+    sources = np.repeat(np.arange(n), np.frombuffer(out_degree, dtype=np.int64))
+    return SparseGraph.from_arcs(n, sources, np.frombuffer(targets, dtype=np.int64))
+
+
+def parse_adjacency(text):
+    """Разбирает текстовую матрицу смежности сразу в разреженный граф."""
+    return read_adjacency(io.StringIO(text))
+
+
+def load_adjacency(path):
+    """Загружает матрицу смежности из файла."""
+    with open(path, "r", encoding="utf-8") as file:
+        return read_adjacency(file)
+
+
+def write_incidence(graph, file):
+    """Записывает граф матрицей инциденций с заголовком «вершины дуги»."""
+    file.write(f"{graph.vertex_count} {graph.arc_count}\n")
+    in_order = np.argsort(graph.targets, kind="stable")
+    in_offsets = np.zeros(graph.vertex_count + 1, dtype=np.int64)
+    np.cumsum(graph.in_degree(), out=in_offsets[1:])
+    row = np.zeros(graph.arc_count, dtype=np.int8)
+    for vertex in range(graph.vertex_count):
+        row[:] = 0
+        row[graph.offsets[vertex] : graph.offsets[vertex + 1]] = 1
+        row[in_order[in_offsets[vertex] : in_offsets[vertex + 1]]] = -1
+        file.write(" ".join(map(str, row.tolist())) + "\n")
+
+
+def write_adjacency(graph, file):
+    """Записывает граф построчно в виде матрицы смежности."""
+    row = np.zeros(graph.vertex_count, dtype=np.int8)
+    for vertex in range(graph.vertex_count):
+        row[:] = 0
+        row[graph.successors(vertex)] = 1
+        file.write(" ".join(map(str, row.tolist())) + "\n")
@@ -0,0 +1,415 @@
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .graph import SparseGraph
+from .scc import component_members, number_by_first_vertex, strong_components
+
+TRIM_MIN = 256
+SERIAL_LIMIT = 4096
+TASKS_PER_WORKER = 4
+STALL_SHARE = 0.9
+
+# Массивы разделяемой памяти, к которым подключился рабочий процесс.
+_shared = {}
+_blocks = []
+
+
+class SharedArrays:
+    """Массивы NumPy в разделяемой памяти для родителя и рабочих процессов.
+
+    specs передаются в инициализатор пула (attach), и рабочие процессы
+    видят те же массивы без копирования. close() освобождает память; до
+    этого все ссылки на arrays должны быть отброшены.
+    """
+
+    def __init__(self, arrays):
+        self.blocks = []
+        self.arrays = {}
+        self.specs = {}
+        try:
+            for name, array in arrays.items():
+                block = shared_memory.SharedMemory(
+                    create=True, size=max(array.nbytes, 1)
+                )
+                self.blocks.append(block)
+                view = np.ndarray(array.shape, array.dtype, buffer=block.buf)
+                view[...] = array
+                self.arrays[name] = view
+                self.specs[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+def attach(specs):
+    """Инициализатор рабочего процесса: подключает массивы SharedArrays."""
+    for name, (block_name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=block_name)
+        _blocks.append(block)
+        _shared[name] = np.ndarray(shape, np.dtype(dtype), buffer=block.buf)
+
+
+def _out_arcs(offsets, targets, vertices):
+    """Дуги из вершин vertices: начала и концы (строки CSR подряд)."""
+    starts = offsets[vertices]
+    counts = offsets[vertices + 1] - starts
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    shift = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    ends = targets[shift + np.arange(total)].astype(np.int64)
+    return np.repeat(vertices, counts), ends
+
+
+def _distinct(values, flags):
+    """Различные значения values по возрастанию.
+
+    Большие наборы собираются через рабочий массив флагов flags (после
+    вызова он снова весь False) — это дешевле сортировки в np.unique.
+    """
+    if len(values) * 16 < len(flags):
+        return np.unique(values)
+    flags[values] = True
+    result = np.flatnonzero(flags)
+    flags[result] = False
+    return result
+
+
+def trim(offsets, targets, reverse_offsets, reverse_targets):
+    """Отсекает вершины без входящих или без исходящих дуг, пока их много.
+
+    Такая вершина — отдельная компонента сильной связности; после ее
+    удаления степени соседей уменьшаются, и проход повторяется по ним. Все
+    проходы векторные; когда за проход отсекается меньше TRIM_MIN вершин,
+    остаток проще разобрать разбиением по достижимости. Возвращает
+    отсеченные вершины в порядке отсечения.
+    """
+    vertex_count = len(offsets) - 1
+    out_degree = np.diff(offsets)
+    in_degree = np.diff(reverse_offsets)
+    removed = np.zeros(vertex_count, dtype=bool)
+    flags = np.zeros(vertex_count, dtype=bool)
+    trimmed = []
+    frontier = np.flatnonzero((in_degree == 0) | (out_degree == 0))
+    while len(frontier):
+        removed[frontier] = True
+        trimmed.append(frontier)
+        if len(frontier) < TRIM_MIN:
+            break
+        candidates = []
+        for degree, row_offsets, row_targets in (
+            (in_degree, offsets, targets),
+            (out_degree, reverse_offsets, reverse_targets),
+        ):
+            neighbors = _out_arcs(row_offsets, row_targets, frontier)[1]
+            np.subtract.at(degree, neighbors, 1)
+            candidates.append(neighbors)
+        candidates = _distinct(np.concatenate(candidates), flags)
+        candidates = candidates[~removed[candidates]]
+        frontier = candidates[
+            (in_degree[candidates] == 0) | (out_degree[candidates] == 0)
+        ]
+    if not trimmed:
+        return np.zeros(0, dtype=np.int64)
+    return np.concatenate(trimmed).astype(np.int64)
+
+
+def _subgraph(arrays, vertices, color):
+    """Подграф на вершинах vertices (по возрастанию) с дугами внутри цвета color.
+
+    Номера вершин в подграфе пишутся в общий массив local; вершины разных
+    задач не пересекаются, поэтому запись безопасна. Дуги уже идут в
+    порядке CSR, и сортировка from_arcs не нужна.
+    """
+    local = arrays["local"]
+    local[vertices] = np.arange(len(vertices))
+    sources, targets = _out_arcs(arrays["offsets"], arrays["targets"], vertices)
+    inside = arrays["color"][targets] == color
+    offsets = np.zeros(len(vertices) + 1, dtype=np.int64)
+    np.cumsum(
+        np.bincount(local[sources[inside]], minlength=len(vertices)), out=offsets[1:]
+    )
+    return SparseGraph(len(vertices), offsets, local[targets[inside]].astype(np.int32))
+
+
+def _solve_serial(arrays, start, end):
+    """Разбирает срез start:end обходом Тарьяна по его подграфу."""
+    vertices = np.sort(arrays["order"][start:end])
+    count, component = strong_components(_subgraph(arrays, vertices, start))
+    members, bounds = component_members(component, count)
+    arrays["order"][start:end] = vertices[members]
+    arrays["label"][vertices[members]] = start + np.repeat(bounds[:-1], np.diff(bounds))
+    arrays["color"][vertices] = -1
+
+
+def color_classes(graph):
+    """Раскраска распространением наибольшего номера вперед по дугам.
+
+    Цвет вершины — наибольший номер вершины, из которой она достижима
+    (включая ее саму). Вершины одной компоненты сильной связности всегда
+    одного цвета, а вершина, чей цвет равен ее номеру, — опорная: ее
+    компонента — вершины ее цвета, из которых она достижима. Возвращает
+    цвета и признак принадлежности компоненте своей опорной вершины.
+    """
+    vertex_count = graph.vertex_count
+    color = np.arange(vertex_count)
+    flags = np.zeros(vertex_count, dtype=bool)
+    frontier = color
+    while len(frontier):
+        sources, targets = _out_arcs(graph.offsets, graph.targets, frontier)
+        better = color[sources] > color[targets]
+        sources, targets = sources[better], targets[better]
+        np.maximum.at(color, targets, color[sources])
+        frontier = _distinct(targets, flags)
+
+    reverse = graph.reverse()
+    frontier = np.flatnonzero(color == np.arange(vertex_count))
+    pivot_component = np.zeros(vertex_count, dtype=bool)
+    pivot_component[frontier] = True
+    while len(frontier):
+        sources, targets = _out_arcs(reverse.offsets, reverse.targets, frontier)
+        keep = (color[targets] == color[sources]) & ~pivot_component[targets]
+        frontier = _distinct(targets[keep], flags)
+        pivot_component[frontier] = True
+    return color, pivot_component
+
+
+def _pivot_split(arrays, start, end):
+    """Делит срез опорной вершиной по достижимости из нее вперед и назад.
+
+    Опорная вершина — с наибольшим произведением входящей и исходящей
+    степеней, чтобы чаще попадать в крупную компоненту. Пересечение
+    достижимого вперед и назад — ее компонента; остальные вершины делятся
+    на достижимые только вперед, только назад и прочие, и каждая часть —
+    объединение целых компонент и получает цвет своего начала. Возвращает
+    границы частей.
+    """
+    order = arrays["order"]
+    color = arrays["color"]
+    mark = arrays["mark"]
+    flags = np.zeros(len(color), dtype=bool)
+    vertices = order[start:end]
+    offsets = arrays["offsets"]
+    reverse_offsets = arrays["reverse_offsets"]
+    weight = (offsets[vertices + 1] - offsets[vertices]) * (
+        reverse_offsets[vertices + 1] - reverse_offsets[vertices]
+    )
+    pivot = vertices[np.argmax(weight)]
+    for bit, row_offsets, row_targets in (
+        (1, offsets, arrays["targets"]),
+        (2, reverse_offsets, arrays["reverse_targets"]),
+    ):
+        mark[pivot] |= bit
+        frontier = np.array([pivot])
+        while len(frontier):
+            ends = _out_arcs(row_offsets, row_targets, frontier)[1]
+            ends = ends[(color[ends] == start) & (mark[ends] & bit == 0)]
+            frontier = _distinct(ends, flags)
+            mark[frontier] |= bit
+
+    # Компонента опорной вершины (3) первой, затем только вперед (1),
+    # только назад (2) и прочие (0).
+    group = (3 - mark[vertices]) % 4
+    local = np.argsort(group, kind="stable")
+    order[start:end] = vertices[local]
+    mark[vertices] = 0
+    bounds = start + np.searchsorted(group[local], np.arange(5))
+    component = order[bounds[0] : bounds[1]]
+    arrays["label"][component] = bounds[0]
+    color[component] = -1
+    parts = []
+    for part_start, part_end in zip(bounds[1:-1].tolist(), bounds[2:].tolist()):
+        if part_start < part_end:
+            color[order[part_start:part_end]] = part_start
+            parts.append((part_start, part_end))
+    return parts
+
+
+def _color_split(arrays, start, end, limit):
+    """Делит срез раскраской (color_classes).
+
+    Каждая опорная вершина раскраски дает свою компоненту; остальные
+    вершины каждого цвета — объединение целых компонент. Цвета
+    укладываются подряд и режутся по границам цветов на части примерно по
+    limit вершин. Возвращает границы частей.
+    """
+    order = arrays["order"]
+    vertices = np.sort(order[start:end])
+    color, found = color_classes(_subgraph(arrays, vertices, start))
+    local = np.lexsort((color, ~found))
+    order[start:end] = vertices[local]
+    color = color[local]
+    found = found[local]
+    found_count = int(found.sum())
+
+    # Группа — вершины одного цвета по одну сторону от found_count;
+    # компонента опорной вершины помечается началом своей группы.
+    boundary = np.flatnonzero(np.diff(color, prepend=-1) | np.diff(found, prepend=True))
+    components = boundary[boundary < found_count]
+    lengths = np.diff(np.append(components, found_count))
+    arrays["label"][order[start : start + found_count]] = start + np.repeat(
+        components, lengths
+    )
+    arrays["color"][order[start : start + found_count]] = -1
+
+    classes = boundary[boundary >= found_count]
+    chunk = (classes - found_count) // limit
+    cuts = start + classes[np.flatnonzero(np.diff(chunk, prepend=-1) != 0)]
+    return list(zip(cuts.tolist(), np.append(cuts[1:], end).tolist()))
+
+
+def split(arrays, start, end, limit=SERIAL_LIMIT):
+    """Разбирает срез order[start:end] (вершины цвета start).
+
+    Срез не длиннее limit разбирается обходом Тарьяна. Иначе он делится
+    опорной вершиной (_pivot_split) — так за один шаг отделяется крупная
+    компонента. Если от какой-то части это почти не помогло (она больше
+    STALL_SHARE среза: опорная компонента мала), часть делится раскраской
+    (_color_split), которая отделяет сразу много мелких компонент; если не
+    помогла и она (например, на цепочке компонент), часть разбирается
+    обходом Тарьяна. Части переставляются на месте и получают цвет своего
+    начала. Срезы разных задач не пересекаются, поэтому задачи пишут в
+    общие массивы без блокировок. Возвращает новые срезы.
+    """
+    if end - start <= limit:
+        _solve_serial(arrays, start, end)
+        return []
+
+    parts = []
+    for part_start, part_end in _pivot_split(arrays, start, end):
+        size = part_end - part_start
+        if size <= (end - start) * STALL_SHARE:
+            parts.append((part_start, part_end))
+            continue
+        for piece_start, piece_end in _color_split(arrays, part_start, part_end, limit):
+            if piece_end - piece_start > size * STALL_SHARE:
+                arrays["color"][arrays["order"][piece_start:piece_end]] = piece_start
+                _solve_serial(arrays, piece_start, piece_end)
+            else:
+                parts.append((piece_start, piece_end))
+
+    tasks = []
+    for part_start, part_end in parts:
+        part = arrays["order"][part_start:part_end]
+        if part_end - part_start == 1:
+            arrays["label"][part] = part_start
+            arrays["color"][part] = -1
+        else:
+            arrays["color"][part] = part_start
+            tasks.append((part_start, part_end, limit))
+    return tasks
+
+
+def pool_context():
+    """Способ запуска процессов пула без fork.
+
+    Расчет запускается и из потоков Qt: fork многопоточного процесса
+    может унаследовать чужую захваченную блокировку и зависнуть. Поэтому
+    процессы порождаются через forkserver, а где его нет — через spawn.
+    """
+    method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    return multiprocessing.get_context(method)
+
+
+def _done_percent(tasks, vertex_count):
+    return 100 - sum(end - start for start, end, _ in tasks) * 100 // vertex_count
+
+
+def _split_shared(start, end, limit):
+    return split(_shared, start, end, limit)
+
+
+def parallel_components(graph, workers=None, progress=None):
+    """Компоненты сильной связности, найденные в пуле процессов.
+
+    Сначала векторными проходами отсекаются вершины без входящих или
+    исходящих дуг (trim), затем остаток разбивается опорными вершинами по
+    достижимости вперед и назад (split) в workers процессах над общими
+    массивами в разделяемой памяти. При workers=1 или небольшом остатке
+    он разбирается обходом Тарьяна в текущем процессе. progress(percent,
+    stage), если задан, вызывается по мере завершения задач.
+
+    Возвращает число компонент и номер компоненты каждой вершины, как
+    strong_components, но компоненты нумеруются по возрастанию наименьшей
+    вершины: номера не зависят от числа процессов и порядка задач.
+    """
+    progress = progress or (lambda percent, stage: None)
+    workers = workers or os.cpu_count() or 1
+    vertex_count = graph.vertex_count
+    reverse = graph.reverse()
+
+    progress(0, "Отсечение вершин без входящих или исходящих дуг")
+    trimmed = trim(graph.offsets, graph.targets, reverse.offsets, reverse.targets)
+    rest = np.ones(vertex_count, dtype=bool)
+    rest[trimmed] = False
+    order = np.concatenate((trimmed, np.flatnonzero(rest)))
+    first = len(trimmed)
+    label = np.zeros(vertex_count, dtype=np.int64)
+    label[trimmed] = np.arange(first)
+    color = np.where(rest, first, -1)
+
+    arrays = {
+        "offsets": graph.offsets,
+        "targets": graph.targets,
+        "reverse_offsets": reverse.offsets,
+        "reverse_targets": reverse.targets,
+        "order": order,
+        "label": label,
+        "color": color,
+        "local": np.zeros(vertex_count, dtype=np.int64),
+        "mark": np.zeros(vertex_count, dtype=np.int8),
+    }
+    # Разбиение нужно только затем, чтобы раздать процессам по
+    # TASKS_PER_WORKER независимых срезов: сами компоненты среза быстрее
+    # находит обход Тарьяна, чем дальнейшие разбиения.
+    limit = max(SERIAL_LIMIT, (vertex_count - first) // (TASKS_PER_WORKER * workers))
+    if workers == 1 or vertex_count - first <= limit:
+        progress(first * 100 // max(vertex_count, 1), "Обход Тарьяна")
+        if first < vertex_count:
+            _solve_serial(arrays, first, vertex_count)
+    else:
+        task = (first, vertex_count, limit)
+        shared = SharedArrays(arrays)
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=pool_context(),
+                initializer=attach,
+                initargs=(shared.specs,),
+            )
+            try:
+                running = {executor.submit(_split_shared, *task): task}
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        del running[future]
+                        for task in future.result():
+                            running[executor.submit(_split_shared, *task)] = task
+                    progress(
+                        _done_percent(running.values(), vertex_count),
+                        "Разбиение по достижимости",
+                    )
+            finally:
+                executor.shutdown(cancel_futures=True)
+            label = shared.arrays["label"].copy()
+        finally:
+            shared.close()
+
+    progress(100, "Нумерация компонент")
+    return number_by_first_vertex(label)
@@ -0,0 +1,207 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_ENV = "SYSTEM_ANALYSIS_PROFILE"
+PROFILE_DIR_ENV = "SYSTEM_ANALYSIS_PROFILE_DIR"
+CAPTURES = ("cprofile", "tracemalloc")
+PROFILE_LINES = 25
+
+
+def profile_options(value=None, log=None):
+    """Разбирает значение PROFILE_ENV: включено ли профилирование и какие захваты.
+
+    Пустое значение выключает профилирование, «1» или «spans» включают
+    только замеры этапов, «cprofile» и «tracemalloc» (через запятую)
+    добавляют соответствующий захват. Неизвестные значения не мешают
+    запуску окон: о них пишется предупреждение в log (по умолчанию
+    stderr), и они пропускаются; если других нет, профилирование выключено.
+    """
+    value = os.environ.get(PROFILE_ENV, "") if value is None else value
+    parts = {part.strip().lower() for part in value.split(",") if part.strip()}
+    unknown = parts - {"1", "spans", *CAPTURES}
+    if unknown:
+        print(
+            f"Предупреждение: неизвестный режим профилирования "
+            f"{', '.join(sorted(unknown))} в {PROFILE_ENV} пропущен",
+            file=sys.stderr if log is None else log,
+        )
+        parts -= unknown
+    return bool(parts), tuple(capture for capture in CAPTURES if capture in parts)
+
+
+class Profiler:
+    """Замеры этапов анализа в виде именованных интервалов времени (spans).
+
+    Интервалы пишутся всегда — это пара вызовов perf_counter на этап, — а
+    сводка выводится в log и файлы сохраняются, только если профилирование
+    включено (переменная окружения SYSTEM_ANALYSIS_PROFILE или enabled).
+    Если задан каталог (SYSTEM_ANALYSIS_PROFILE_DIR), после каждого
+    запуска в него пишутся JSON с интервалами и Chrome trace для
+    chrome://tracing или Perfetto.
+    """
+
+    def __init__(self, name, enabled=None, captures=None, directory=None, log=None):
+        self.log = sys.stderr if log is None else log
+        env_enabled, env_captures = profile_options(log=self.log)
+        self.name = name
+        self.enabled = env_enabled if enabled is None else enabled
+        self.captures = env_captures if captures is None else tuple(captures)
+        if directory is None:
+            directory = os.environ.get(PROFILE_DIR_ENV) or None
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Начинает новый запуск: стирает интервалы и результаты захвата."""
+        with self.lock:
+            self.origin = time.perf_counter()
+            self.spans = []
+            self.open_stages = {}
+            self.profile_text = None
+            self.peak_bytes = None
+
+    @contextmanager
+    def span(self, name):
+        """Замеряет выполнение блока with как интервал name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, start, time.perf_counter())
+
+    def stage(self, name):
+        """Закрывает текущий этап потока и начинает этап name (None — только закрыть)."""
+        now = time.perf_counter()
+        thread = threading.get_ident()
+        with self.lock:
+            previous = self.open_stages.pop(thread, None)
+            if name is not None:
+                self.open_stages[thread] = (name, now)
+        if previous is not None:
+            self._add(previous[0], previous[1], now)
+
+    def _add(self, name, start, end):
+        with self.lock:
+            self.spans.append(
+                {
+                    "name": name,
+                    "start": start - self.origin,
+                    "seconds": end - start,
+                    "thread": threading.get_ident(),
+                }
+            )
+
+    @contextmanager
+    def capture(self):
+        """Выполняет блок под cProfile и (или) tracemalloc, если они включены.
+
+        cProfile видит только поток, в котором выполняется блок.
+        """
+        profile = cProfile.Profile() if "cprofile" in self.captures else None
+        tracing = "tracemalloc" in self.captures and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                stream = io.StringIO()
+                stats = pstats.Stats(profile, stream=stream)
+                stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+                self.profile_text = stream.getvalue()
+            if tracing:
+                self.peak_bytes = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+
+    def totals(self):
+        """Суммарное время по именам интервалов в порядке их первого появления."""
+        totals = {}
+        with self.lock:
+            for span in self.spans:
+                totals[span["name"]] = totals.get(span["name"], 0) + span["seconds"]
+        return totals
+
+    def summary(self):
+        """Однострочная сводка по этапам, например «Разбор 12 мс, ...»."""
+        totals = self.totals()
+        stages = ", ".join(
+            f"{name} {seconds * 1000:.0f} мс" for name, seconds in totals.items()
+        )
+        text = f"{self.name}: {stages or 'нет замеров'}"
+        if totals:
+            text += f"; всего {sum(totals.values()) * 1000:.0f} мс"
+        if self.peak_bytes is not None:
+            text += f"; пик памяти {self.peak_bytes / 2**20:.1f} МБ"
+        return text
+
+    def to_dict(self):
+        """Интервалы, суммы по этапам и результаты захвата для JSON."""
+        with self.lock:
+            spans = list(self.spans)
+        return {
+            "name": self.name,
+            "spans": spans,
+            "totals": self.totals(),
+            "peak_bytes": self.peak_bytes,
+            "profile": self.profile_text,
+        }
+
+    def to_chrome_trace(self):
+        """Интервалы в формате Trace Event (chrome://tracing, Perfetto)."""
+        with self.lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": span["name"],
+                    "cat": self.name,
+                    "ph": "X",
+                    "ts": span["start"] * 1e6,
+                    "dur": span["seconds"] * 1e6,
+                    "pid": pid,
+                    "tid": span["thread"],
+                }
+                for span in spans
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def save_json(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
+
+    def save_chrome_trace(self, path):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(self.to_chrome_trace(), file, ensure_ascii=False)
+
+    def report(self):
+        """Выводит сводку запуска и сохраняет файлы, если профилирование включено."""
+        if not self.enabled:
+            return None
+        summary = self.summary()
+        print(summary, file=self.log)
+        if self.profile_text:
+            print(self.profile_text, file=self.log)
+        if self.directory is not None:
+            stamp = time.strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(self.directory, f"{self.name}-{stamp}")
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self.save_json(path + ".json")
+                self.save_chrome_trace(path + ".trace.json")
+            except OSError as e:
+                print(f"Не удалось сохранить профиль: {e}", file=self.log)
+        return summary
@@ -0,0 +1,76 @@
+import sys
+
+if "PyQt6" in sys.modules:
+    from PyQt6.QtCore import (
+        QAbstractListModel,
+        QAbstractTableModel,
+        QModelIndex,
+        QObject,
+        QRunnable,
+        Qt,
+        QThreadPool,
+        QTimer,
+        pyqtSignal,
+    )
+    from PyQt6.QtGui import QImage, QPixmap
+    from PyQt6.QtWidgets import (
+        QAbstractItemView,
+        QComboBox,
+        QHBoxLayout,
+        QHeaderView,
+        QLabel,
+        QLineEdit,
+        QPushButton,
+        QTableView,
+        QVBoxLayout,
+        QWidget,
+    )
+else:
+    from PyQt5.QtCore import (
+        QAbstractListModel,
+        QAbstractTableModel,
+        QModelIndex,
+        QObject,
+        QRunnable,
+        Qt,
+        QThreadPool,
+        QTimer,
+        pyqtSignal,
+    )
+    from PyQt5.QtGui import QImage, QPixmap
+    from PyQt5.QtWidgets import (
+        QAbstractItemView,
+        QComboBox,
+        QHBoxLayout,
+        QHeaderView,
+        QLabel,
+        QLineEdit,
+        QPushButton,
+        QTableView,
+        QVBoxLayout,
+        QWidget,
+    )
+
+__all__ = [
+    "QAbstractItemView",
+    "QAbstractListModel",
+    "QAbstractTableModel",
+    "QComboBox",
+    "QHBoxLayout",
+    "QHeaderView",
+    "QImage",
+    "QLabel",
+    "QLineEdit",
+    "QModelIndex",
+    "QObject",
+    "QPixmap",
+    "QPushButton",
+    "QRunnable",
+    "QTableView",
+    "QThreadPool",
+    "QTimer",
+    "QVBoxLayout",
+    "QWidget",
+    "Qt",
+    "pyqtSignal",
+]
@@ -0,0 +1,12 @@
+from .qtbinding import QImage, QPixmap
+
+
+def image_pixmap(image, device_pixel_ratio=1.0):
+    """Превращает массив RGBA (высота, ширина, 4) в QPixmap без записи на диск."""
+    height, width = image.shape[:2]
+    qimage = QImage(
+        image.data, width, height, image.strides[0], QImage.Format.Format_RGBA8888
+    )
+    pixmap = QPixmap.fromImage(qimage)
+    pixmap.setDevicePixelRatio(device_pixel_ratio)
+    return pixmap
@@ -0,0 +1,184 @@
+import numpy as np
+
+from .qtbinding import QAbstractListModel, QAbstractTableModel, QModelIndex, Qt
+from .reports import TextReport
+
+
+class MatrixModel(QAbstractTableModel):
+    """Табличная модель поверх массива NumPy; текст ячеек строится только для видимых."""
+
+    def __init__(
+        self,
+        matrix=None,
+        alphabet=None,
+        row_label="{}",
+        column_label="{}",
+        centered=False,
+        parent=None,
+    ):
+        super().__init__(parent)
+        self.matrix = np.zeros((0, 0), dtype=np.int8) if matrix is None else matrix
+        self.alphabet = alphabet
+        self.row_label = row_label
+        self.column_label = column_label
+        self.centered = centered
+
+    def set_matrix(self, matrix):
+        """Заменяет массив, на который опирается модель."""
+        self.beginResetModel()
+        self.matrix = matrix
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.matrix.shape[0]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.matrix.shape[1]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return str(self.matrix[index.row(), index.column()])
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.centered:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Записывает отредактированное значение прямо в массив."""
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        text = str(value).strip()
+        if self.alphabet is not None and text not in self.alphabet:
+            return False
+        try:
+            self.matrix[index.row(), index.column()] = int(text)
+        except (ValueError, OverflowError):
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if self.alphabet is not None:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            return self.column_label.format(section + 1)
+        return self.row_label.format(section + 1)
+
+
+class AdjacencyModel(QAbstractTableModel):
+    """Матрица смежности разреженного графа без построения плотного массива.
+
+    Порядок вершин в строках и столбцах задается перестановкой order.
+    """
+
+    def __init__(self, label="{0}", centered=False, parent=None):
+        super().__init__(parent)
+        self.graph = None
+        self.order = np.zeros(0, dtype=np.int64)
+        self.label = label
+        self.centered = centered
+
+    def set_graph(self, graph, order=None):
+        """Показывает граф (или пустую таблицу для None) в заданном порядке вершин."""
+        self.beginResetModel()
+        self.graph = graph
+        if graph is None:
+            self.order = np.zeros(0, dtype=np.int64)
+        elif order is None:
+            self.order = np.arange(graph.vertex_count)
+        else:
+            self.order = np.asarray(order)
+        self.endResetModel()
+
+    def refresh(self, order=None):
+        """Сообщает об изменении дуг (и, если задан, порядка вершин) без сброса.
+
+        Представления перерисовывают только видимые ячейки, поэтому это
+        дешево даже для большой матрицы.
+        """
+        if order is not None:
+            self.order = np.asarray(order)
+        if len(self.order):
+            last = len(self.order) - 1
+            self.dataChanged.emit(self.index(0, 0), self.index(last, last))
+            self.headerDataChanged.emit(Qt.Orientation.Vertical, 0, last)
+            self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, last)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            found = self.graph.has_arc(
+                self.order[index.row()], self.order[index.column()]
+            )
+            return "1" if found else "0"
+        if role == Qt.ItemDataRole.TextAlignmentRole and self.centered:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or section >= len(self.order):
+            return None
+        return self.label.format(section + 1, self.order[section] + 1)
+
+
+class ReportModel(QAbstractListModel):
+    """Строки текстового отчета (reports.Report), форматируемые только при показе.
+
+    Модель не хранит текст: представление запрашивает строки видимой
+    страницы, и каждая строится из данных результата по номеру.
+    """
+
+    def __init__(self, report=None, parent=None):
+        super().__init__(parent)
+        self.report = TextReport() if report is None else report
+
+    def set_report(self, report):
+        """Показывает другой отчет (пустой для None) со сбросом прокрутки."""
+        self.beginResetModel()
+        self.report = TextReport() if report is None else report
+        self.endResetModel()
+
+    def replace(self, report, rows=None):
+        """Подменяет отчет, перерисовывая только строки rows (все, если не заданы).
+
+        Прокрутка и выделение сохраняются; если число строк другое, модель
+        сбрасывается, как в set_report.
+        """
+        if len(report) != len(self.report):
+            self.set_report(report)
+            return
+        self.report = report
+        self.refresh(rows)
+
+    def refresh(self, rows=None):
+        """Перерисовывает строки rows (все, если не заданы) после правки данных."""
+        if rows is None:
+            if len(self.report):
+                last = self.index(len(self.report) - 1, 0)
+                self.dataChanged.emit(self.index(0, 0), last)
+            return
+        for row in rows:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.report)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.report.line(index.row())
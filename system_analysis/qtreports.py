@@ -0,0 +1,161 @@
+from .qtbinding import (
+    QAbstractItemView,
+    QComboBox,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QTableView,
+    QTimer,
+    QVBoxLayout,
+    QWidget,
+)
+from .qtmodels import ReportModel
+from .reports import TextReport
+
+KIND_TITLES = {"vertex": "Вершина", "level": "Уровень", "subsystem": "Подсистема"}
+SEARCH_STEP = 2000
+
+
+class ReportView(QWidget):
+    """Текстовый отчет в списке строк с переходом к записи и поиском.
+
+    Отчет показывается таблицей из одного столбца со строками одной
+    высоты: она запрашивает у модели только видимые строки (QListView при
+    раскладке опрашивает модель по каждой строке), так что показ и
+    прокрутка не зависят от размера отчета. Переход к
+    вершине, уровню или подсистеме — вычисление номера строки (kinds —
+    доступные виды записей), поиск текста идет порциями по SEARCH_STEP
+    строк между событиями интерфейса.
+    """
+
+    def __init__(self, kinds=(), parent=None):
+        super().__init__(parent)
+        self.model = ReportModel(parent=self)
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setStretchLastSection(True)
+        self.view.verticalHeader().hide()
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.set_font(self.view.font())
+
+        self.kind_combo = QComboBox()
+        for kind in kinds:
+            self.kind_combo.addItem(KIND_TITLES[kind], kind)
+        self.kind_combo.addItem("Текст", None)
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Номер или текст")
+        self.search_input.returnPressed.connect(self.search)
+        self.search_button = QPushButton("Найти")
+        self.search_button.clicked.connect(self.search)
+        self.search_label = QLabel()
+
+        search_layout = QHBoxLayout()
+        search_layout.setContentsMargins(0, 0, 0, 0)
+        search_layout.addWidget(self.kind_combo)
+        search_layout.addWidget(self.search_input, 1)
+        search_layout.addWidget(self.search_button)
+        search_layout.addWidget(self.search_label)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(search_layout)
+        layout.addWidget(self.view, 1)
+
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.timeout.connect(self.search_step)
+        self.pending = None
+
+    def set_font(self, font):
+        """Шрифт строк отчета; высота строк подгоняется под него."""
+        self.view.setFont(font)
+        self.view.verticalHeader().setDefaultSectionSize(
+            self.view.fontMetrics().height() + 6
+        )
+
+    @property
+    def report(self):
+        return self.model.report
+
+    def set_report(self, report):
+        """Показывает отчет reports.Report (None — пустой)."""
+        self.stop_search()
+        self.model.set_report(report)
+
+    def replace(self, report, rows=None):
+        """Подменяет отчет после правки, перерисовывая только строки rows."""
+        self.model.replace(report, rows)
+
+    def set_text(self, text):
+        """Показывает готовый текст, например сообщение об ошибке."""
+        self.set_report(TextReport(text))
+
+    def clear(self):
+        self.set_report(None)
+
+    def refresh(self, rows=None):
+        self.model.refresh(rows)
+
+    def text(self):
+        """Весь отчет одной строкой."""
+        return self.report.text()
+
+    def show_row(self, row):
+        index = self.model.index(row, 0)
+        self.view.setCurrentIndex(index)
+        self.view.scrollTo(index, QAbstractItemView.ScrollHint.PositionAtTop)
+
+    def search(self):
+        """Переходит к записи с введенным номером или ищет текст после текущей строки."""
+        self.stop_search()
+        query = self.search_input.text().strip()
+        if not query or not len(self.report):
+            return
+        kind = self.kind_combo.currentData()
+        if kind is not None:
+            try:
+                row = self.report.locate(kind, int(query))
+            except ValueError:
+                self.search_label.setText("Введите номер")
+                return
+            self.finish_search(row)
+            return
+        current = self.view.currentIndex()
+        start = current.row() + 1 if current.isValid() else 0
+        self.pending = (query, start, 0)
+        self.search_label.setText("Поиск…")
+        self.search_step()
+
+    def search_step(self):
+        if self.pending is None:
+            return
+        query, start, scanned = self.pending
+        total = len(self.report)
+        count = min(SEARCH_STEP, total - scanned)
+        row = self.report.find(query, (start + scanned) % total, count)
+        scanned += count
+        if row is not None or scanned >= total:
+            self.pending = None
+            self.finish_search(row)
+        else:
+            self.pending = (query, start, scanned)
+            self.search_timer.start(0)
+
+    def finish_search(self, row):
+        if row is None:
+            self.search_label.setText("Не найдено")
+            return
+        self.search_label.setText("")
+        self.show_row(row)
+
+    def stop_search(self):
+        self.search_timer.stop()
+        self.pending = None
+        self.search_label.setText("")
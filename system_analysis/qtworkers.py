@@ -0,0 +1,75 @@
+import threading
+from contextlib import nullcontext
+
+from .qtbinding import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class Cancelled(Exception):
+    """Задача анализа отменена пользователем."""
+
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    done = pyqtSignal()
+
+
+class AnalysisWorker(QRunnable):
+    """Выполняет функцию анализа в пуле потоков Qt.
+
+    Функция получает именованный аргумент progress(percent, stage); после
+    отмены очередной вызов progress прерывает ее. Результат, ошибка или
+    отмена возвращаются в поток интерфейса сигналами, в конце всегда
+    испускается done.
+
+    Если передан profiler (см. profiling.Profiler), каждая новая стадия в
+    progress открывает в нем интервал, а вся функция выполняется под его
+    захватом cProfile/tracemalloc.
+    """
+
+    def __init__(self, function, *args, profiler=None):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.function = function
+        self.args = args
+        self.profiler = profiler
+        self.signals = WorkerSignals()
+        self._cancel_event = threading.Event()
+        self._last_report = None
+
+    def start(self):
+        QThreadPool.globalInstance().start(self)
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def report(self, percent, stage):
+        if self._cancel_event.is_set():
+            raise Cancelled()
+        report = (int(percent), stage)
+        if self.profiler is not None and (
+            self._last_report is None or stage != self._last_report[1]
+        ):
+            self.profiler.stage(stage)
+        if report != self._last_report:
+            self._last_report = report
+            self.signals.progress.emit(*report)
+
+    def run(self):
+        profiler = self.profiler
+        try:
+            with profiler.capture() if profiler is not None else nullcontext():
+                try:
+                    result = self.function(*self.args, progress=self.report)
+                finally:
+                    if profiler is not None:
+                        profiler.stage(None)
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        self.signals.done.emit()
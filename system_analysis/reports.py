@@ -0,0 +1,217 @@
+import heapq
+
+import numpy as np
+
+from .analysis import format_level, format_right_incidence_line
+
+LINE_ITEMS = 1000
+
+
+def _shown(values, limit):
+    """Первые limit значений и приписка о полном числе, если значений больше."""
+    if limit is None or len(values) <= limit:
+        return list(values), ""
+    return list(values[:limit]), f" … (всего {len(values)})"
+
+
+class Report:
+    """Текстовый отчет, строки которого строятся по одной по номеру строки.
+
+    Подкласс хранит только исходные данные результата и задает __len__ и
+    line(row), поэтому показ любой страницы отчета стоит столько же, сколько
+    форматирование ее строк, независимо от размера всего результата. Списки
+    длиннее limit значений в строке обрезаются (limit=None — без обрезки,
+    тогда text() совпадает с прежним отчетом format_*).
+
+    locate(kind, number) возвращает строку, с которой начинается запись о
+    вершине, уровне или подсистеме number, или None.
+    """
+
+    kinds = ()
+
+    def __init__(self, limit=LINE_ITEMS):
+        self.limit = limit
+
+    def __len__(self):
+        return 0
+
+    def line(self, row):
+        raise IndexError(row)
+
+    def lines(self):
+        return (self.line(row) for row in range(len(self)))
+
+    def text(self):
+        """Весь отчет одной строкой (для копирования и сравнения)."""
+        return "".join(line + "\n" for line in self.lines())
+
+    def locate(self, kind, number):
+        return None
+
+    def find(self, text, start=0, count=None):
+        """Первая строка, содержащая text, среди count строк со start по кругу.
+
+        Без count просматривается весь отчет; None — совпадений нет. Окно
+        ищет порциями, чтобы длинный поиск не останавливал интерфейс.
+        """
+        total = len(self)
+        count = total if count is None else min(count, total)
+        for step in range(count):
+            row = (start + step) % total
+            if text in self.line(row):
+                return row
+        return None
+
+
+class TextReport(Report):
+    """Готовый текст (сообщение об ошибке, подсказка) в виде отчета."""
+
+    def __init__(self, text=""):
+        super().__init__(None)
+        self.rows = text.rstrip("\n").split("\n") if text else []
+
+    def __len__(self):
+        return len(self.rows)
+
+    def line(self, row):
+        return self.rows[row]
+
+
+class RightIncidenceReport(Report):
+    """Множества G+: по строке на вершину, концы дуг берутся из графа при показе.
+
+    graph — SparseGraph или DynamicGraph; при правках графа достаточно
+    перерисовать строки измененных вершин.
+    """
+
+    kinds = ("vertex",)
+
+    def __init__(self, graph, limit=LINE_ITEMS):
+        super().__init__(limit)
+        self.graph = graph
+
+    def __len__(self):
+        return self.graph.vertex_count
+
+    def line(self, row):
+        targets = np.unique(np.asarray(self.graph.successors(row), dtype=np.int64))
+        shown, rest = _shown((targets + 1).tolist(), self.limit)
+        return format_right_incidence_line(row, shown).rstrip("\n") + rest
+
+    def locate(self, kind, number):
+        if kind == "vertex" and 1 <= number <= len(self):
+            return number - 1
+        return None
+
+
+class LevelReport(Report):
+    """Иерархические уровни: по строке на уровень (вершины с единицы)."""
+
+    kinds = ("vertex", "level")
+
+    def __init__(self, levels, limit=LINE_ITEMS):
+        super().__init__(limit)
+        self.levels = levels
+        self._level_of = None
+
+    def __len__(self):
+        return len(self.levels)
+
+    def line(self, row):
+        shown, rest = _shown(self.levels[row], self.limit)
+        return format_level(row, shown).rstrip("\n") + rest
+
+    def locate(self, kind, number):
+        if kind == "level":
+            return number if 0 <= number < len(self) else None
+        if kind == "vertex":
+            if self._level_of is None:
+                sizes = [len(level) for level in self.levels]
+                vertices = np.fromiter(
+                    (vertex for level in self.levels for vertex in level),
+                    dtype=np.int64,
+                    count=sum(sizes),
+                )
+                self._level_of = np.full(len(vertices) + 1, -1, dtype=np.int64)
+                self._level_of[vertices] = np.repeat(np.arange(len(sizes)), sizes)
+            if 1 <= number < len(self._level_of) and self._level_of[number] >= 0:
+                return int(self._level_of[number])
+        return None
+
+
+class DecompositionReport(Report):
+    """Отчет декомпозиции в тех же строках, что format_decomposition.
+
+    На каждую подсистему приходится четыре строки (заголовок, вершины,
+    дуги, пустая), затем заголовок и по строке правых инциденций.
+    """
+
+    kinds = ("vertex", "subsystem")
+    HEAD = 2
+    BLOCK = 4
+
+    def __init__(self, decomposition, limit=LINE_ITEMS):
+        super().__init__(limit)
+        self.decomposition = decomposition
+        self.count = len(decomposition.subsystems)
+        self._subsystem_of = None
+
+    def __len__(self):
+        return self.HEAD + self.BLOCK * self.count + 1 + self.count
+
+    def line(self, row):
+        if row == 0:
+            return "Подсистемы (связные компоненты):"
+        if row == 1:
+            return ""
+        row -= self.HEAD
+        if row < self.BLOCK * self.count:
+            subsystem, part = divmod(row, self.BLOCK)
+            return self._subsystem_line(subsystem, part)
+        row -= self.BLOCK * self.count
+        if row == 0:
+            return "Множества правых инциденций для подсистем:"
+        if row > self.count:
+            raise IndexError(row)
+        sources = self.decomposition.right_incidence[row]
+        if not sources:
+            return f"Подсистема {row}: Нет входящих связей"
+        shown, rest = self._smallest(sources)
+        return f"Подсистема {row}: {shown}{rest}"
+
+    def _subsystem_line(self, subsystem, part):
+        if part == 0:
+            return f"Подсистема {subsystem + 1}:"
+        if part == 1:
+            shown, rest = self._smallest(self.decomposition.subsystems[subsystem])
+            return f"Вершины: {', '.join(map(str, shown))}{rest}"
+        if part == 2:
+            edges = self.decomposition.subsystem_edges[subsystem]
+            if not edges:
+                return "Дуги: Нет дуг"
+            shown, rest = _shown(edges, self.limit)
+            return f"Дуги: {', '.join(f'{u}--{v}' for u, v in shown)}{rest}"
+        return ""
+
+    def _smallest(self, values):
+        """Наименьшие limit значений множества по возрастанию и приписка."""
+        if self.limit is None or len(values) <= self.limit:
+            return sorted(values), ""
+        return (
+            heapq.nsmallest(self.limit, values),
+            f" … (всего {len(values)})",
+        )
+
+    def locate(self, kind, number):
+        if kind == "subsystem":
+            if 1 <= number <= self.count:
+                return self.HEAD + self.BLOCK * (number - 1)
+        elif kind == "vertex":
+            if self._subsystem_of is None:
+                subsystem_of = {}
+                for subsystem, vertices in enumerate(self.decomposition.subsystems):
+                    subsystem_of.update(dict.fromkeys(vertices, subsystem))
+                self._subsystem_of = subsystem_of
+            if number in self._subsystem_of:
+                return self.HEAD + self.BLOCK * self._subsystem_of[number]
+        return None
@@ -0,0 +1,120 @@
+import itertools
+from array import array
+
+import numpy as np
+
+from .graph import SparseGraph
+
+
+def strong_components(graph, roots=None):
+    """Находит компоненты сильной связности итеративным алгоритмом Тарьяна.
+
+    Возвращает число компонент и массив номеров компонент для вершин.
+    Компоненты нумеруются в порядке их нахождения, то есть в обратном
+    топологическом порядке графа конденсации. Обход начинается с вершин
+    roots (в заданном порядке), затем с остальных по возрастанию.
+    """
+    n = graph.vertex_count
+    offsets = array("q", np.asarray(graph.offsets, dtype=np.int64).tobytes())
+    targets = array("q", np.asarray(graph.targets, dtype=np.int64).tobytes())
+    index = array("q", [-1]) * n
+    low = array("q", [0]) * n
+    component = array("q", [-1]) * n
+    stack = array("q")
+    call_vertex = array("q")
+    call_position = array("q")
+    counter = 0
+    count = 0
+
+    for root in itertools.chain(roots if roots is not None else (), range(n)):
+        if index[root] >= 0:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        call_vertex.append(root)
+        call_position.append(offsets[root])
+
+        while call_vertex:
+            v = call_vertex[-1]
+            position = call_position[-1]
+            end = offsets[v + 1]
+            while position < end:
+                w = targets[position]
+                position += 1
+                if index[w] < 0:
+                    call_position[-1] = position
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    call_vertex.append(w)
+                    call_position.append(offsets[w])
+                    break
+                if component[w] < 0 and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                call_vertex.pop()
+                call_position.pop()
+                if low[v] == index[v]:
+                    while True:
+                        w = stack.pop()
+                        component[w] = count
+                        if w == v:
+                            break
+                    count += 1
+                if call_vertex and low[v] < low[call_vertex[-1]]:
+                    low[call_vertex[-1]] = low[v]
+
+    return count, np.frombuffer(component, dtype=np.int64)
+
+
+def component_members(component, count):
+    """Группирует вершины по компонентам.
+
+    Возвращает вершины, упорядоченные по компонентам (внутри — по
+    возрастанию), и границы: вершины компоненты c лежат в
+    members[bounds[c] : bounds[c + 1]].
+    """
+    members = np.argsort(component, kind="stable")
+    bounds = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(component, minlength=count), out=bounds[1:])
+    return members, bounds
+
+
+def number_by_first_vertex(component):
+    """Перенумеровывает компоненты по возрастанию наименьшей вершины.
+
+    Такие номера не зависят от того, как и в каком порядке компоненты были
+    найдены. Возвращает число компонент и новый номер каждой вершины.
+    """
+    _, first_vertex, inverse = np.unique(
+        component, return_index=True, return_inverse=True
+    )
+    rank = np.empty(len(first_vertex), dtype=np.int64)
+    rank[np.argsort(first_vertex)] = np.arange(len(first_vertex))
+    return len(first_vertex), rank[inverse]
+
+
+def internal_arcs(graph, component, count):
+    """Раскладывает дуги внутри компонент по компонентам за один проход.
+
+    Возвращает начала, концы и границы групп, как component_members;
+    внутри компоненты дуги идут в порядке исходного графа.
+    """
+    sources, targets = graph.arcs()
+    owner = component[sources]
+    inside = np.flatnonzero(owner == component[targets])
+    order = inside[np.argsort(owner[inside], kind="stable")]
+    bounds = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(owner[inside], minlength=count), out=bounds[1:])
+    return sources[order], targets[order], bounds
+
+
+def condensation(graph, component, count):
+    """Строит граф конденсации за один проход по дугам исходного графа."""
+    sources, targets = graph.arcs()
+    component_sources = component[sources]
+    component_targets = component[targets]
+    between = component_sources != component_targets
+    keys = np.unique(component_sources[between] * count + component_targets[between])
+    return SparseGraph.from_arcs(count, keys // count, keys % count)
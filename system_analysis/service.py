@@ -0,0 +1,458 @@
+import asyncio
+import collections
+import io
+import json
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from .export import export_graph, level_arrays
+from .graph import SparseGraph
+from .loaders import read_adjacency, read_incidence_graph
+from .validation import validate_incidence
+
+HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 64 * 1024 * 1024
+MAX_HEADERS = 100
+IDLE_TIMEOUT = 60
+STREAM_CHUNK = 64 * 1024
+LATENCY_WINDOW = 1024
+
+# Разделы экспорта, которые отдает каждая точка, и правило unique для
+# матрицы инциденций по умолчанию (как в соответствующей лабораторной).
+ENDPOINTS = {
+    "/convert": (("right_incidence", "adjacency"), True),
+    "/levels": (("adjacency", "levels", "swap_vertex"), False),
+    "/decompose": (("subsystems", "subsystem_right_incidence"), False),
+}
+PATHS = (*ENDPOINTS, "/metrics", "/health")
+PAYLOAD_FORMATS = ("incidence", "adjacency", "edges")
+
+
+class RequestError(Exception):
+    """Ошибка запроса, которая отдается клиенту с кодом status."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _matrix(value, name):
+    try:
+        matrix = np.asarray(value, dtype=np.int64)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"Поле {name} должно быть матрицей целых чисел")
+    if matrix.ndim != 2 or matrix.size == 0:
+        raise ValueError(f"Поле {name} должно быть непустой матрицей (список строк)")
+    return matrix
+
+
+def payload_graph(payload, unique=True):
+    """Строит граф по телу запроса.
+
+    Формат задается полем format (по умолчанию — по имеющимся полям):
+
+    - incidence — matrix (строки вершин, столбцы дуг, 0/1/-1) или text в
+      формате graph.txt; необязательное unique — повторы дуг считаются
+      ошибкой;
+    - adjacency — matrix (квадратная, 0/1) или text в формате matrix.txt;
+    - edges — vertices (число вершин) и arcs (пары номеров с единицы).
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Тело запроса должно быть объектом JSON")
+    format = payload.get("format") or ("edges" if "arcs" in payload else None)
+    if format not in PAYLOAD_FORMATS:
+        raise ValueError(
+            f"Поле format должно быть одним из: {', '.join(PAYLOAD_FORMATS)}"
+        )
+    unique = bool(payload.get("unique", unique))
+
+    if format == "edges":
+        vertices = payload.get("vertices")
+        if not isinstance(vertices, int) or isinstance(vertices, bool) or vertices < 1:
+            raise ValueError("Поле vertices должно быть положительным целым числом")
+        try:
+            arcs = np.asarray(payload.get("arcs", []), dtype=np.int64)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("Поле arcs должно быть списком пар номеров вершин")
+        if arcs.size == 0:
+            arcs = arcs.reshape(0, 2)
+        if arcs.ndim != 2 or arcs.shape[1] != 2:
+            raise ValueError("Поле arcs должно быть списком пар номеров вершин")
+        if arcs.size and (arcs.min() < 1 or arcs.max() > vertices):
+            raise ValueError(f"Номера вершин в arcs должны быть от 1 до {vertices}")
+        # Петли не учитываются, как и диагональ матрицы смежности.
+        arcs = arcs[arcs[:, 0] != arcs[:, 1]] - 1
+        return SparseGraph.from_arcs(vertices, arcs[:, 0], arcs[:, 1])
+
+    if "text" in payload:
+        if not isinstance(payload["text"], str):
+            raise ValueError("Поле text должно быть строкой")
+        lines = io.StringIO(payload["text"])
+        if format == "incidence":
+            return read_incidence_graph(lines, unique=unique)
+        return read_adjacency(lines)
+    if "matrix" not in payload:
+        raise ValueError("Нужно поле matrix или text")
+
+    matrix = _matrix(payload["matrix"], "matrix")
+    if format == "incidence":
+        report = validate_incidence(matrix, unique=unique)
+        report.check()
+        sources, targets = report.arcs
+        return SparseGraph.from_arcs(len(matrix), sources, targets)
+    if matrix.shape[0] != matrix.shape[1]:
+        raise ValueError("Некорректная матрица! Матрица должна быть квадратной.")
+    return SparseGraph.from_adjacency(matrix)
+
+
+def run_job(endpoint, body, directory):
+    """Выполняется в рабочем процессе: разбирает запрос и пишет ответ в файл.
+
+    Результат пишется через export_graph в JSON Lines во временный файл
+    каталога directory; процесс возвращает только путь, а сервер отдает
+    файл клиенту порциями.
+    """
+    try:
+        payload = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Некорректный JSON: {e}")
+    sections, unique = ENDPOINTS[endpoint]
+    graph = payload_graph(payload, unique=unique)
+    order = None
+    if endpoint == "/levels":
+        # Матрица смежности — в порядке уровней, как в ЛР №2.
+        order = level_arrays(graph)[1]
+    descriptor, path = tempfile.mkstemp(suffix=".jsonl", dir=directory)
+    os.close(descriptor)
+    try:
+        return export_graph(graph, path, sections, "jsonl", order)
+    except BaseException:
+        os.remove(path)
+        raise
+
+
+class EndpointMetrics:
+    """Счетчики одной точки: запросы, ошибки, отказы и задержки.
+
+    Задержка — от разбора запроса до отправки последнего байта ответа;
+    процентили считаются по последним LATENCY_WINDOW запросам.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.total = 0.0
+        self.longest = 0.0
+        self.recent = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, status, seconds):
+        self.requests += 1
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            self.rejected += 1
+        elif status >= 400:
+            self.errors += 1
+        self.total += seconds
+        self.longest = max(self.longest, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self):
+        latency = {"mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+        if self.requests:
+            p50, p95, p99 = np.percentile(list(self.recent), (50, 95, 99)).tolist()
+            latency = {
+                "mean": self.total / self.requests * 1000,
+                "p50": p50 * 1000,
+                "p95": p95 * 1000,
+                "p99": p99 * 1000,
+                "max": self.longest * 1000,
+            }
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "latency_ms": latency,
+        }
+
+
+class AnalysisService:
+    """HTTP/JSON-сервис анализа графов на localhost поверх пула процессов.
+
+    POST /convert, /levels и /decompose принимают граф (см. payload_graph)
+    и отвечают JSON Lines (Transfer-Encoding: chunked) теми же записями,
+    что команда export; GET /metrics — задержки по точкам и глубина
+    очереди, GET /health — проверка живости.
+
+    Одновременно принимается не больше workers + queue_limit задач;
+    сверх этого запрос сразу получает 503, чтобы очередь не росла без
+    предела под нагрузкой.
+    """
+
+    def __init__(self, workers=None, queue_limit=None, max_body=MAX_BODY):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue_limit = self.workers * 4 if queue_limit is None else queue_limit
+        self.max_body = max_body
+        self.in_flight = 0
+        self.peak_queue = 0
+        self.started = time.monotonic()
+        self.metrics = collections.defaultdict(EndpointMetrics)
+        self.executor = None
+        self.directory = None
+
+    @property
+    def queue_depth(self):
+        """Задачи, принятые сверх числа рабочих процессов (ждут своей очереди)."""
+        return max(0, self.in_flight - self.workers)
+
+    def open(self):
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.directory = tempfile.mkdtemp(prefix="system-analysis-service-")
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+    def snapshot(self):
+        return {
+            "uptime": time.monotonic() - self.started,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.peak_queue,
+            "endpoints": {
+                path: metrics.snapshot()
+                for path, metrics in sorted(self.metrics.items())
+            },
+        }
+
+    async def handle(self, reader, writer):
+        """Обслуживает одно соединение (HTTP/1.1, с keep-alive)."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(
+                        self.read_request(reader), IDLE_TIMEOUT
+                    )
+                except RequestError as e:
+                    await self.send_json(writer, e.status, {"error": str(e)}, False)
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                start = time.perf_counter()
+                status = await self.respond(writer, method, path, body, keep_alive)
+                self.metrics[path if path in PATHS else "other"].record(
+                    status, time.perf_counter() - start
+                )
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def read_request(self, reader):
+        """Читает запрос: (метод, путь, заголовки, тело) или None в конце потока."""
+        try:
+            line = await reader.readline()
+            if not line:
+                return None
+            parts = line.decode("latin-1").split()
+            if len(parts) != 3:
+                raise RequestError(
+                    HTTPStatus.BAD_REQUEST, "Некорректная строка запроса"
+                )
+            method, target, _ = parts
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                if len(headers) >= MAX_HEADERS:
+                    raise RequestError(
+                        HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                        "Слишком много заголовков",
+                    )
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Слишком длинная строка запроса")
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise RequestError(
+                HTTPStatus.LENGTH_REQUIRED, "Нужен заголовок Content-Length"
+            )
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Некорректный Content-Length")
+        if length < 0:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "Некорректный Content-Length")
+        if length > self.max_body:
+            raise RequestError(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                f"Тело запроса больше {self.max_body} байт",
+            )
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), urlsplit(target).path, headers, body
+
+    async def respond(self, writer, method, path, body, keep_alive):
+        """Отвечает на запрос и возвращает код ответа."""
+        if path in ("/metrics", "/health"):
+            if method != "GET":
+                return await self.send_error(
+                    writer, HTTPStatus.METHOD_NOT_ALLOWED, "Нужен GET", keep_alive
+                )
+            payload = self.snapshot() if path == "/metrics" else {"status": "ok"}
+            return await self.send_json(writer, HTTPStatus.OK, payload, keep_alive)
+        if path not in ENDPOINTS:
+            return await self.send_error(
+                writer, HTTPStatus.NOT_FOUND, f"Неизвестный путь: {path}", keep_alive
+            )
+        if method != "POST":
+            return await self.send_error(
+                writer, HTTPStatus.METHOD_NOT_ALLOWED, "Нужен POST", keep_alive
+            )
+        if self.in_flight >= self.workers + self.queue_limit:
+            return await self.send_error(
+                writer,
+                HTTPStatus.SERVICE_UNAVAILABLE,
+                "Очередь заполнена, повторите позже",
+                keep_alive,
+                {"Retry-After": "1"},
+            )
+
+        executor = self.executor
+        self.in_flight += 1
+        self.peak_queue = max(self.peak_queue, self.queue_depth)
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                executor, run_job, path, body, self.directory
+            )
+        except ValueError as e:
+            return await self.send_error(
+                writer, HTTPStatus.BAD_REQUEST, str(e), keep_alive
+            )
+        except BrokenProcessPool as e:
+            # Упавший процесс ломает весь пул: пересоздаем его (один раз на
+            # все задачи сломанного пула), текущий запрос получает 500.
+            if self.executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = ProcessPoolExecutor(max_workers=self.workers)
+            return await self.send_error(
+                writer, HTTPStatus.INTERNAL_SERVER_ERROR, str(e), keep_alive
+            )
+        except Exception as e:
+            return await self.send_error(
+                writer,
+                HTTPStatus.INTERNAL_SERVER_ERROR,
+                f"{type(e).__name__}: {e}",
+                keep_alive,
+            )
+        finally:
+            self.in_flight -= 1
+
+        try:
+            await self.send_file(writer, result, keep_alive)
+        finally:
+            os.remove(result)
+        return HTTPStatus.OK
+
+    @staticmethod
+    def _head(status, headers, keep_alive):
+        status = HTTPStatus(status)
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        lines.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    async def send_json(self, writer, status, payload, keep_alive, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {
+            "Content-Type": "application/json; charset=utf-8",
+            "Content-Length": len(body),
+            **(headers or {}),
+        }
+        writer.write(self._head(status, headers, keep_alive) + body)
+        await writer.drain()
+        return status
+
+    async def send_error(self, writer, status, message, keep_alive, headers=None):
+        return await self.send_json(
+            writer, status, {"error": message}, keep_alive, headers
+        )
+
+    async def send_file(self, writer, path, keep_alive):
+        """Отдает файл результата порциями по STREAM_CHUNK (chunked)."""
+        headers = {
+            "Content-Type": "application/x-ndjson; charset=utf-8",
+            "Transfer-Encoding": "chunked",
+        }
+        writer.write(self._head(HTTPStatus.OK, headers, keep_alive))
+        with open(path, "rb") as file:
+            while True:
+                chunk = file.read(STREAM_CHUNK)
+                if not chunk:
+                    break
+                writer.write(b"%x\r\n%b\r\n" % (len(chunk), chunk))
+                await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def serve(service, port=DEFAULT_PORT, ready=None):
+    """Запускает сервис на HOST:port и обслуживает запросы до отмены.
+
+    SIGTERM завершает сервис так же, как отмена: пул процессов
+    останавливается, временные файлы удаляются.
+    """
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    service.open()
+    try:
+        server = await asyncio.start_server(service.handle, HOST, port)
+        async with server:
+            if ready is not None:
+                ready(server.sockets[0].getsockname()[1])
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+def run_service(port=DEFAULT_PORT, workers=None, queue_limit=None, log=sys.stderr):
+    """Запускает сервис в текущем потоке до Ctrl+C или SIGTERM."""
+    service = AnalysisService(workers, queue_limit)
+
+    def ready(port):
+        if log is not None:
+            print(
+                f"Сервис анализа: http://{HOST}:{port} "
+                f"(процессов: {service.workers}, очередь: {service.queue_limit})",
+                file=log,
+            )
+
+    try:
+        asyncio.run(serve(service, port, ready))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
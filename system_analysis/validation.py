@@ -0,0 +1,155 @@
+import numpy as np
+
+REPORT_LIMIT = 20
+
+
+def column_message(column, start_count, end_count):
+    """Описание столбца, в котором не одна 1 и не одна -1 (номер столбца с нуля)."""
+    return (
+        f"В столбце {column+1} должна быть одна 1 и одна -1. "
+        f"Найдено: 1 -> {start_count}, -1 -> {end_count}."
+    )
+
+
+class ValidationReport:
+    """Все нарушения, найденные при проверке матрицы инциденций.
+
+    Нарушения хранятся массивами по видам (номера с нуля):
+
+    - invalid_cells — строки, столбцы и значения ячеек вне алфавита 0/1/-1;
+    - bad_columns — столбцы, где не ровно одна 1 и одна -1, с числом
+      найденных 1 и -1;
+    - duplicates — столбцы, повторяющие дугу более раннего столбца, и
+      номера этих более ранних столбцов.
+
+    Текст строится только для первых нарушений (см. format).
+    """
+
+    def __init__(self, invalid_cells, bad_columns, duplicates, arcs):
+        self.invalid_cells = invalid_cells
+        self.bad_columns = bad_columns
+        self.duplicates = duplicates
+        self.arcs = arcs
+
+    @property
+    def count(self):
+        return sum(
+            len(kind[0])
+            for kind in (self.invalid_cells, self.bad_columns, self.duplicates)
+        )
+
+    @property
+    def valid(self):
+        return self.count == 0
+
+    def messages(self, limit=None):
+        """Описания нарушений по возрастанию номера столбца (первые limit)."""
+        rows, columns, values = (kind[:limit] for kind in self.invalid_cells)
+        entries = [
+            (
+                column,
+                0,
+                f"Недопустимое значение {value} в столбце {column+1}, вершина {row+1}",
+            )
+            for row, column, value in zip(
+                rows.tolist(), columns.tolist(), values.tolist()
+            )
+        ]
+        columns, start_counts, end_counts = (kind[:limit] for kind in self.bad_columns)
+        entries += [
+            (column, 1, column_message(column, start_count, end_count))
+            for column, start_count, end_count in zip(
+                columns.tolist(), start_counts.tolist(), end_counts.tolist()
+            )
+        ]
+        sources, targets = self.arcs
+        columns, originals = (kind[:limit] for kind in self.duplicates)
+        entries += [
+            (
+                column,
+                2,
+                f"Ребро между вершинами {sources[column]+1} и {targets[column]+1} "
+                f"в столбце {column+1} уже есть в столбце {original+1}",
+            )
+            for column, original in zip(columns.tolist(), originals.tolist())
+        ]
+        entries.sort()
+        return [message for _, _, message in entries[:limit]]
+
+    def format(self, limit=REPORT_LIMIT):
+        """Текстовый отчет: число нарушений и описания первых limit из них."""
+        if self.valid:
+            return "Нарушений нет.\n"
+        text = f"Найдено нарушений: {self.count}\n"
+        text += "".join(message + "\n" for message in self.messages(limit))
+        if self.count > limit:
+            text += f"... и еще {self.count - limit}\n"
+        return text
+
+    def check(self):
+        """Вызывает ValueError с отчетом, если нарушения есть."""
+        if not self.valid:
+            raise ValueError(self.format().rstrip("\n"))
+
+
+def _nonzero_cells(matrix):
+    """Плоские номера ненулевых ячеек по возрастанию.
+
+    Матрица инциденций почти вся из нулей, поэтому буфер сначала
+    просматривается восьмибайтными словами и поэлементно проверяются
+    только ненулевые слова — это в разы быстрее np.nonzero.
+    """
+    flat = np.ascontiguousarray(matrix).reshape(-1)
+    data = flat.view(np.uint8)
+    whole = len(data) // 8 * 8
+    words = np.flatnonzero(data[:whole].view(np.uint64))
+    candidates = (words[:, None] * 8 + np.arange(8)).ravel() // flat.itemsize
+    if flat.itemsize > 1:
+        candidates = candidates[np.diff(candidates, prepend=-1) != 0]
+    candidates = np.concatenate(
+        (candidates, np.arange(whole // flat.itemsize, len(flat)))
+    )
+    return candidates[flat[candidates] != 0]
+
+
+def validate_incidence(matrix, unique=True):
+    """Проверяет матрицу инциденций целиком операциями над массивами.
+
+    Проверяются алфавит 0/1/-1, ровно одна 1 и одна -1 в каждом столбце и,
+    если unique, повторы дуг. Проверка не останавливается на первой ошибке:
+    возвращается ValidationReport со всеми нарушениями. Петли матрица
+    инциденций выразить не может — у дуги с началом и концом в одной
+    вершине в столбце была бы одна ячейка на два значения.
+    """
+    matrix = np.asarray(matrix)
+    m = len(matrix)
+    n = matrix.shape[1] if matrix.ndim == 2 else 0
+    rows, columns = np.divmod(_nonzero_cells(matrix), max(n, 1))
+    values = matrix[rows, columns]
+    is_start = values == 1
+    is_end = values == -1
+
+    invalid = np.flatnonzero(~(is_start | is_end))
+    invalid = invalid[np.lexsort((rows[invalid], columns[invalid]))]
+    invalid_cells = (rows[invalid], columns[invalid], values[invalid])
+
+    start_counts = np.bincount(columns[is_start], minlength=n)
+    end_counts = np.bincount(columns[is_end], minlength=n)
+    bad = np.flatnonzero((start_counts != 1) | (end_counts != 1))
+    bad_columns = (bad, start_counts[bad], end_counts[bad])
+
+    # np.nonzero идет по строкам, поэтому при записи в обратном порядке
+    # в столбце остается вершина с наименьшим номером.
+    sources = np.zeros(n, dtype=np.int64)
+    targets = np.zeros(n, dtype=np.int64)
+    sources[columns[is_start][::-1]] = rows[is_start][::-1]
+    targets[columns[is_end][::-1]] = rows[is_end][::-1]
+
+    duplicates = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    if unique:
+        good = np.flatnonzero((start_counts == 1) & (end_counts == 1))
+        keys = sources[good] * m + targets[good]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        repeated = np.flatnonzero(first[inverse] != np.arange(len(good)))
+        duplicates = (good[repeated], good[first[inverse[repeated]]])
+    return ValidationReport(invalid_cells, bad_columns, duplicates, (sources, targets))
@@ -0,0 +1,30 @@
+import importlib
+import threading
+
+PLOTTING_MODULES = (
+    "networkx",
+    "matplotlib.figure",
+    "matplotlib.backends.backend_agg",
+)
+
+
+def warm_up(modules=PLOTTING_MODULES):
+    """Импортирует тяжелые модули в фоновом потоке.
+
+    Окна лабораторных не импортируют NetworkX и matplotlib при запуске —
+    они нужны только для анализа и рисунков. Вызов после показа окна
+    загружает их, пока пользователь вводит данные, и первый анализ не
+    ждет импорта. Отсутствующий модуль пропускается: ошибка появится там,
+    где он действительно нужен.
+    """
+
+    def run():
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+
+    thread = threading.Thread(target=run, name="warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,81 @@
+import os
+import random
+import sys
+
+import networkx as nx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from system_analysis import SparseGraph  # noqa: E402
+
+
+def arc_list(graph):
+    """Дуги графа списком пар номеров с нуля."""
+    sources, targets = graph.arcs()
+    return list(zip(sources.tolist(), targets.tolist()))
+
+
+def to_networkx(graph):
+    """Тот же граф в NetworkX — эталон для сравнения."""
+    reference = nx.DiGraph()
+    reference.add_nodes_from(range(graph.vertex_count))
+    reference.add_edges_from(arc_list(graph))
+    return reference
+
+
+def make_graph(vertex_count, arc_count, seed, acyclic=False):
+    """Случайный граф без петель и кратных дуг.
+
+    В ациклическом графе дуги идут от меньшей вершины к большей в
+    случайной перестановке вершин.
+    """
+    rng = random.Random(seed)
+    order = list(range(vertex_count))
+    rng.shuffle(order)
+    arcs = set()
+    for _ in range(arc_count):
+        source, target = rng.randrange(vertex_count), rng.randrange(vertex_count)
+        if source == target:
+            continue
+        if acyclic and source > target:
+            source, target = target, source
+        arcs.add((order[source], order[target]) if acyclic else (source, target))
+    arcs = sorted(arcs)
+    return SparseGraph.from_arcs(
+        vertex_count, [arc[0] for arc in arcs], [arc[1] for arc in arcs]
+    )
+
+
+def graph_cases(count, acyclic=False):
+    """Параметры случайных графов: от пустых до плотных и от деревьев до сетей."""
+    rng = random.Random(count)
+    cases = [(1, 0), (2, 1), (5, 0)]
+    while len(cases) < count:
+        vertex_count = rng.randint(2, 60)
+        cases.append((vertex_count, rng.randint(0, 3 * vertex_count)))
+    return [
+        pytest.param(
+            (vertex_count, arc_count, seed, acyclic),
+            id=f"{seed}-{vertex_count}-{arc_count}",
+        )
+        for seed, (vertex_count, arc_count) in enumerate(cases)
+    ]
+
+
+@pytest.fixture(params=graph_cases(40))
+def random_graph(request):
+    return make_graph(*request.param)
+
+
+@pytest.fixture(params=graph_cases(40, acyclic=True))
+def random_dag(request):
+    return make_graph(*request.param)
+
+
+@pytest.fixture(scope="session")
+def qt_app():
+    """Приложение Qt без экрана (платформа offscreen) для моделей и потоков."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    widgets = pytest.importorskip("PyQt5.QtWidgets")
+    return widgets.QApplication.instance() or widgets.QApplication([])
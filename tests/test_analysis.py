@@ -0,0 +1,148 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+from conftest import arc_list
+
+from system_analysis import (
+    SparseGraph,
+    convert_incidence,
+    decompose,
+    format_decomposition,
+    level_order,
+)
+from system_analysis.generators import incidence_matrix
+
+
+def baseline_convert_incidence(B):
+    """convert_incidence из исходной ЛР №1."""
+    m = len(B)
+    n = len(B[0]) if m > 0 else 0
+    A = [[0] * m for _ in range(m)]
+    G_plus = {i: set() for i in range(m)}
+    existing_edges = set()
+    for edge_idx in range(n):
+        start = None
+        end = None
+        for vertex in range(m):
+            val = B[vertex][edge_idx]
+            if val == 1:
+                if start is not None:
+                    raise ValueError(f"В ребре {edge_idx+1} несколько начальных вершин")
+                start = vertex
+            elif val == -1:
+                if end is not None:
+                    raise ValueError(f"В ребре {edge_idx+1} несколько конечных вершин")
+                end = vertex
+            elif val != 0:
+                raise ValueError(
+                    f"Недопустимое значение {val} в ребре {edge_idx+1}, вершина {vertex+1}"
+                )
+        if start is None:
+            raise ValueError(f"В ребре {edge_idx+1} нет начальной вершины (1)")
+        if end is None:
+            raise ValueError(f"В ребре {edge_idx+1} нет конечной вершины (-1)")
+        if (start, end) in existing_edges:
+            raise ValueError(
+                f"Ребро между вершинами {start+1} и {end+1} уже существует"
+            )
+        existing_edges.add((start, end))
+        A[start][end] += 1
+        G_plus[start].add(end + 1)
+    G_plus = {k: sorted(list(v)) for k, v in G_plus.items()}
+    return A, G_plus
+
+
+def baseline_levels(graph):
+    """Уровни по циклу while из исходной ЛР №2."""
+    left_incidence = {i + 1: [] for i in range(graph.vertex_count)}
+    for source, target in arc_list(graph):
+        left_incidence[target + 1].append(source + 1)
+    levels = []
+    while len(left_incidence) != 0:
+        level = [key for key, value in left_incidence.items() if not value]
+        for vertex in level:
+            del left_incidence[vertex]
+            for key in left_incidence.keys():
+                if vertex in left_incidence[key]:
+                    left_incidence[key].remove(vertex)
+        levels.append(level)
+    return levels
+
+
+def baseline_decompose(graph):
+    """Подсистемы, их дуги и связи между ними, как в исходной ЛР №3."""
+    n = graph.vertex_count
+    matrix = graph.to_dense()
+    all_edges = [
+        (i + 1, j + 1) for i in range(n) for j in range(n) if matrix[i][j] == 1
+    ]
+    G_original = nx.DiGraph()
+    G_original.add_edges_from(all_edges)
+    subsystems = list(nx.strongly_connected_components(G_original))
+    used_nodes = set().union(*subsystems)
+    for node in sorted(set(range(1, n + 1)) - used_nodes):
+        subsystems.append({node})
+    subsystem_edges = [
+        [edge for edge in all_edges if edge[0] in subsystem and edge[1] in subsystem]
+        for subsystem in subsystems
+    ]
+    subsystem_arcs = []
+    for i in range(len(subsystems)):
+        for j in range(len(subsystems)):
+            if i != j and any(
+                G_original.has_edge(u, v) for u in subsystems[i] for v in subsystems[j]
+            ):
+                subsystem_arcs.append((i + 1, j + 1))
+    return subsystems, subsystem_edges, subsystem_arcs
+
+
+def test_convert_matches_baseline(random_graph):
+    matrix = incidence_matrix(random_graph)
+    graph, G_plus = convert_incidence(matrix)
+    A, expected = baseline_convert_incidence(matrix.tolist())
+    assert graph.to_dense().tolist() == A
+    assert G_plus == expected
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_convert_errors_match_baseline(seed):
+    rng = random.Random(seed)
+    matrix = incidence_matrix(
+        SparseGraph.from_arcs(6, [0, 1, 2, 3, 4, 5], [1, 2, 3, 4, 5, 0])
+    ).astype(np.int64)
+    for _ in range(rng.randint(1, 3)):
+        matrix[rng.randrange(6), rng.randrange(6)] = rng.choice((-1, 0, 1, 2))
+    if rng.random() < 0.3:
+        matrix[:, rng.randrange(6)] = matrix[:, rng.randrange(6)]
+    try:
+        expected = baseline_convert_incidence(matrix.tolist())
+    except ValueError as error:
+        with pytest.raises(ValueError) as raised:
+            convert_incidence(matrix)
+        assert str(raised.value) == str(error)
+    else:
+        graph, G_plus = convert_incidence(matrix)
+        assert graph.to_dense().tolist() == expected[0]
+
+
+def test_levels_match_baseline(random_dag):
+    levels, swap_vertex = level_order(random_dag)
+    assert levels == baseline_levels(random_dag)
+    assert swap_vertex == [vertex - 1 for level in levels for vertex in level]
+
+
+def test_levels_reject_cycles():
+    graph = SparseGraph.from_arcs(4, [0, 1, 2, 2], [1, 2, 1, 3])
+    with pytest.raises(ValueError, match="контур"):
+        level_order(graph)
+
+
+def test_decompose_matches_baseline(random_graph):
+    decomposition = decompose(random_graph)
+    subsystems, subsystem_edges, subsystem_arcs = baseline_decompose(random_graph)
+    assert decomposition.subsystems == subsystems
+    assert decomposition.subsystem_edges == subsystem_edges
+    assert sorted(decomposition.subsystem_arcs) == subsystem_arcs
+    assert format_decomposition(decomposition).startswith("Подсистемы")
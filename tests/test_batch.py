@@ -0,0 +1,74 @@
+import json
+import os
+import shutil
+
+from conftest import make_graph
+
+from system_analysis import (
+    decompose,
+    level_order,
+    load_adjacency,
+    load_incidence_graph,
+    save_graph,
+)
+from system_analysis.batch import SUMMARY_NAME, detect_format, run_batch
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_inputs(directory):
+    os.makedirs(directory / "lab2")
+    shutil.copy(os.path.join(ROOT, "system-analysis-lab1", "graph.txt"), directory)
+    shutil.copy(
+        os.path.join(ROOT, "system-analysis-lab2", "matrix.txt"), directory / "lab2"
+    )
+    shutil.copy(
+        os.path.join(ROOT, "system-analysis-lab3", "matrix.txt"), directory / "lab3.txt"
+    )
+    (directory / "broken.txt").write_text("2 1\n1\n", encoding="utf-8")
+    save_graph(make_graph(20, 30, seed=1, acyclic=True), directory / "graph.sag")
+
+
+def test_detect_format(tmp_path):
+    make_inputs(tmp_path)
+    assert detect_format(tmp_path / "graph.txt") == "incidence"
+    assert detect_format(tmp_path / "lab2" / "matrix.txt") == "incidence"
+    assert detect_format(tmp_path / "lab3.txt") == "adjacency"
+    assert detect_format(tmp_path / "graph.sag") == "binary"
+
+
+def test_batch_results_and_summary(tmp_path):
+    inputs = tmp_path / "inputs"
+    output = tmp_path / "results"
+    make_inputs(inputs)
+    summary = run_batch([str(inputs), str(inputs / "*.sag")], str(output), workers=2)
+    assert summary["files"] == 5
+    statuses = {
+        os.path.relpath(record["input"], inputs): record["status"]
+        for record in summary["results"]
+    }
+    assert statuses == {
+        "broken.txt": "failed",
+        "graph.sag": "ok",
+        "graph.txt": "ok",
+        "lab2/matrix.txt": "ok",
+        "lab3.txt": "partial",
+    }
+    with open(output / SUMMARY_NAME, encoding="utf-8") as file:
+        assert json.load(file)["failed"] == 1
+
+    with open(output / "lab2__matrix.txt.json", encoding="utf-8") as file:
+        result = json.load(file)
+    graph = load_incidence_graph(inputs / "lab2" / "matrix.txt", unique=False)
+    assert result["levels"] == level_order(graph)[0]
+
+    with open(output / "lab3.txt.json", encoding="utf-8") as file:
+        result = json.load(file)
+    decomposition = decompose(load_adjacency(inputs / "lab3.txt"))
+    assert [subsystem["vertices"] for subsystem in result["subsystems"]] == [
+        sorted(subsystem) for subsystem in decomposition.subsystems
+    ]
+    assert result["subsystem_arcs"] == [
+        list(arc) for arc in decomposition.subsystem_arcs
+    ]
+    assert result["errors"][0]["stage"] == "levels"
@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+from conftest import arc_list
+
+from system_analysis import SparseGraph, is_binary_graph, load_graph, save_graph
+
+
+def test_roundtrip_is_memory_mapped(random_graph, tmp_path):
+    path = tmp_path / "graph.sag"
+    save_graph(random_graph, path)
+    assert is_binary_graph(path)
+    graph = load_graph(path)
+    assert graph.vertex_count == random_graph.vertex_count
+    assert arc_list(graph) == arc_list(random_graph)
+    assert graph.content_hash() == random_graph.content_hash()
+    assert isinstance(graph.offsets, np.memmap)
+
+
+def test_rejects_text_and_truncated_files(tmp_path):
+    text = tmp_path / "matrix.txt"
+    text.write_text("0 1\n1 0\n", encoding="utf-8")
+    assert not is_binary_graph(text)
+    with pytest.raises(ValueError, match="не является"):
+        load_graph(text)
+
+    path = tmp_path / "graph.sag"
+    save_graph(SparseGraph.from_arcs(3, [0, 1], [1, 2]), path)
+    path.write_bytes(path.read_bytes()[:-4])
+    with pytest.raises(ValueError, match="неверный размер"):
+        load_graph(path)
@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+from conftest import make_graph
+
+from system_analysis import cache
+from system_analysis.cache import ANALYSIS_DIR, AnalysisCache, disk_directory
+
+
+def counted(value):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value
+
+    return compute, calls
+
+
+def test_memory_hits_and_evictions():
+    graph = make_graph(10, 20, seed=1)
+    store = AnalysisCache(max_bytes=3000)
+    compute, calls = counted(np.zeros(200))
+    assert store.get(graph, "levels", compute) is store.get(graph, "levels", compute)
+    assert len(calls) == 1
+    store.get(graph, "other", lambda: np.ones(200))
+    assert store.stats()["evictions"] == 1
+    store.get(graph, "levels", compute)
+    assert len(calls) == 2
+    store.get(graph, "huge", lambda: np.zeros(10_000))
+    assert store.stats()["entries"] == 1
+
+
+def test_disk_entries_survive_restart(tmp_path):
+    graph = make_graph(10, 20, seed=2)
+    AnalysisCache(directory=str(tmp_path)).get(graph, ("decomposition", 1), lambda: [1])
+    (name,) = os.listdir(tmp_path)
+    assert name.startswith(cache.code_salt() + "-" + graph.content_hash())
+
+    compute, calls = counted([2])
+    restarted = AnalysisCache(directory=str(tmp_path))
+    assert restarted.get(graph, ("decomposition", 1), compute) == [1]
+    assert not calls
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_corrupt_entry_is_recomputed(tmp_path):
+    graph = make_graph(10, 20, seed=3)
+    AnalysisCache(directory=str(tmp_path)).get(graph, "levels", lambda: [1])
+    (path,) = tmp_path.iterdir()
+    path.write_bytes(b"not a pickle")
+    compute, calls = counted([2])
+    assert AnalysisCache(directory=str(tmp_path)).get(graph, "levels", compute) == [2]
+    assert calls
+    assert AnalysisCache(directory=str(tmp_path)).get(graph, "levels", None) == [2]
+
+
+def test_other_code_version_is_not_read(tmp_path, monkeypatch):
+    graph = make_graph(10, 20, seed=4)
+    AnalysisCache(directory=str(tmp_path)).get(graph, "levels", lambda: [1])
+    monkeypatch.setattr(cache, "_code_salt", "0" * 16)
+    compute, calls = counted([2])
+    assert AnalysisCache(directory=str(tmp_path)).get(graph, "levels", compute) == [2]
+    assert calls
+
+
+def test_disk_limit_removes_oldest(tmp_path):
+    store = AnalysisCache(directory=str(tmp_path), max_disk_bytes=3000)
+    for seed in range(5):
+        store.get(make_graph(10, 20, seed=seed), "levels", lambda: np.zeros(100))
+    sizes = [path.stat().st_size for path in tmp_path.iterdir()]
+    assert sum(sizes) <= 3000 and len(sizes) < 5
+
+
+def test_disk_directory_setting(monkeypatch):
+    monkeypatch.delenv(cache.CACHE_DIR_ENV, raising=False)
+    assert disk_directory() is None
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, "1")
+    assert disk_directory() == ANALYSIS_DIR
+    monkeypatch.setenv(cache.CACHE_DIR_ENV, "~/results")
+    assert disk_directory() == os.path.expanduser("~/results")
+    assert disk_directory("") is None
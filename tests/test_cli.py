@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+from system_analysis import (
+    decompose,
+    format_decomposition,
+    format_levels,
+    level_order,
+    load_adjacency,
+    load_incidence_graph,
+)
+from system_analysis.cli import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAB1_GRAPH = os.path.join(ROOT, "system-analysis-lab1", "graph.txt")
+LAB2_MATRIX = os.path.join(ROOT, "system-analysis-lab2", "matrix.txt")
+LAB3_MATRIX = os.path.join(ROOT, "system-analysis-lab3", "matrix.txt")
+
+
+def test_commands_print_lab_results(capsys):
+    assert main(["convert", LAB1_GRAPH]) == 0
+    assert "Множество правых инциденций G+:" in capsys.readouterr().out
+
+    assert main(["levels", LAB2_MATRIX]) == 0
+    levels, _ = level_order(load_incidence_graph(LAB2_MATRIX, unique=False))
+    assert format_levels(levels) in capsys.readouterr().out
+
+    assert main(["decompose", LAB3_MATRIX]) == 0
+    expected = format_decomposition(decompose(load_adjacency(LAB3_MATRIX)))
+    assert capsys.readouterr().out == expected
+
+
+def test_output_file_and_errors(tmp_path, capsys):
+    output = tmp_path / "result.txt"
+    assert main(["cycles", LAB3_MATRIX, "-o", str(output)]) == 0
+    assert output.read_text(encoding="utf-8").startswith("Компонент с циклами")
+
+    assert main(["levels", LAB3_MATRIX]) == 1
+    assert capsys.readouterr().err.startswith("Ошибка:")
+    assert main(["decompose", str(tmp_path / "missing.txt")]) == 1
+
+
+def test_pack_and_unpack(tmp_path):
+    packed = str(tmp_path / "graph.sag")
+    unpacked = str(tmp_path / "matrix.txt")
+    assert main(["pack", "-f", "adjacency", LAB3_MATRIX, packed]) == 0
+    assert main(["unpack", "-f", "adjacency", packed, unpacked]) == 0
+    assert load_adjacency(unpacked).content_hash() == (
+        load_adjacency(LAB3_MATRIX).content_hash()
+    )
+
+
+def test_import_does_not_load_pool_modules():
+    code = (
+        "import sys, system_analysis.cli\n"
+        "heavy = ('batch', 'service', 'parallel')\n"
+        "print([name for name in heavy if 'system_analysis.' + name in sys.modules])\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,61 @@
+import networkx as nx
+import numpy as np
+from conftest import arc_list, make_graph, to_networkx
+
+from system_analysis import Reachability, closure_bits
+from system_analysis.closure import bit_indices
+
+
+def test_closure_bits_match_networkx(random_dag):
+    rows, keep = closure_bits(random_dag)
+    reference = to_networkx(random_dag)
+    for vertex in range(random_dag.vertex_count):
+        assert bit_indices(rows[vertex]).tolist() == sorted(
+            nx.descendants(reference, vertex)
+        )
+    kept = {arc for arc, flag in zip(arc_list(random_dag), keep.tolist()) if flag}
+    assert kept == set(nx.transitive_reduction(reference).edges)
+
+
+def test_reachability_matches_networkx(random_graph):
+    reachability = Reachability(random_graph)
+    reference = to_networkx(random_graph)
+    for source in range(random_graph.vertex_count):
+        reached = nx.descendants(reference, source) | {source}
+        for target in range(random_graph.vertex_count):
+            assert reachability.reaches(source, target) == (target in reached)
+
+
+def test_component_queries_match_condensation(random_graph):
+    reachability = Reachability(random_graph)
+    reference = nx.DiGraph()
+    reference.add_nodes_from(range(reachability.count))
+    reference.add_edges_from(arc_list(reachability.condensed))
+    assert nx.is_directed_acyclic_graph(reference)
+    for component in range(reachability.count):
+        assert reachability.descendants(component).tolist() == sorted(
+            nx.descendants(reference, component)
+        )
+        assert reachability.ancestors(component).tolist() == sorted(
+            nx.ancestors(reference, component)
+        )
+    assert set(arc_list(reachability.reduction)) == set(
+        nx.transitive_reduction(reference).edges
+    )
+
+
+def test_wide_rows_and_given_components():
+    # Больше 64 компонент: строка замыкания занимает несколько слов uint64.
+    graph = make_graph(300, 300, seed=5)
+    reachability = Reachability(graph)
+    assert reachability.count > 128
+    assert reachability.rows.shape[1] == (reachability.count + 63) // 64
+    reference = to_networkx(graph)
+    for source in range(0, graph.vertex_count, 7):
+        reached = nx.descendants(reference, source) | {source}
+        assert [
+            reachability.reaches(source, target) for target in range(graph.vertex_count)
+        ] == [target in reached for target in range(graph.vertex_count)]
+
+    again = Reachability(graph, reachability.component, reachability.count)
+    assert np.array_equal(again.rows, reachability.rows)
@@ -0,0 +1,87 @@
+import networkx as nx
+import pytest
+from conftest import arc_list, make_graph, to_networkx
+
+from system_analysis import SparseGraph, cycle_diagnostics, format_cycle_diagnostics
+from system_analysis.generators import planted_scc_graph
+
+
+def without_arcs(graph, removed):
+    removed = set(removed)
+    arcs = [arc for arc in arc_list(graph) if arc not in removed]
+    return SparseGraph.from_arcs(
+        graph.vertex_count, [arc[0] for arc in arcs], [arc[1] for arc in arcs]
+    )
+
+
+def check_diagnostics(graph, diagnostics):
+    reference = to_networkx(graph)
+    expected = sorted(
+        sorted(component)
+        for component in nx.strongly_connected_components(reference)
+        if len(component) > 1
+    )
+    assert diagnostics.components == expected
+    assert diagnostics.acyclic == nx.is_directed_acyclic_graph(reference)
+
+    assert len(diagnostics.cycles) == min(len(expected), diagnostics.limit)
+    for component, cycle in zip(diagnostics.components, diagnostics.cycles):
+        assert cycle[0] == component[0]
+        assert len(set(cycle)) == len(cycle)
+        assert set(cycle) <= set(component)
+        for source, target in zip(cycle, cycle[1:] + cycle[:1]):
+            assert reference.has_edge(source, target)
+        shortest = min(
+            nx.shortest_path_length(reference, cycle[0], source) + 1
+            for source in reference.predecessors(cycle[0])
+            if nx.has_path(reference, cycle[0], source)
+        )
+        assert len(cycle) == shortest
+
+    feedback = diagnostics.feedback_arcs
+    assert len(set(feedback)) == len(feedback)
+    assert set(feedback) <= set(arc_list(graph))
+    assert nx.is_directed_acyclic_graph(to_networkx(without_arcs(graph, feedback)))
+    return feedback
+
+
+def test_diagnostics_match_networkx(random_graph):
+    diagnostics = cycle_diagnostics(random_graph, limit=5)
+    feedback = check_diagnostics(random_graph, diagnostics)
+    # Множество минимально по включению: возврат любой дуги дает цикл.
+    for arc in feedback:
+        rest = without_arcs(random_graph, [other for other in feedback if other != arc])
+        assert not nx.is_directed_acyclic_graph(to_networkx(rest))
+
+
+def test_acyclic_graph_has_no_diagnostics(random_dag):
+    diagnostics = cycle_diagnostics(random_dag)
+    assert diagnostics.acyclic
+    assert diagnostics.components == diagnostics.cycles == []
+    assert diagnostics.feedback_arcs == []
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_planted_components(seed):
+    graph, _ = planted_scc_graph(3000, 60, 9000, seed=seed)
+    diagnostics = cycle_diagnostics(graph, limit=10)
+    check_diagnostics(graph, diagnostics)
+    assert len(diagnostics.cycles) == 10
+
+
+def test_limit_bounds_cycles_and_report():
+    graph = make_graph(200, 600, seed=3)
+    stages = []
+    diagnostics = cycle_diagnostics(
+        graph, limit=1, progress=lambda percent, stage: stages.append(percent)
+    )
+    assert len(diagnostics.cycles) == 1
+    assert stages[0] == 0 and stages[-1] == 100
+    report = format_cycle_diagnostics(diagnostics)
+    assert report.startswith(f"Компонент с циклами: {len(diagnostics.components)}\n")
+    cycle = diagnostics.cycles[0]
+    assert f"Цикл: {' -> '.join(str(v + 1) for v in cycle + cycle[:1])}\n" in report
+    assert (
+        format_cycle_diagnostics(cycle_diagnostics(SparseGraph.from_arcs(1, [], [])))
+        == "Циклов нет.\n"
+    )
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+
+pytest.importorskip("matplotlib")
+
+from system_analysis import decompose  # noqa: E402
+from system_analysis.cache import AnalysisCache  # noqa: E402
+from system_analysis.drawing import (  # noqa: E402
+    LABEL_LIMIT,
+    draw_original_graph,
+    draw_subsystem_graph,
+    render_figure,
+)
+from system_analysis.layout import grid_layout  # noqa: E402
+
+
+@pytest.mark.parametrize("size", [(400, 300), (300, 400)])
+def test_render_fits_the_window(size, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    graph = make_graph(12, 20, seed=1)
+    for figure in (
+        draw_original_graph(graph),
+        draw_subsystem_graph(decompose(graph)),
+    ):
+        image = render_figure(figure, *size)
+        assert image.dtype == np.uint8 and image.shape[2] == 4
+        assert image.shape[1] <= size[0] and image.shape[0] <= size[1]
+        assert max(image.shape[:2]) >= min(size) - 2
+        assert (image[..., :3] < 128).any()
+    # Рисунки строятся в памяти, файлы PNG больше не пишутся.
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_large_graph_is_drawn_without_labels():
+    graph = make_graph(LABEL_LIMIT + 100, 2 * LABEL_LIMIT, seed=2)
+    figure = draw_original_graph(graph, grid_layout(graph))
+    (ax,) = figure.axes
+    assert not ax.texts
+    assert len(ax.collections[0].get_segments()) == graph.arc_count
+
+
+def test_renders_are_cached():
+    graph = make_graph(12, 20, seed=3)
+    cache = AnalysisCache()
+    first = cache.render(
+        graph, "original", lambda: draw_original_graph(graph), 200, 150
+    )
+    again = cache.render(graph, "original", None, 200, 150)
+    assert again is first
+    assert cache.stats()["hits"] == 1
+
+
+def test_image_pixmap(qt_app):
+    from system_analysis.qtimages import image_pixmap
+
+    image = render_figure(draw_original_graph(make_graph(5, 6, seed=4)), 200, 150)
+    pixmap = image_pixmap(image, 2.0)
+    assert (pixmap.width(), pixmap.height()) == (image.shape[1], image.shape[0])
+    assert pixmap.devicePixelRatio() == 2.0
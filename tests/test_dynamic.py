@@ -0,0 +1,202 @@
+import random
+
+import numpy as np
+import pytest
+from conftest import arc_list, make_graph
+
+from system_analysis import (
+    AdjacencyTracker,
+    DynamicGraph,
+    IncidenceTracker,
+    SparseGraph,
+    level_order,
+    parse_adjacency,
+)
+from system_analysis.generators import incidence_matrix
+from system_analysis.levels import topological_levels
+from system_analysis.scc import condensation, strong_components
+
+
+def partition(component):
+    groups = {}
+    for vertex, number in enumerate(np.asarray(component).tolist()):
+        groups.setdefault(number, set()).add(vertex)
+    return {frozenset(group) for group in groups.values()}
+
+
+def check_state(dynamic):
+    """Сверяет поддерживаемые компоненты, порядок и уровни с полным расчетом."""
+    graph = dynamic.to_graph()
+    count, component = dynamic.strong_components()
+    expected_count, expected = strong_components(graph)
+    assert count == expected_count
+    assert partition(component) == partition(expected)
+    for source, target in arc_list(graph):
+        assert component[source] >= component[target]
+    assert dynamic.acyclic == (count == graph.vertex_count)
+    if dynamic.depth is None:
+        return
+
+    levels = topological_levels(condensation(graph, component, count))
+    level_of = np.zeros(count, dtype=np.int64)
+    for level, components in enumerate(levels):
+        level_of[components] = level
+    depth = dynamic.depth[dynamic.component]
+    assert depth.tolist() == level_of[component].tolist()
+    if dynamic.acyclic:
+        assert dynamic.level_order() == level_order(graph)
+    else:
+        with pytest.raises(ValueError) as expected_error:
+            topological_levels(graph)
+        with pytest.raises(ValueError) as error:
+            dynamic.check_acyclic()
+        assert str(error.value) == str(expected_error.value)
+
+
+def random_edits(dynamic, seed, steps=60):
+    """Случайные добавления (в том числе кратных дуг) и удаления дуг."""
+    rng = random.Random(seed)
+    n = dynamic.vertex_count
+    if n < 2:
+        return
+    for _ in range(steps):
+        arcs = [
+            (source, target)
+            for source in range(n)
+            for target in dynamic.successors(source)
+        ]
+        if arcs and rng.random() < 0.45:
+            dynamic.remove_arc(*rng.choice(arcs))
+        else:
+            source, target = rng.sample(range(n), 2)
+            dynamic.add_arc(source, target)
+        yield
+
+
+def test_edits_match_full_recalculation(random_graph):
+    dynamic = DynamicGraph(random_graph)
+    check_state(dynamic)
+    for _ in random_edits(dynamic, random_graph.vertex_count):
+        check_state(dynamic)
+
+
+def test_edits_of_dag_keep_levels(random_dag):
+    # Дуги добавляются только вперед по топологическому порядку, граф
+    # остается ациклическим.
+    dynamic = DynamicGraph(random_dag)
+    rng = random.Random(random_dag.vertex_count)
+    order = [vertex for level in topological_levels(random_dag) for vertex in level]
+    n = random_dag.vertex_count
+    for _ in range(40 if n > 1 else 0):
+        source, target = sorted(rng.sample(range(n), 2))
+        source, target = order[source], order[target]
+        if dynamic.has_arc(source, target) and rng.random() < 0.5:
+            dynamic.remove_arc(source, target)
+        else:
+            dynamic.add_arc(source, target)
+        assert dynamic.acyclic
+        check_state(dynamic)
+
+
+def test_closing_and_breaking_a_cycle():
+    n = 6
+    dynamic = DynamicGraph(SparseGraph.from_arcs(n, range(n - 1), range(1, n)))
+    assert dynamic.level_order()[0] == [[1], [2], [3], [4], [5], [6]]
+    dynamic.add_arc(4, 1)
+    assert not dynamic.acyclic
+    check_state(dynamic)
+    dynamic.pop_changed_levels()
+    dynamic.remove_arc(2, 3)
+    assert dynamic.acyclic
+    assert dynamic.pop_changed_levels()
+    check_state(dynamic)
+
+
+def test_parallel_arcs_and_errors():
+    dynamic = DynamicGraph(SparseGraph.from_arcs(3, [0, 1], [1, 2]))
+    dynamic.add_arc(0, 1)
+    assert dynamic.multiplicity(0, 1) == 2
+    dynamic.remove_arc(0, 1)
+    assert dynamic.has_arc(0, 1)
+    assert dynamic.arc_count == 2
+    with pytest.raises(ValueError):
+        dynamic.add_arc(2, 2)
+    with pytest.raises(ValueError):
+        dynamic.remove_arc(2, 0)
+    with pytest.raises(ValueError):
+        DynamicGraph(SparseGraph.from_arcs(2, [0], [1]), levels=False).level_order()
+
+
+@pytest.mark.parametrize("components", [False, True])
+def test_reduced_modes_keep_arcs(random_graph, components):
+    dynamic = DynamicGraph(random_graph, components=components, levels=False)
+    for _ in random_edits(dynamic, 1):
+        pass
+    if components:
+        check_state(dynamic)
+    rebuilt = DynamicGraph(dynamic.to_graph())
+    assert arc_list(rebuilt.to_graph()) == arc_list(dynamic.to_graph())
+
+
+def full_parse(matrix):
+    """Граф и ошибка полного разбора матрицы инциденций."""
+    try:
+        return SparseGraph.from_incidence(matrix), None
+    except ValueError as error:
+        return None, str(error)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incidence_tracker_matches_full_parse(seed):
+    rng = random.Random(seed)
+    graph = make_graph(8, 14, seed)
+    matrix = incidence_matrix(graph).astype(np.int64)
+    tracker = IncidenceTracker(matrix)
+    for _ in range(40):
+        row, column = rng.randrange(len(matrix)), rng.randrange(matrix.shape[1])
+        matrix[row, column] = rng.choice((-1, 0, 0, 1, 2))
+        tracker.set_value(row, column, matrix[row, column])
+        expected, error = full_parse(matrix)
+        assert tracker.error() == error
+        arcs = []
+        for values in matrix.T:
+            starts, ends = np.flatnonzero(values == 1), np.flatnonzero(values == -1)
+            if len(starts) == len(ends) == 1 and np.count_nonzero(values) == 2:
+                arcs.append((int(starts[0]), int(ends[0])))
+        arcs.sort()
+        assert sorted(arc_list(tracker.graph.to_graph())) == arcs
+        if expected is not None:
+            assert arc_list(tracker.graph.to_graph()) == arc_list(expected)
+        check_state(tracker.graph)
+
+
+def adjacency_text(lines):
+    return "\n".join(lines)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_adjacency_tracker_matches_full_parse(seed):
+    rng = random.Random(seed)
+    n = 7
+    graph = make_graph(n, 12, seed)
+    lines = [" ".join(map(str, row)) for row in graph.to_dense().tolist()]
+    tracker = AdjacencyTracker(graph)
+    for _ in range(40):
+        row = rng.randrange(n)
+        choice = rng.random()
+        if choice < 0.1:
+            line = "1 x 0"
+        elif choice < 0.2:
+            line = " ".join(["0"] * (n + 1))
+        else:
+            line = " ".join(rng.choice("0001") for _ in range(n))
+        lines[row] = line
+        tracker.update_row(row, line)
+        try:
+            expected = parse_adjacency(adjacency_text(lines))
+        except ValueError:
+            assert tracker.error() is not None
+            continue
+        assert tracker.error() is None
+        assert arc_list(tracker.graph.to_graph()) == arc_list(expected)
+        check_state(tracker.graph)
@@ -0,0 +1,165 @@
+import csv
+import json
+
+import numpy as np
+import pytest
+from conftest import make_graph
+
+from system_analysis import decompose, level_order, right_incidence_sets
+from system_analysis.export import export_graph, with_extension
+
+
+def expected_records(graph):
+    """Записи экспорта, собранные из функций анализа."""
+    records = {
+        ("right_incidence", vertex + 1): targets
+        for vertex, targets in right_incidence_sets(graph).items()
+    }
+    dense = graph.to_dense()
+    for row in range(graph.vertex_count):
+        records["adjacency", row + 1] = (np.flatnonzero(dense[row]) + 1).tolist()
+    try:
+        levels, swap_vertex = level_order(graph)
+    except ValueError:
+        pass
+    else:
+        for level, vertices in enumerate(levels):
+            records["levels", level] = vertices
+        for position, vertex in enumerate(swap_vertex, 1):
+            records["swap_vertex", position] = [vertex + 1]
+    decomposition = decompose(graph)
+    for subsystem, (vertices, edges) in enumerate(
+        zip(decomposition.subsystems, decomposition.subsystem_edges), 1
+    ):
+        records["subsystem_vertex", subsystem] = sorted(vertices)
+        records["subsystem_arc", subsystem] = [list(edge) for edge in edges]
+    for subsystem, sources in decomposition.right_incidence.items():
+        records["subsystem_right_incidence", subsystem] = sorted(sources)
+    return records
+
+
+def jsonl_records(path):
+    records = {}
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            record = json.loads(line)
+            section = record["section"]
+            if section == "right_incidence":
+                records[section, record["vertex"]] = record["targets"]
+            elif section == "adjacency":
+                assert record["vertex"] == record["row"]
+                records[section, record["row"]] = record["columns"]
+            elif section == "levels":
+                records[section, record["level"]] = record["vertices"]
+            elif section == "swap_vertex":
+                records[section, record["position"]] = [record["vertex"]]
+            elif section == "subsystems":
+                records["subsystem_vertex", record["subsystem"]] = record["vertices"]
+                records["subsystem_arc", record["subsystem"]] = record["arcs"]
+            else:
+                records[section, record["subsystem"]] = record["sources"]
+    return records
+
+
+def csv_records(path):
+    records = {}
+    with open(path, encoding="utf-8", newline="") as file:
+        rows = csv.reader(file)
+        assert next(rows) == ["section", "id", "value", "target"]
+        for section, id, value, target in rows:
+            values = records.setdefault((section, int(id)), [])
+            if section == "subsystem_arc":
+                values.append([int(value), int(target)])
+            elif value:
+                values.append(int(value))
+    return records
+
+
+def npz_records(path):
+    records = {}
+    with np.load(path) as arrays:
+
+        def add(section, offsets, values, first=1):
+            values = (arrays[values] + 1).tolist()
+            bounds = arrays[offsets].tolist()
+            for id, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]), first):
+                records[section, id] = values[start:end]
+
+        vertex_count = int(arrays["vertex_count"])
+        add("right_incidence", "right_incidence_offsets", "right_incidence_targets")
+        add("adjacency", "adjacency_offsets", "adjacency_columns")
+        if "swap_vertex" in arrays:
+            add("levels", "level_offsets", "swap_vertex", first=0)
+            for position, vertex in enumerate(arrays["swap_vertex"].tolist(), 1):
+                records["swap_vertex", position] = [vertex + 1]
+        add("subsystem_vertex", "subsystem_offsets", "subsystem_vertices")
+        sources = (arrays["subsystem_arc_sources"] + 1).tolist()
+        targets = (arrays["subsystem_arc_targets"] + 1).tolist()
+        bounds = arrays["subsystem_arc_offsets"].tolist()
+        for id, (start, end) in enumerate(zip(bounds[:-1], bounds[1:]), 1):
+            records["subsystem_arc", id] = [
+                [source, target]
+                for source, target in zip(sources[start:end], targets[start:end])
+            ]
+        add(
+            "subsystem_right_incidence",
+            "subsystem_right_incidence_offsets",
+            "subsystem_right_incidence_sources",
+        )
+    assert vertex_count == len([key for key in records if key[0] == "right_incidence"])
+    return records
+
+
+@pytest.mark.parametrize(
+    "format, read",
+    [("jsonl", jsonl_records), ("csv", csv_records), ("npz", npz_records)],
+)
+def test_export_matches_analysis(random_graph, tmp_path, format, read):
+    path = export_graph(random_graph, str(tmp_path / f"result.{format}"))
+    expected = expected_records(random_graph)
+    records = read(path)
+    if format == "csv":
+        # Подсистема без дуг не дает в CSV ни одной строки subsystem_arc.
+        expected = {
+            key: value
+            for key, value in expected.items()
+            if value or key[0] != "subsystem_arc"
+        }
+    assert records == expected
+    assert list(tmp_path.iterdir()) == [tmp_path / f"result.{format}"]
+
+
+def test_adjacency_in_level_order(random_dag, tmp_path):
+    levels, swap_vertex = level_order(random_dag)
+    path = export_graph(
+        random_dag,
+        str(tmp_path / "result.jsonl"),
+        sections=["adjacency"],
+        order=swap_vertex,
+    )
+    dense = random_dag.to_dense()
+    with open(path, encoding="utf-8") as file:
+        for row, line in enumerate(file):
+            record = json.loads(line)
+            assert record["vertex"] == swap_vertex[row] + 1
+            expected = [
+                column + 1
+                for column in range(random_dag.vertex_count)
+                if dense[swap_vertex[row], swap_vertex[column]]
+            ]
+            assert record["columns"] == expected
+
+
+def test_errors_keep_previous_file(tmp_path):
+    graph = make_graph(10, 30, seed=4)
+    path = tmp_path / "result.jsonl"
+    path.write_text("previous\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="контур"):
+        export_graph(graph, str(path), sections=["levels"])
+    assert path.read_text(encoding="utf-8") == "previous\n"
+    assert list(tmp_path.iterdir()) == [path]
+    with pytest.raises(ValueError, match="Неизвестные разделы"):
+        export_graph(graph, str(path), sections=["levels", "cycles"])
+    with pytest.raises(ValueError, match="Неизвестный формат"):
+        export_graph(graph, str(tmp_path / "result.xml"))
+    assert with_extension("result", "CSV (*.csv)") == "result.csv"
@@ -0,0 +1,74 @@
+import importlib.util
+
+import networkx as nx
+import numpy as np
+import pytest
+from conftest import arc_list, to_networkx
+
+from system_analysis import SparseGraph, level_order
+from system_analysis.benchmark import compare, parse_importtime, run
+from system_analysis.generators import (
+    incidence_matrix,
+    layered_dag,
+    planted_scc_graph,
+    random_dag,
+)
+
+
+def check_simple(graph, arc_count):
+    arcs = arc_list(graph)
+    assert len(set(arcs)) == len(arcs) <= arc_count
+    assert all(source != target for source, target in arcs)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_dag(seed):
+    graph = random_dag(500, 1500, seed=seed)
+    check_simple(graph, 1500)
+    assert graph.arc_count > 1400
+    assert nx.is_directed_acyclic_graph(to_networkx(graph))
+    assert arc_list(random_dag(500, 1500, seed=seed)) == arc_list(graph)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_layered_dag(seed):
+    graph = layered_dag(500, 12, 1500, seed=seed)
+    check_simple(graph, 1500)
+    levels, _ = level_order(graph)
+    assert len(levels) <= 12
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_planted_scc_graph(seed):
+    graph, component = planted_scc_graph(500, 30, 1500, seed=seed)
+    check_simple(graph, max(1500, graph.arc_count))
+    assert sorted(set(component.tolist())) == list(range(30))
+    for source, target in arc_list(graph):
+        assert component[source] <= component[target]
+
+
+def test_incidence_matrix_roundtrip():
+    graph = random_dag(50, 120, seed=1)
+    matrix = incidence_matrix(graph)
+    assert matrix.dtype == np.int8
+    assert arc_list(SparseGraph.from_incidence(matrix)) == arc_list(graph)
+
+
+def test_benchmark_run_and_compare():
+    report = run([10, 100], ["incidence", "levels", "decompose"], memory=False)
+    stages = {(r["workload"], r["vertices"], r["stage"]) for r in report["results"]}
+    assert ("decompose", 100, "decompose") in stages
+    optional = set() if importlib.util.find_spec("matplotlib") else {"render"}
+    errors = [r for r in report["results"] if "error" in r]
+    assert not [r for r in errors if r["stage"] not in optional]
+    text = compare(report, report)
+    assert "(x1.00)" in text
+
+
+def test_parse_importtime():
+    text = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      2000 |       5000 | numpy\n"
+    )
+    assert parse_importtime(text) == [("numpy", 0.005)]
@@ -0,0 +1,63 @@
+import networkx as nx
+import numpy as np
+import pytest
+from conftest import arc_list, to_networkx
+
+from system_analysis import SparseGraph
+
+
+def test_csr_rows_are_sorted(random_graph):
+    for vertex in range(random_graph.vertex_count):
+        row = random_graph.successors(vertex).tolist()
+        assert row == sorted(row)
+    assert random_graph.offsets[-1] == random_graph.arc_count
+
+
+def test_queries_match_networkx(random_graph):
+    reference = to_networkx(random_graph)
+    n = random_graph.vertex_count
+    assert random_graph.out_degree().tolist() == [
+        reference.out_degree(vertex) for vertex in range(n)
+    ]
+    assert random_graph.in_degree().tolist() == [
+        reference.in_degree(vertex) for vertex in range(n)
+    ]
+    for source in range(n):
+        for target in range(n):
+            assert random_graph.has_arc(source, target) == reference.has_edge(
+                source, target
+            )
+    assert sorted(arc_list(random_graph.reverse())) == sorted(reference.reverse().edges)
+    assert (random_graph.to_dense() == nx.to_numpy_array(reference, range(n))).all()
+
+
+def test_dense_roundtrip(random_graph):
+    dense = random_graph.to_dense()
+    graph = SparseGraph.from_adjacency(dense)
+    assert arc_list(graph) == arc_list(random_graph)
+    assert graph.content_hash() == random_graph.content_hash()
+
+
+def test_adjacency_drops_diagonal_and_other_values():
+    graph = SparseGraph.from_adjacency([[1, 1, 2], [0, 1, 1], [1, 0, 0]])
+    assert arc_list(graph) == [(0, 1), (1, 2), (2, 0)]
+
+
+def test_incidence_with_parallel_arcs():
+    matrix = [[1, 1, 0], [-1, -1, 1], [0, 0, -1]]
+    graph = SparseGraph.from_incidence(matrix, unique=False)
+    assert arc_list(graph) == [(0, 1), (0, 1), (1, 2)]
+    with pytest.raises(ValueError, match="уже существует"):
+        SparseGraph.from_incidence(matrix)
+
+
+def test_content_hash_depends_on_arcs_and_vertices():
+    graph = SparseGraph.from_arcs(3, [0, 1], [1, 2])
+    same = SparseGraph.from_arcs(3, np.array([1, 0]), np.array([2, 1]))
+    assert graph.content_hash() == same.content_hash()
+    assert (
+        graph.content_hash() != SparseGraph.from_arcs(4, [0, 1], [1, 2]).content_hash()
+    )
+    assert (
+        graph.content_hash() != SparseGraph.from_arcs(3, [0, 2], [1, 1]).content_hash()
+    )
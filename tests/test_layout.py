@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+
+from system_analysis import layout, save_graph
+from system_analysis.cli import main
+from system_analysis.layout import LayoutCache, compute_layout, load_layout
+
+
+def no_compute(graph, engine="auto"):
+    raise AssertionError("раскладка должна браться из кэша")
+
+
+@pytest.mark.parametrize("engine", ["spring", "layered", "force", "grid"])
+def test_engines_place_every_vertex(engine):
+    graph = make_graph(40, 60, seed=1, acyclic=True)
+    positions = compute_layout(graph, engine)
+    assert positions.shape == (40, 2)
+    assert np.isfinite(positions).all()
+
+
+def test_cache_reuses_positions(tmp_path, monkeypatch):
+    graph = make_graph(30, 50, seed=2)
+    positions = LayoutCache(str(tmp_path)).get(graph, "force")
+    monkeypatch.setattr(layout, "compute_layout", no_compute)
+    assert np.array_equal(LayoutCache(str(tmp_path)).get(graph, "force"), positions)
+
+
+def test_cli_layout_is_used_by_the_windows(tmp_path, monkeypatch):
+    graph = make_graph(30, 50, seed=3)
+    path = str(tmp_path / "graph.sag")
+    save_graph(graph, path)
+    directory = str(tmp_path / "layouts")
+    monkeypatch.setattr("system_analysis.cli.LAYOUT_DIR", directory)
+    assert main(["layout", "-e", "grid", path]) == 0
+
+    monkeypatch.setattr(layout, "compute_layout", no_compute)
+    positions = LayoutCache(directory).get(graph, "grid")
+    stored = load_layout(LayoutCache(directory).path(graph, "grid"), graph, "grid")
+    assert np.array_equal(positions, stored)
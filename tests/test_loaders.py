@@ -0,0 +1,129 @@
+import io
+
+import numpy as np
+import pytest
+from conftest import arc_list, make_graph
+
+from system_analysis import (
+    SparseGraph,
+    iter_incidence_rows,
+    parse_adjacency,
+    parse_incidence,
+    read_incidence_graph,
+    write_adjacency,
+    write_incidence,
+)
+from system_analysis.generators import incidence_matrix
+
+
+def baseline_adjacency(text):
+    """Дуги по разбору матрицы смежности из исходной ЛР №3."""
+    rows = [
+        list(map(int, row.split())) for row in text.strip().split("\n") if row.strip()
+    ]
+    return [
+        (i, j)
+        for i in range(len(rows))
+        for j in range(len(rows[i]))
+        if rows[i][j] == 1 and i != j
+    ]
+
+
+def incidence_text(graph):
+    file = io.StringIO()
+    write_incidence(graph, file)
+    return file.getvalue()
+
+
+def test_incidence_roundtrip(random_graph):
+    text = incidence_text(random_graph)
+    if not random_graph.arc_count:
+        with pytest.raises(ValueError, match="положительным"):
+            parse_incidence(text)
+        return
+    matrix = parse_incidence(text)
+    assert matrix.dtype == np.int8
+    assert matrix.tolist() == incidence_matrix(random_graph).tolist()
+    graph = read_incidence_graph(io.StringIO(text))
+    assert arc_list(graph) == arc_list(random_graph)
+    assert arc_list(graph) == arc_list(SparseGraph.from_incidence(matrix))
+
+
+def test_adjacency_roundtrip(random_graph):
+    file = io.StringIO()
+    write_adjacency(random_graph, file)
+    graph = parse_adjacency(file.getvalue())
+    assert graph.vertex_count == random_graph.vertex_count
+    assert arc_list(graph) == arc_list(random_graph)
+
+
+def test_adjacency_matches_baseline():
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        n = int(rng.integers(1, 12))
+        rows = rng.choice([0, 0, 1, 2], size=(n, n))
+        text = "\n\n".join(" ".join(map(str, row)) for row in rows.tolist()) + "\n"
+        assert arc_list(parse_adjacency(text)) == baseline_adjacency(text)
+
+
+def test_incidence_rows_are_read_lazily():
+    read = []
+
+    def lines():
+        for line in incidence_text(make_graph(20, 40, seed=2)).splitlines(True):
+            read.append(line)
+            yield line
+
+    rows = iter_incidence_rows(lines())
+    m, n = next(rows)
+    assert len(read) == 1
+    next(rows)
+    assert len(read) == 2
+    assert len(list(rows)) == m - 1
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("", "Файл пустой"),
+        ("\n\n", "Файл пустой"),
+        ("2 1 3\n", "два числа"),
+        ("0 1\n", "положительным"),
+        ("2 1\n1\n-1 0\n", "Строка 2 должна содержать 1 значений"),
+        ("2 1\n1\n2\n", "Недопустимое значение '2' в строке 2, столбце 1"),
+        ("3 1\n1\n-1\n", "Ожидалось 3 строк матрицы, найдено 2"),
+        ("2 1\n1\n-1\n0\n", "Ожидалось 2 строк матрицы, найдено 3"),
+    ],
+)
+def test_incidence_errors(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_incidence(text)
+    with pytest.raises(ValueError, match=message):
+        read_incidence_graph(io.StringIO(text))
+
+
+def test_incidence_graph_column_errors():
+    text = "3 2\n1 1\n-1 0\n0 0\n"
+    with pytest.raises(ValueError) as streamed:
+        read_incidence_graph(io.StringIO(text))
+    with pytest.raises(ValueError) as full:
+        SparseGraph.from_incidence(parse_incidence(text))
+    assert str(streamed.value) == str(full.value)
+    duplicate = "2 2\n1 1\n-1 -1\n"
+    assert read_incidence_graph(io.StringIO(duplicate), unique=False).arc_count == 2
+    with pytest.raises(ValueError, match="уже существует"):
+        read_incidence_graph(io.StringIO(duplicate))
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("", "одинаковое количество"),
+        ("0 1\n1\n", "одинаковое количество"),
+        ("0 1\n1 0\n0 0\n", "квадратной"),
+        ("0 x\n1 0\n", "invalid literal"),
+    ],
+)
+def test_adjacency_errors(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse_adjacency(text)
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+
+from system_analysis import SparseGraph, decompose
+from system_analysis.generators import planted_scc_graph
+from system_analysis.parallel import (
+    color_classes,
+    parallel_components,
+    split,
+    trim,
+)
+from system_analysis.scc import number_by_first_vertex, strong_components
+
+
+def tarjan_components(graph):
+    return number_by_first_vertex(strong_components(graph)[1])
+
+
+def split_components(graph, limit):
+    """Разбиение split в текущем процессе, как его делают задачи пула."""
+    n = graph.vertex_count
+    arrays = {
+        "offsets": graph.offsets,
+        "targets": graph.targets,
+        "reverse_offsets": graph.reverse().offsets,
+        "reverse_targets": graph.reverse().targets,
+        "order": np.arange(n),
+        "label": np.zeros(n, dtype=np.int64),
+        "color": np.zeros(n, dtype=np.int64),
+        "local": np.zeros(n, dtype=np.int64),
+        "mark": np.zeros(n, dtype=np.int8),
+    }
+    tasks = [(0, n, limit)] if n else []
+    while tasks:
+        tasks.extend(split(arrays, *tasks.pop()))
+    assert sorted(arrays["order"].tolist()) == list(range(n))
+    assert (arrays["color"] == -1).all()
+    assert not arrays["mark"].any()
+    return number_by_first_vertex(arrays["label"])
+
+
+def assert_same(result, expected):
+    assert result[0] == expected[0]
+    assert result[1].tolist() == expected[1].tolist()
+
+
+def test_trimmed_vertices_are_single_components(random_graph):
+    reverse = random_graph.reverse()
+    trimmed = trim(
+        random_graph.offsets, random_graph.targets, reverse.offsets, reverse.targets
+    )
+    assert len(set(trimmed.tolist())) == len(trimmed)
+    count, component = strong_components(random_graph)
+    sizes = np.bincount(component, minlength=count)
+    assert (sizes[component[trimmed]] == 1).all()
+    sinks_and_sources = (random_graph.in_degree() == 0) | (
+        random_graph.out_degree() == 0
+    )
+    assert set(np.flatnonzero(sinks_and_sources).tolist()) <= set(trimmed.tolist())
+
+
+def test_trim_peels_wide_dag():
+    # 1000 цепочек по 10 вершин: каждый проход отсекает не меньше TRIM_MIN
+    # вершин, и отсечение доходит до конца.
+    n = 10_000
+    sources = np.arange(n).reshape(1000, 10)[:, :-1].ravel()
+    graph = SparseGraph.from_arcs(n, sources, sources + 1)
+    reverse = graph.reverse()
+    trimmed = trim(graph.offsets, graph.targets, reverse.offsets, reverse.targets)
+    assert sorted(trimmed.tolist()) == list(range(n))
+
+
+def test_color_classes_find_pivot_components(random_graph):
+    color, pivot_component = color_classes(random_graph)
+    count, component = strong_components(random_graph)
+    for vertex in range(random_graph.vertex_count):
+        assert color[vertex] >= vertex
+        assert color[vertex] == color[np.flatnonzero(component == component[vertex])][0]
+    for pivot in np.flatnonzero(color == np.arange(random_graph.vertex_count)):
+        found = np.flatnonzero(pivot_component & (color == pivot))
+        assert found.tolist() == np.flatnonzero(component == component[pivot]).tolist()
+
+
+@pytest.mark.parametrize("limit", [1, 2, 5])
+def test_split_matches_tarjan(random_graph, limit):
+    assert_same(split_components(random_graph, limit), tarjan_components(random_graph))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_split_planted_components(seed):
+    graph, _ = planted_scc_graph(2000, 40, 6000, seed=seed)
+    assert_same(split_components(graph, 64), tarjan_components(graph))
+
+
+def test_split_chain_of_cycles():
+    # Цепочка контуров из двух вершин: опорная компонента мала, раскраска
+    # тоже почти не делит остаток, и он разбирается обходом Тарьяна.
+    n = 400
+    pairs = np.arange(0, n, 2)
+    sources = np.concatenate((pairs, pairs + 1, pairs[:-1] + 1))
+    targets = np.concatenate((pairs + 1, pairs, pairs[1:]))
+    graph = SparseGraph.from_arcs(n, sources, targets)
+    result = split_components(graph, 4)
+    assert result[0] == n // 2
+    assert_same(result, tarjan_components(graph))
+
+
+def test_single_worker_matches_tarjan(random_graph):
+    assert_same(parallel_components(random_graph, 1), tarjan_components(random_graph))
+
+
+def test_pool_matches_tarjan():
+    graph, _ = planted_scc_graph(30_000, 300, 90_000, seed=7)
+    tail = make_graph(2000, 3000, seed=7, acyclic=True)
+    graph = SparseGraph.from_arcs(
+        32_000,
+        np.concatenate((graph.arcs()[0], tail.arcs()[0] + 30_000)),
+        np.concatenate((graph.arcs()[1], tail.arcs()[1] + 30_000)),
+    )
+    stages = []
+    result = parallel_components(
+        graph, 2, lambda percent, stage: stages.append(percent)
+    )
+    assert_same(result, tarjan_components(graph))
+    assert stages[-1] == 100
+
+    decomposition = decompose(graph, workers=2)
+    expected = decompose(graph)
+    assert sorted(map(sorted, decomposition.subsystems)) == sorted(
+        map(sorted, expected.subsystems)
+    )
+    assert sum(map(len, decomposition.subsystem_edges)) == sum(
+        map(len, expected.subsystem_edges)
+    )
+    assert len(decomposition.subsystem_arcs) == len(expected.subsystem_arcs)
@@ -0,0 +1,72 @@
+import io
+import json
+
+import pytest
+
+from system_analysis.profiling import (
+    PROFILE_DIR_ENV,
+    PROFILE_ENV,
+    Profiler,
+    profile_options,
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("", (False, ())),
+        ("1", (True, ())),
+        ("spans", (True, ())),
+        ("tracemalloc, CProfile", (True, ("cprofile", "tracemalloc"))),
+        ("cprofile,flamegraph", (True, ("cprofile",))),
+        ("flamegraph", (False, ())),
+    ],
+)
+def test_profile_options(value, expected):
+    log = io.StringIO()
+    assert profile_options(value, log=log) == expected
+    assert ("flamegraph" in log.getvalue()) == ("flamegraph" in value)
+
+
+def test_unknown_mode_does_not_stop_profiler(monkeypatch):
+    monkeypatch.setenv(PROFILE_ENV, "spans,flamegraph")
+    monkeypatch.delenv(PROFILE_DIR_ENV, raising=False)
+    log = io.StringIO()
+    profiler = Profiler("ЛР", log=log)
+    assert profiler.enabled
+    assert "Предупреждение" in log.getvalue()
+
+
+def test_spans_capture_and_files(tmp_path):
+    log = io.StringIO()
+    profiler = Profiler(
+        "ЛР",
+        enabled=True,
+        captures=("cprofile", "tracemalloc"),
+        directory=str(tmp_path),
+        log=log,
+    )
+    profiler.stage("Разбор")
+    with profiler.capture():
+        with profiler.span("Расчет"):
+            sum(range(1000))
+    profiler.stage(None)
+    assert list(profiler.totals()) == ["Расчет", "Разбор"]
+    assert profiler.peak_bytes is not None and profiler.profile_text
+    summary = profiler.report()
+    assert summary.startswith("ЛР: Расчет") and summary in log.getvalue()
+
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert len(names) == 2 and names[1].endswith(".trace.json")
+    with open(tmp_path / names[1], encoding="utf-8") as file:
+        events = json.load(file)["traceEvents"]
+    assert [event["name"] for event in events] == ["Расчет", "Разбор"]
+
+
+def test_disabled_profiler_reports_nothing():
+    log = io.StringIO()
+    profiler = Profiler("ЛР", enabled=False, captures=(), log=log)
+    with profiler.span("Расчет"):
+        pass
+    assert profiler.report() is None
+    assert log.getvalue() == ""
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+
+pytest.importorskip("PyQt5")
+
+from system_analysis.qtbinding import Qt  # noqa: E402
+from system_analysis.qtmodels import (  # noqa: E402
+    AdjacencyModel,
+    MatrixModel,
+    ReportModel,
+)
+from system_analysis.reports import TextReport  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+
+def test_matrix_model_edits_the_array():
+    matrix = np.zeros((3, 4), dtype=np.int8)
+    model = MatrixModel(matrix, alphabet={"0", "1", "-1"}, column_label="e{}")
+    changed = []
+    model.dataChanged.connect(lambda first, last: changed.append(first.row()))
+    assert (model.rowCount(), model.columnCount()) == (3, 4)
+    assert model.headerData(1, Qt.Orientation.Horizontal) == "e2"
+
+    index = model.index(2, 1)
+    assert model.setData(index, " -1 ")
+    assert matrix[2, 1] == -1 and model.data(index) == "-1"
+    assert changed == [2]
+    assert not model.setData(index, "2")
+    assert matrix[2, 1] == -1
+    assert model.flags(index) & Qt.ItemFlag.ItemIsEditable
+
+    read_only = MatrixModel(matrix)
+    assert not read_only.flags(index) & Qt.ItemFlag.ItemIsEditable
+
+
+def test_adjacency_model_matches_dense_matrix():
+    graph = make_graph(15, 40, seed=1)
+    order = np.random.default_rng(1).permutation(15)
+    model = AdjacencyModel(label="{0}({1})")
+    model.set_graph(graph, order)
+    dense = graph.to_dense()
+    cells = [
+        [int(model.data(model.index(row, column))) for column in range(15)]
+        for row in range(15)
+    ]
+    assert cells == dense[np.ix_(order, order)].tolist()
+    assert model.headerData(0, Qt.Orientation.Vertical) == f"1({order[0] + 1})"
+    model.set_graph(None)
+    assert model.rowCount() == 0
+
+
+def test_report_model_rows():
+    model = ReportModel(TextReport("a\nb\n"))
+    assert [model.data(model.index(row, 0)) for row in range(2)] == ["a", "b"]
+    resets = []
+    model.modelReset.connect(lambda: resets.append(1))
+    model.replace(TextReport("c\nd\n"), rows=[0])
+    assert not resets and model.data(model.index(0, 0)) == "c"
+    model.replace(TextReport("e\n"))
+    assert resets and model.rowCount() == 1
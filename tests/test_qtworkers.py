@@ -0,0 +1,93 @@
+import io
+
+import pytest
+from conftest import make_graph
+
+pytest.importorskip("PyQt5")
+
+from system_analysis import decompose  # noqa: E402
+from system_analysis.profiling import Profiler  # noqa: E402
+from system_analysis.qtbinding import QThreadPool  # noqa: E402
+from system_analysis.qtworkers import AnalysisWorker  # noqa: E402
+
+pytestmark = pytest.mark.usefixtures("qt_app")
+
+
+def collect(worker):
+    """Подключает все сигналы работника к списку событий."""
+    events = []
+    signals = worker.signals
+    signals.progress.connect(
+        lambda percent, stage: events.append(("progress", percent))
+    )
+    signals.finished.connect(lambda result: events.append(("finished", result)))
+    signals.failed.connect(lambda message: events.append(("failed", message)))
+    signals.cancelled.connect(lambda: events.append(("cancelled",)))
+    signals.done.connect(lambda: events.append(("done",)))
+    return events
+
+
+def test_result_and_progress():
+    graph = make_graph(40, 80, seed=1)
+    worker = AnalysisWorker(decompose, graph)
+    events = collect(worker)
+    worker.run()
+    assert events[-1] == ("done",)
+    kind, result = events[-2]
+    assert kind == "finished"
+    assert result.subsystems == decompose(graph).subsystems
+    percents = [event[1] for event in events if event[0] == "progress"]
+    assert percents[0] == 0 and percents[-1] == 100
+
+
+def test_repeated_progress_is_emitted_once():
+    def function(progress):
+        for _ in range(3):
+            progress(10, "Этап")
+        return 1
+
+    worker = AnalysisWorker(function)
+    events = collect(worker)
+    worker.run()
+    assert events == [("progress", 10), ("finished", 1), ("done",)]
+
+
+def test_cancel_and_failure():
+    def cancelled(progress):
+        worker.cancel()
+        progress(50, "Этап")
+        raise AssertionError("после отмены progress должен прервать расчет")
+
+    worker = AnalysisWorker(cancelled)
+    events = collect(worker)
+    worker.run()
+    assert events == [("cancelled",), ("done",)]
+
+    def failing(progress):
+        raise ValueError("Граф содержит контур")
+
+    worker = AnalysisWorker(failing)
+    events = collect(worker)
+    worker.run()
+    assert events == [("failed", "Граф содержит контур"), ("done",)]
+
+
+def test_stages_go_to_profiler():
+    def function(progress):
+        progress(0, "Разбор")
+        progress(50, "Разбор")
+        progress(60, "Расчет")
+
+    profiler = Profiler("ЛР", enabled=True, captures=(), log=io.StringIO())
+    AnalysisWorker(function, profiler=profiler).run()
+    assert list(profiler.totals()) == ["Разбор", "Расчет"]
+
+
+def test_runs_on_the_thread_pool(qt_app):
+    graph = make_graph(40, 80, seed=2)
+    worker = AnalysisWorker(decompose, graph)
+    events = collect(worker)
+    worker.start()
+    QThreadPool.globalInstance().waitForDone()
+    qt_app.processEvents()
+    assert [event[0] for event in events[-2:]] == ["finished", "done"]
@@ -0,0 +1,69 @@
+from conftest import make_graph
+
+from system_analysis import (
+    DynamicGraph,
+    decompose,
+    format_decomposition,
+    format_levels,
+    format_right_incidence,
+    level_order,
+    right_incidence_sets,
+)
+from system_analysis.reports import (
+    DecompositionReport,
+    LevelReport,
+    RightIncidenceReport,
+    TextReport,
+)
+
+
+def test_reports_match_full_text(random_graph):
+    G_plus = format_right_incidence(right_incidence_sets(random_graph))
+    assert RightIncidenceReport(random_graph, None).text() == G_plus
+    assert RightIncidenceReport(DynamicGraph(random_graph), None).text() == G_plus
+    decomposition = decompose(random_graph)
+    assert DecompositionReport(decomposition, None).text() == format_decomposition(
+        decomposition
+    )
+
+
+def test_level_report_matches_full_text(random_dag):
+    levels, _ = level_order(random_dag)
+    report = LevelReport(levels, None)
+    assert report.text() == format_levels(levels)
+    for level, vertices in enumerate(levels):
+        for vertex in vertices:
+            assert report.locate("vertex", vertex) == level
+
+
+def test_locate_points_at_the_record(random_graph):
+    decomposition = decompose(random_graph)
+    report = DecompositionReport(decomposition)
+    for subsystem, vertices in enumerate(decomposition.subsystems, 1):
+        row = report.locate("subsystem", subsystem)
+        assert report.line(row) == f"Подсистема {subsystem}:"
+        for vertex in vertices:
+            assert report.locate("vertex", vertex) == row
+    assert report.locate("subsystem", len(decomposition.subsystems) + 1) is None
+    incidence = RightIncidenceReport(random_graph)
+    assert incidence.line(incidence.locate("vertex", 1)).startswith("Вершина 1:")
+    assert incidence.locate("vertex", random_graph.vertex_count + 1) is None
+
+
+def test_long_lines_are_cut():
+    graph = make_graph(60, 3000, seed=1)
+    report = RightIncidenceReport(graph, limit=5)
+    line = report.line(0)
+    assert line.count(",") == 4
+    assert line.endswith(f" … (всего {len(graph.successors(0))})")
+    levels = LevelReport([list(range(1, 61))], limit=3)
+    assert levels.line(0) == "Уровень 0: (1, 2, 3) … (всего 60)"
+
+
+def test_find_wraps_around():
+    report = TextReport("первая\nвторая\nтретья\n")
+    assert len(report) == 3
+    assert report.find("тр", start=1) == 2
+    assert report.find("пер", start=1) == 0
+    assert report.find("пер", start=1, count=2) is None
+    assert report.find("нет") is None
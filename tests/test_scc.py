@@ -0,0 +1,118 @@
+import networkx as nx
+import numpy as np
+from conftest import arc_list, make_graph, to_networkx
+
+from system_analysis import SparseGraph
+from system_analysis.generators import planted_scc_graph
+from system_analysis.scc import (
+    component_members,
+    condensation,
+    internal_arcs,
+    number_by_first_vertex,
+    strong_components,
+)
+
+
+def partition(count, component):
+    """Разбиение вершин на компоненты как множество неизменяемых множеств."""
+    groups = [set() for _ in range(count)]
+    for vertex, number in enumerate(component.tolist()):
+        groups[number].add(vertex)
+    return {frozenset(group) for group in groups}
+
+
+def test_components_match_networkx(random_graph):
+    count, component = strong_components(random_graph)
+    expected = {
+        frozenset(group)
+        for group in nx.strongly_connected_components(to_networkx(random_graph))
+    }
+    assert partition(count, component) == expected
+    assert sorted(set(component.tolist())) == list(range(count))
+
+
+def test_components_are_reverse_topological(random_graph):
+    _, component = strong_components(random_graph)
+    for source, target in arc_list(random_graph):
+        assert component[source] >= component[target]
+
+
+def test_roots_do_not_change_partition(random_graph):
+    count, component = strong_components(random_graph)
+    roots = list(reversed(range(random_graph.vertex_count)))
+    other_count, other = strong_components(random_graph, roots=roots)
+    assert other_count == count
+    assert partition(other_count, other) == partition(count, component)
+
+
+def test_long_chain_has_no_recursion_limit():
+    n = 200_000
+    graph = SparseGraph.from_arcs(n, np.arange(n - 1), np.arange(1, n))
+    count, component = strong_components(graph)
+    assert count == n
+    assert component[0] == n - 1 and component[-1] == 0
+
+    ring = SparseGraph.from_arcs(n, np.arange(n), (np.arange(n) + 1) % n)
+    assert strong_components(ring)[0] == 1
+
+
+def test_component_members(random_graph):
+    count, component = strong_components(random_graph)
+    members, bounds = component_members(component, count)
+    for number in range(count):
+        group = members[bounds[number] : bounds[number + 1]].tolist()
+        assert group == sorted(np.flatnonzero(component == number).tolist())
+
+
+def test_number_by_first_vertex(random_graph):
+    count, component = strong_components(random_graph)
+    renumbered_count, renumbered = number_by_first_vertex(component)
+    assert renumbered_count == count
+    assert partition(count, renumbered) == partition(count, component)
+    first = [np.flatnonzero(renumbered == number)[0] for number in range(count)]
+    assert first == sorted(first)
+
+
+def test_internal_arcs(random_graph):
+    count, component = strong_components(random_graph)
+    sources, targets, bounds = internal_arcs(random_graph, component, count)
+    for number in range(count):
+        group = list(
+            zip(
+                sources[bounds[number] : bounds[number + 1]].tolist(),
+                targets[bounds[number] : bounds[number + 1]].tolist(),
+            )
+        )
+        expected = [
+            (source, target)
+            for source, target in arc_list(random_graph)
+            if component[source] == component[target] == number
+        ]
+        assert group == expected
+
+
+def test_condensation_matches_networkx(random_graph):
+    count, component = strong_components(random_graph)
+    condensed = condensation(random_graph, component, count)
+    expected = {
+        (int(component[source]), int(component[target]))
+        for source, target in arc_list(random_graph)
+        if component[source] != component[target]
+    }
+    assert sorted(arc_list(condensed)) == sorted(expected)
+    reference = nx.condensation(to_networkx(random_graph))
+    assert condensed.vertex_count == reference.number_of_nodes()
+    assert condensed.arc_count == reference.number_of_edges()
+
+
+def test_planted_components_are_found():
+    for seed in range(10):
+        graph, planted = planted_scc_graph(300, 20, 900, seed=seed)
+        count, component = strong_components(graph)
+        assert partition(count, component) == partition(20, planted)
+
+
+def test_acyclic_graph_has_singleton_components():
+    graph = make_graph(50, 150, seed=1, acyclic=True)
+    count, _ = strong_components(graph)
+    assert count == 50
@@ -0,0 +1,110 @@
+import asyncio
+import io
+import json
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+from conftest import arc_list, make_graph
+
+from system_analysis import level_order, write_adjacency, write_incidence
+from system_analysis.generators import incidence_matrix
+from system_analysis.service import AnalysisService, payload_graph, serve
+
+
+def payloads(graph):
+    """Один и тот же граф во всех форматах тела запроса."""
+    incidence, adjacency = io.StringIO(), io.StringIO()
+    write_incidence(graph, incidence)
+    write_adjacency(graph, adjacency)
+    sources, targets = graph.arcs()
+    return [
+        {
+            "vertices": graph.vertex_count,
+            "arcs": np.column_stack((sources + 1, targets + 1)).tolist(),
+        },
+        {"format": "incidence", "matrix": incidence_matrix(graph).tolist()},
+        {"format": "incidence", "text": incidence.getvalue()},
+        {"format": "adjacency", "matrix": graph.to_dense().tolist()},
+        {"format": "adjacency", "text": adjacency.getvalue()},
+    ]
+
+
+def test_payload_formats_give_the_same_graph():
+    graph = make_graph(12, 30, seed=1)
+    for payload in payloads(graph):
+        assert arc_list(payload_graph(payload)) == arc_list(graph)
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ([], "объектом JSON"),
+        ({"format": "xml"}, "format"),
+        ({"vertices": 0, "arcs": []}, "vertices"),
+        ({"vertices": 2, "arcs": [[1, 3]]}, "от 1 до 2"),
+        ({"vertices": 2, "arcs": [1, 2]}, "пар"),
+        ({"format": "adjacency"}, "matrix или text"),
+        ({"format": "adjacency", "matrix": [[0, 1]]}, "квадратной"),
+        ({"format": "incidence", "matrix": [[1, 1], [-1, -1]]}, "уже есть"),
+    ],
+)
+def test_payload_errors(payload, message):
+    with pytest.raises(ValueError, match=message):
+        payload_graph(payload)
+
+
+def request(port, path, payload=None):
+    data = None if payload is None else json.dumps(payload).encode("utf-8")
+    try:
+        with urllib.request.urlopen(
+            f"http://127.0.0.1:{port}{path}", data=data, timeout=30
+        ) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as error:
+        return error.code, error.read().decode("utf-8")
+
+
+def test_http_endpoints():
+    graph = make_graph(15, 25, seed=2, acyclic=True)
+    payload = payloads(graph)[0]
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        port = loop.create_future()
+        service = AnalysisService(workers=1, queue_limit=2)
+        task = asyncio.create_task(serve(service, 0, port.set_result))
+        port = await port
+        try:
+            calls = [
+                ("/levels", payload),
+                ("/decompose", {"vertices": 2, "arcs": [[1, 3]]}),
+                ("/unknown", None),
+                ("/metrics", None),
+            ]
+            return [
+                await loop.run_in_executor(None, request, port, *call) for call in calls
+            ]
+        finally:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    levels, invalid, unknown, metrics = asyncio.run(scenario())
+    assert levels[0] == 200
+    records = [json.loads(line) for line in levels[1].splitlines()]
+    expected, swap_vertex = level_order(graph)
+    assert [r["vertices"] for r in records if r["section"] == "levels"] == expected
+    assert [r["vertex"] - 1 for r in records if r["section"] == "adjacency"] == (
+        swap_vertex
+    )
+    assert invalid[0] == 400
+    assert "от 1 до 2" in json.loads(invalid[1])["error"]
+    assert unknown[0] == 404
+    assert metrics[0] == 200
+    endpoints = json.loads(metrics[1])["endpoints"]
+    assert endpoints["/levels"]["requests"] == 1
+    assert endpoints["/decompose"]["errors"] == 1
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from system_analysis.benchmark import LAB_WINDOWS, check_startup
+from system_analysis.warmup import warm_up
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT = """
+import runpy, sys
+namespace = runpy.run_path(sys.argv[1], run_name="startup")
+app = namespace["QApplication"](sys.argv[:1])
+window = namespace[sys.argv[2]]()
+window.show()
+app.processEvents()
+print(sorted(name for name in ("networkx", "matplotlib") if name in sys.modules))
+"""
+
+
+@pytest.mark.parametrize("lab", sorted(LAB_WINDOWS))
+def test_windows_open_without_plotting_libraries(lab):
+    pytest.importorskip("PyQt5")
+    path, window = LAB_WINDOWS[lab]
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT, path, window],
+        cwd=ROOT,
+        env={**os.environ, "QT_QPA_PLATFORM": "offscreen"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
+
+
+def test_warm_up_skips_missing_modules():
+    thread = warm_up(("json", "system_analysis_missing_module"))
+    thread.join()
+    assert "json" in sys.modules
+
+
+def test_check_startup_reports_each_window():
+    pytest.importorskip("PyQt5")
+    results, within = check_startup(["lab2"], budget=60.0)
+    (result,) = results
+    assert result["lab"] == "lab2" and within
+    assert 0 < result["import_seconds"] <= result["window_seconds"]
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from conftest import make_graph
+
+from system_analysis import SparseGraph, validate_incidence
+from system_analysis.generators import incidence_matrix
+from system_analysis.validation import _nonzero_cells
+
+
+def reference_violations(matrix):
+    """Нарушения, найденные перебором столбцов."""
+    invalid, bad, duplicates, seen = [], [], [], {}
+    for column in range(matrix.shape[1]):
+        values = matrix[:, column].tolist()
+        invalid += [
+            (row, column, value)
+            for row, value in enumerate(values)
+            if value not in (-1, 0, 1)
+        ]
+        starts, ends = values.count(1), values.count(-1)
+        if (starts, ends) != (1, 1):
+            bad.append((column, starts, ends))
+            continue
+        arc = (values.index(1), values.index(-1))
+        if arc in seen:
+            duplicates.append((column, seen[arc]))
+        else:
+            seen[arc] = column
+    return invalid, bad, duplicates
+
+
+def corrupted(seed, dtype):
+    rng = np.random.default_rng(seed)
+    matrix = incidence_matrix(make_graph(9, 23, seed)).astype(dtype)
+    cells = rng.integers(0, matrix.size, int(rng.integers(0, 6)))
+    matrix.flat[cells] = rng.choice([-1, 0, 1, 3], len(cells))
+    if matrix.shape[1] > 1 and rng.random() < 0.5:
+        matrix[:, -1] = matrix[:, 0]
+    return matrix
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int16, np.int64])
+@pytest.mark.parametrize("seed", range(20))
+def test_report_matches_reference(seed, dtype):
+    matrix = corrupted(seed, dtype)
+    report = validate_incidence(matrix)
+    invalid, bad, duplicates = reference_violations(matrix)
+    assert list(zip(*(kind.tolist() for kind in report.invalid_cells))) == invalid
+    assert list(zip(*(kind.tolist() for kind in report.bad_columns))) == bad
+    assert list(zip(*(kind.tolist() for kind in report.duplicates))) == duplicates
+    assert report.count == len(invalid) + len(bad) + len(duplicates)
+    assert len(report.messages(3)) == min(report.count, 3)
+    try:
+        SparseGraph.from_incidence(matrix)
+    except ValueError:
+        assert not report.valid
+        with pytest.raises(ValueError, match="Найдено нарушений"):
+            report.check()
+    else:
+        assert report.valid
+        assert report.format() == "Нарушений нет.\n"
+
+
+@pytest.mark.parametrize("dtype", [np.int8, np.int32, np.int64])
+@pytest.mark.parametrize("shape", [(1, 1), (3, 5), (7, 9), (17, 33)])
+def test_nonzero_cells(dtype, shape):
+    rng = np.random.default_rng(shape[1])
+    matrix = rng.choice(np.array([0, 0, 0, 1, -1], dtype=dtype), size=shape)
+    assert _nonzero_cells(matrix).tolist() == np.flatnonzero(matrix).tolist()
+
+
+def test_valid_matrices_pass(random_graph):
+    report = validate_incidence(incidence_matrix(random_graph))
+    assert report.valid
+    assert report.format() == "Нарушений нет.\n"
+    report.check()